@@ -0,0 +1,886 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Engines supported by compare_report.compare()
+compare_engines = ['standard', 'hash', 'sorted_merge', 'out_of_core']
+# Comparison modes supported by compare_report.compare()
+compare_modes = ['string', 'typed']
+# Number of key buckets used by get_data_fingerprint()
+fingerprint_buckets = 256
+# Per column comparison rules supported by get_equality_mask()
+comparison_rules = ['abs_tol', 'rel_tol', 'ignore_case', 'trim', 'date_only', 'null_values']
+
+
+def get_row_fingerprints(df, cols):
+    """Returns 64-bit fingerprint (uint64 numpy array) of every row of dataframe computed on given columns.
+
+    Parameters
+    ----------
+    df : dataframe
+        DataFrame having data
+    cols : list
+        List of columns used for fingerprint, in this order
+
+    returns
+    --------
+    numpy.ndarray : uint64 fingerprint per row, in row order of df
+    """
+    if len(cols) == 0:
+        return np.zeros(len(df), dtype='uint64')
+    return pd.util.hash_pandas_object(df[cols], index=False).values
+
+
+def build_comm_diffs(src_rows, trg_rows, ls_ref, sort_pairs=True):
+    """Builds common differences dataframe from aligned source and target rows.
+
+    Output has same layout as the one generated by standard engine i.e. first column 'index' having 'Source'/'Target'
+    followed by reference columns and columns to compare, having source row just above its target row. Pairs are sorted
+    on reference columns.
+
+    Parameters
+    ----------
+    src_rows : dataframe
+        Source rows, i-th row is paired with i-th row of trg_rows
+    trg_rows : dataframe
+        Target rows having same columns as src_rows
+    ls_ref : list
+        List of reference columns
+    sort_pairs : bool, default True
+        If False, pairs are kept in given order e.g. when rows are already sorted on reference columns
+
+    returns
+    --------
+    DataFrame : Differences dataframe with source and target rows one after the other
+    """
+    n = len(src_rows)
+    src_rows = src_rows.reset_index(drop=True)
+    trg_rows = trg_rows.reset_index(drop=True)[list(src_rows.columns)]
+
+    if sort_pairs:
+        # sort pairs on reference columns, same order to be applied on both sides
+        pair_order = src_rows.sort_values(ls_ref, kind='mergesort').index.values
+        src_rows = src_rows.iloc[pair_order]
+        trg_rows = trg_rows.iloc[pair_order]
+
+    src_rows.insert(0, 'index', 'Source')
+    trg_rows.insert(0, 'index', 'Target')
+    df_cd = pd.concat([src_rows, trg_rows], ignore_index=True, sort=False)
+
+    # interleave rows as source, target, source, target...
+    order = np.empty(2 * n, dtype='int64')
+    order[0::2] = np.arange(n)
+    order[1::2] = np.arange(n) + n
+    return df_cd.iloc[order].reset_index(drop=True)
+
+
+def compare_by_row_hash(src_df, trg_df, ls_ref, ls_cols, n_jobs=1, threshold=0, column_rules=None, keys=None):
+    """Compares two dataframes by aligning them once on reference columns and comparing 64-bit row fingerprints.
+
+    Full column values are materialized only for the rows whose fingerprints are different in source and target.
+
+    Parameters
+    ----------
+    src_df : dataframe
+        Source data having reference columns and columns to compare (not indexed)
+    trg_df : dataframe
+        Target data having reference columns and columns to compare (not indexed)
+    ls_ref : list
+        List of reference columns, same in source and target
+    ls_cols : list
+        List of columns to compare, other than reference columns
+    n_jobs : int, default 1
+        Number of processes used to compare the columns, see get_diff_pairs()
+    threshold : int or float, default 0
+        Used only if n_jobs > 1, see get_equality_mask()
+    column_rules : dict, default None
+        Used only if n_jobs > 1, see get_equality_mask()
+    keys : dict, default None
+        Output of align_reference_keys() for src_df and trg_df, if already computed
+
+    returns
+    --------
+    tuple of 3 DataFrames : common differences, extra rows in source, extra rows in target
+    """
+    # single key alignment gives common, extra in source and extra in target rows
+    keys = align_reference_keys(src_df, trg_df, ls_ref) if keys == None else keys
+    src_pos, trg_pos = get_diff_pairs(src_df, trg_df, keys['src_pos'], keys['trg_pos'], ls_cols, n_jobs, threshold, column_rules)
+
+    out_cols = ls_ref + ls_cols
+    comm_diffs = build_comm_diffs(src_df[out_cols].iloc[src_pos], trg_df[out_cols].iloc[trg_pos], ls_ref)
+
+    extra_src = src_df[keys['left_only']].sort_values(ls_ref, kind='mergesort').reset_index(drop=True)
+    extra_trg = trg_df[keys['right_only']].sort_values(ls_ref, kind='mergesort').reset_index(drop=True)
+
+    return comm_diffs, extra_src, extra_trg
+
+
+def align_reference_keys(src_df, trg_df, ls_ref_src, ls_ref_trg=None, codes=None):
+    """Classifies the rows of two dataframes as common, only in source or only in target on reference columns, in a single pass.
+
+    Reference values of both sides are factorized once into integer codes, all the masks and positions are computed
+    from these codes, so no index is created or hashed again. Reference columns can be columns or index levels of
+    the dataframes. Nulls in reference columns are treated as same values. Can be used by any validation needing
+    to match rows of two data sets on key columns.
+
+    Parameters
+    ----------
+    src_df : dataframe
+        Source data
+    trg_df : dataframe
+        Target data
+    ls_ref_src : list
+        List of reference columns (or index levels) of source
+    ls_ref_trg : list, default None
+        List of reference columns (or index levels) of target, in same order as of source. Same as ls_ref_src if not given.
+    codes : tuple of 2 numpy arrays, default None
+        Output of get_key_codes() for src_df and trg_df, if already computed
+
+    returns
+    --------
+    dict : having below keys
+        'left_only' : bool numpy array, rows of source not present in target
+        'right_only' : bool numpy array, rows of target not present in source
+        'src_both' : bool numpy array, rows of source present in target
+        'trg_both' : bool numpy array, rows of target present in source
+        'src_pos', 'trg_pos' : int64 numpy arrays, positions of common rows in source and the matching rows in target.
+        Source rows are in their original order, in case of duplicate reference values first matching target row is used.
+        'src_codes', 'trg_codes' : int64 numpy arrays, code of reference values of every row, same code on both sides for same values
+    """
+    ls_ref_trg = ls_ref_src if ls_ref_trg == None else ls_ref_trg
+    src_codes, trg_codes = get_key_codes(src_df, trg_df, ls_ref_src, ls_ref_trg) if codes is None else codes
+    n_codes = max(src_codes.max(initial=-1), trg_codes.max(initial=-1)) + 1
+
+    # first position of every code in target, -1 if code not in target
+    trg_first = _get_first_positions(trg_codes, n_codes)
+    in_src = np.zeros(n_codes, dtype=bool)
+    in_src[src_codes] = True
+
+    src_match = trg_first[src_codes]
+    src_both = src_match >= 0
+    trg_both = in_src[trg_codes]
+    src_pos = np.nonzero(src_both)[0]
+
+    return {'left_only': ~src_both, 'right_only': ~trg_both, 'src_both': src_both, 'trg_both': trg_both,
+            'src_pos': src_pos, 'trg_pos': src_match[src_pos], 'src_codes': src_codes, 'trg_codes': trg_codes}
+
+
+def get_duplicate_keys(df, ls_ref, codes=None):
+    """Finds duplicate reference values of dataframe by counting the rows per key code, without sorting or grouping the data.
+
+    Parameters
+    ----------
+    df : dataframe
+        DataFrame having reference columns as columns or index levels
+    ls_ref : list
+        List of reference columns
+    codes : numpy array, default None
+        Key code of every row of df, e.g. 'src_codes' or 'trg_codes' of align_reference_keys(). Computed if not given.
+
+    returns
+    --------
+    DataFrame : reference values present more than once along with their 'Count', sorted on reference values. Empty if
+    reference values are unique.
+    """
+    if codes is None:
+        codes = get_key_codes(df, df.iloc[:0], ls_ref, ls_ref)[0]
+    counts = np.bincount(codes) if len(codes) > 0 else np.zeros(0, dtype='int64')
+    dup_codes = np.nonzero(counts > 1)[0]
+
+    # first row of every duplicate key gives its reference values
+    rows = _get_first_positions(codes, len(counts))[dup_codes]
+
+    df_dup = pd.DataFrame({c: _get_key_values(df, c)[rows] for c in ls_ref})
+    df_dup['Count'] = counts[dup_codes]
+    return df_dup.sort_values(ls_ref, kind='mergesort').reset_index(drop=True)
+
+
+def _get_first_positions(codes, n_codes):
+    """Returns first position of every code 0 to n_codes - 1 in codes (int64 numpy array), -1 if code is not present"""
+    first = np.full(n_codes, len(codes), dtype='int64')
+    np.minimum.at(first, codes, np.arange(len(codes), dtype='int64'))
+    first[first == len(codes)] = -1
+    return first
+
+
+def has_duplicate_codes(codes):
+    """Checks if any key code (int64 numpy array, see get_key_codes()) is present more than once"""
+    return len(codes) > 0 and bool((np.bincount(codes) > 1).any())
+
+
+def get_key_codes(src_df, trg_df, ls_ref_src, ls_ref_trg):
+    """Returns int64 codes of reference values of source and target rows, same values get same code on both sides.
+
+    Codes are computed once and can be used for all the key based steps of a comparison e.g. duplicate check
+    (has_duplicate_codes()), key buckets (get_data_fingerprint()) and alignment (align_reference_keys()). Codes of
+    a subset of rows are still valid for these steps. Nulls in reference columns get a code of their own.
+
+    returns
+    --------
+    tuple of 2 numpy arrays : codes of source rows and codes of target rows
+    """
+    n = len(src_df)
+    codes = np.zeros(n + len(trg_df), dtype='int64')
+    for c_src, c_trg in zip(ls_ref_src, ls_ref_trg):
+        vals = np.concatenate([_get_key_values(src_df, c_src), _get_key_values(trg_df, c_trg)])
+        col_codes, uniques = pd.factorize(vals)
+        col_codes = np.where(col_codes < 0, len(uniques), col_codes)  # nulls get a code of their own
+        # codes are compacted after each column so that combined code never overflows
+        codes, _ = pd.factorize(codes * (len(uniques) + 1) + col_codes)
+        codes = codes.astype('int64')
+    return codes[:n], codes[n:]
+
+
+def _get_key_values(df, col):
+    """Returns values of column or index level of dataframe as numpy array"""
+    if col in df.columns:
+        return df[col].to_numpy()
+    return df.index.get_level_values(col).to_numpy()
+
+
+def get_diff_pairs(src_df, trg_df, src_pos, trg_pos, ls_cols, n_jobs=1, threshold=0, column_rules=None):
+    """Returns the positions of common rows of source and target having differences in any of the columns.
+
+    If n_jobs is 1, rows are compared on 64-bit row fingerprints and threshold/rules are to be applied later on the
+    differences. If n_jobs > 1, columns are split into groups compared in parallel processes (see
+    get_diff_mask_in_parallel()) and threshold/rules are applied there itself.
+
+    returns
+    --------
+    tuple of 2 numpy arrays : positions in source and matching positions in target of rows having differences
+    """
+    if n_jobs > 1 and len(ls_cols) > 1:
+        diff = get_diff_mask_in_parallel(src_df, trg_df, src_pos, trg_pos, ls_cols, n_jobs, threshold, column_rules).any(1)
+    else:
+        diff = get_row_fingerprints(src_df.iloc[src_pos], ls_cols) != get_row_fingerprints(trg_df.iloc[trg_pos], ls_cols)
+    return src_pos[diff], trg_pos[diff]
+
+
+def get_diff_mask_in_parallel(src_df, trg_df, src_pos, trg_pos, ls_cols, n_jobs, threshold=0, column_rules=None):
+    """Compares aligned rows of source and target column by column, column groups being compared in a process pool.
+
+    Each task gets only the aligned rows of the columns of its group, pickled to the worker process. Memory used is
+    about one more copy of the compared rows, not of the whole dataframes.
+
+    Worker processes are started with 'spawn' on Windows (and macOS), which imports the main module again in every
+    worker. The script calling compare() with n_jobs > 1 must therefore run it under an
+    ``if __name__ == '__main__':`` guard, else the workers fail to start.
+
+    Parameters
+    ----------
+    src_df : dataframe
+        Source data
+    trg_df : dataframe
+        Target data
+    src_pos : numpy array
+        Positions of rows in source, i-th row is compared with target row at trg_pos[i]
+    trg_pos : numpy array
+        Positions of rows in target
+    ls_cols : list
+        List of columns to compare, same in source and target
+    n_jobs : int
+        Number of processes
+    threshold : int or float, default 0
+        See get_equality_mask()
+    column_rules : dict, default None
+        See get_equality_mask()
+
+    returns
+    --------
+    numpy.ndarray : boolean array of shape (len(src_pos), len(ls_cols)), True where source and target values are different
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    column_rules = column_rules if column_rules != None else {}
+    groups = [list(g) for g in np.array_split(np.array(ls_cols, dtype=object), min(n_jobs, len(ls_cols)))]
+
+    with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+        futures = [executor.submit(_get_diff_mask_of_column_group, src_df[g].iloc[src_pos].reset_index(drop=True),
+                                   trg_df[g].iloc[trg_pos].reset_index(drop=True), threshold,
+                                   {c: column_rules[c] for c in g if c in column_rules}) for g in groups]
+        diff_mask = np.concatenate([f.result() for f in futures], axis=1)
+    return diff_mask
+
+
+def _get_diff_mask_of_column_group(src_vals, trg_vals, threshold, column_rules):
+    """Worker of get_diff_mask_in_parallel(), compares one group of aligned columns"""
+    return ~get_equality_mask(src_vals, trg_vals, threshold, column_rules)
+
+
+def is_sorted_by_keys(df, ls_ref):
+    """Checks if rows are in strictly increasing order of reference columns, compared column by column like ORDER BY.
+
+    No index is created, only the rows having same values in previous columns are checked on next column.
+    Duplicate or null reference values and values which can not be ordered return False.
+
+    Parameters
+    ----------
+    df : dataframe
+        DataFrame having data
+    ls_ref : list
+        List of reference columns, in order of sorting
+
+    returns
+    --------
+    bool : True if rows are sorted on reference columns and reference values are unique
+    """
+    if df[ls_ref].isna().any().any():
+        return False
+    pos = np.arange(len(df) - 1)
+    for c in ls_ref:
+        vals = df[c].to_numpy()
+        prev, nxt = vals[pos], vals[pos + 1]
+        try:
+            if np.asarray(prev > nxt, dtype=bool).any():
+                return False
+            pos = pos[np.asarray(prev == nxt, dtype=bool)]  # ties are decided by next column
+        except TypeError:
+            return False
+        if len(pos) == 0:
+            return True
+    return False
+
+
+def get_sorted_merge_positions(src_df, trg_df, ls_ref):
+    """Matches rows of two dataframes sorted on reference columns having unique values (see is_sorted_by_keys()).
+
+    Reference values of source are searched in sorted target values as they are, without hashing or sorting them.
+    First column is searched with np.searchsorted() giving the range of target rows having same value, next columns
+    are searched only within these ranges, so composite keys are compared column by column like ORDER BY.
+
+    returns
+    --------
+    tuple of 4 numpy arrays : positions of common rows in source, positions of same rows in target, positions of
+    extra rows in source and positions of extra rows in target. All positions are in sorted order of reference columns.
+    Raises TypeError if reference values of source and target can not be compared with each other.
+    """
+    n_trg = len(trg_df)
+    lo, hi = np.zeros(len(src_df), dtype='int64'), np.full(len(src_df), n_trg, dtype='int64')
+    for i, c in enumerate(ls_ref):
+        src_vals, trg_vals = _get_key_values(src_df, c), _get_key_values(trg_df, c)
+        if i == 0:
+            lo, hi = np.searchsorted(trg_vals, src_vals, 'left'), np.searchsorted(trg_vals, src_vals, 'right')
+        else:
+            lo, hi = _search_in_ranges(trg_vals, src_vals, lo, hi, 'left'), _search_in_ranges(trg_vals, src_vals, lo, hi, 'right')
+
+    # target values are unique, so range of a common row has only its matching target row
+    found = lo < hi
+    src_pos = np.nonzero(found)[0]
+    trg_pos = lo[found].astype('int64')
+    trg_found = np.zeros(n_trg, dtype=bool)
+    trg_found[trg_pos] = True
+    return src_pos, trg_pos, np.nonzero(~found)[0], np.nonzero(~trg_found)[0]
+
+
+def _search_in_ranges(vals, x, lo, hi, side):
+    """Binary search of x[i] in sorted slice vals[lo[i]:hi[i]] for all i at once, like np.searchsorted() with given side"""
+    lo, hi = lo.copy(), hi.copy()
+    active = np.nonzero(lo < hi)[0]
+    while len(active) > 0:
+        mid = (lo[active] + hi[active]) // 2
+        if side == 'left':
+            go_right = np.asarray(vals[mid] < x[active], dtype=bool)
+        else:
+            go_right = np.asarray(vals[mid] <= x[active], dtype=bool)
+        lo[active[go_right]] = mid[go_right] + 1
+        hi[active[~go_right]] = mid[~go_right]
+        active = active[lo[active] < hi[active]]
+    return lo
+
+
+def compare_by_sorted_merge(src_df, trg_df, ls_ref, ls_cols, n_jobs=1, threshold=0, column_rules=None):
+    """Compares two dataframes already sorted on reference columns by matching them in key order, without hashing the keys.
+
+    Parameters are same as compare_by_row_hash().
+
+    returns
+    --------
+    tuple of 3 DataFrames : common differences, extra rows in source, extra rows in target.
+    None if any of the dataframes is not sorted on reference columns, has duplicate reference values or reference
+    values of source and target can not be compared with each other.
+    """
+    if not (is_sorted_by_keys(src_df, ls_ref) and is_sorted_by_keys(trg_df, ls_ref)):
+        return None
+
+    try:
+        src_pos, trg_pos, extra_src_pos, extra_trg_pos = get_sorted_merge_positions(src_df, trg_df, ls_ref)
+    except TypeError:
+        return None
+    src_pos, trg_pos = get_diff_pairs(src_df, trg_df, src_pos, trg_pos, ls_cols, n_jobs, threshold, column_rules)
+
+    out_cols = ls_ref + ls_cols
+    comm_diffs = build_comm_diffs(src_df[out_cols].iloc[src_pos], trg_df[out_cols].iloc[trg_pos], ls_ref, sort_pairs=False)
+    extra_src = src_df.iloc[extra_src_pos].reset_index(drop=True)
+    extra_trg = trg_df.iloc[extra_trg_pos].reset_index(drop=True)
+
+    return comm_diffs, extra_src, extra_trg
+
+
+def get_data_fingerprint(df, ls_ref, cols, n_buckets=fingerprint_buckets, key_codes=None):
+    """Computes order independent fingerprint of data set, as sum of 64-bit row fingerprints, in total and per key bucket.
+
+    Two data sets having same rows in any order have same fingerprint. Rows having same reference values are always in
+    same bucket, so a bucket having different fingerprint in source and target has all the differences of its keys.
+
+    Parameters
+    ----------
+    df : dataframe
+        DataFrame having data
+    ls_ref : list
+        List of reference columns, used for buckets
+    cols : list
+        List of columns used for row fingerprints, in this order
+    n_buckets : int, default fingerprint_buckets
+        Number of key buckets
+    key_codes : numpy array, default None
+        Key code of every row of df (see get_key_codes()). If given, buckets are computed from codes instead of hashing
+        reference columns. Codes of both data sets must come from same get_key_codes() call.
+
+    returns
+    --------
+    dict : having 'total' (sum of row fingerprints), 'bucket_fp' (uint64 sum per bucket), 'bucket_cnt' (rows per bucket)
+    and 'buckets' (bucket number of every row)
+    """
+    row_fp = get_row_fingerprints(df, cols)
+    buckets = get_key_buckets(df, ls_ref, n_buckets) if key_codes is None else key_codes % n_buckets
+    bucket_fp = np.zeros(n_buckets, dtype='uint64')
+    np.add.at(bucket_fp, buckets, row_fp)  # uint64 sums wrap around, which is fine for fingerprints
+    return {'total': row_fp.sum(dtype='uint64'), 'bucket_fp': bucket_fp,
+            'bucket_cnt': np.bincount(buckets, minlength=n_buckets), 'buckets': buckets}
+
+
+def get_mismatching_buckets(src_fp, trg_fp):
+    """Returns boolean numpy array, True for buckets having different fingerprint or row count in source and target.
+    src_fp and trg_fp are outputs of get_data_fingerprint() having same number of buckets"""
+    return (src_fp['bucket_fp'] != trg_fp['bucket_fp']) | (src_fp['bucket_cnt'] != trg_fp['bucket_cnt'])
+
+
+def build_key_hash_snapshot(src_df, trg_df, ls_ref_src, ls_ref_trg, cols_src, cols_trg):
+    """Builds compact snapshot of data sets having reference values and 64-bit row fingerprint of source and target per key.
+
+    Reference values are kept as text so that snapshot can be matched with data of next run even if types are different.
+
+    Parameters
+    ----------
+    src_df : dataframe
+        Source data
+    trg_df : dataframe
+        Target data
+    ls_ref_src : list
+        List of reference columns of source, also used as column names in snapshot
+    ls_ref_trg : list
+        List of reference columns of target, in same order as of source
+    cols_src : list
+        List of columns of source used for fingerprint
+    cols_trg : list
+        List of columns of target used for fingerprint, in same order as of cols_src
+
+    returns
+    --------
+    tuple : (snapshot DataFrame having reference columns, 'SRC_HASH' and 'TRG_HASH' columns ('UInt64', null if key is not
+    present on that side), source row position of every snapshot row (-1 if not in source), target row position (-1 if not in target))
+    """
+    src_keys = src_df[ls_ref_src].astype(str)
+    trg_keys = trg_df[ls_ref_trg].astype(str)
+    trg_keys.columns = ls_ref_src
+    keys = align_reference_keys(src_keys, trg_keys, ls_ref_src)
+
+    n_src, trg_only = len(src_df), np.nonzero(keys['right_only'])[0]
+    src_pos = np.concatenate([np.arange(n_src), np.full(len(trg_only), -1)])
+    trg_pos = np.full(n_src + len(trg_only), -1)
+    trg_pos[keys['src_pos']] = keys['trg_pos']
+    trg_pos[n_src:] = trg_only
+
+    snapshot = pd.concat([src_keys, trg_keys.iloc[trg_only]], ignore_index=True)
+    for col, df, cols, pos in [('SRC_HASH', src_df, cols_src, src_pos), ('TRG_HASH', trg_df, cols_trg, trg_pos)]:
+        fp = get_row_fingerprints(df, cols)
+        snapshot[col] = pd.array(np.where(pos >= 0, fp[pos], 0), dtype='UInt64')
+        snapshot.loc[pos < 0, col] = pd.NA
+    return snapshot, src_pos, trg_pos
+
+
+def get_changed_snapshot_keys(new_snapshot, old_snapshot, ls_ref):
+    """Finds keys of new snapshot to be compared, i.e. keys new or changed since old snapshot or which were not same in old snapshot.
+
+    Snapshots are outputs of build_key_hash_snapshot(). Keys same in old snapshot (same hash on both sides) and not
+    changed on any side since then are same now also, so they need not be compared.
+
+    returns
+    --------
+    tuple : (bool numpy array, True for rows of new snapshot to be compared, dict having 'new', 'removed' and 'changed' key counts)
+    """
+    keys = align_reference_keys(new_snapshot, old_snapshot, ls_ref)
+    new_pos, old_pos = keys['src_pos'], keys['trg_pos']
+
+    def same(a, b):
+        # nulls (key not present on that side) are same only with nulls
+        a, b = a.reset_index(drop=True), b.reset_index(drop=True)
+        return ((a == b).fillna(False) | (a.isna() & b.isna())).to_numpy(dtype=bool)
+
+    old_src, old_trg = old_snapshot['SRC_HASH'].iloc[old_pos], old_snapshot['TRG_HASH'].iloc[old_pos]
+    unchanged = same(new_snapshot['SRC_HASH'].iloc[new_pos], old_src) & same(new_snapshot['TRG_HASH'].iloc[new_pos], old_trg)
+    was_same = same(old_src, old_trg) & old_src.notna().to_numpy(dtype=bool)
+
+    to_compare = keys['left_only'].copy()
+    to_compare[new_pos] = ~(unchanged & was_same)
+    changes = {'new': int(keys['left_only'].sum()), 'removed': int(keys['right_only'].sum()), 'changed': int((~unchanged).sum())}
+    return to_compare, changes
+
+
+def get_key_buckets(df, ls_ref, n_buckets):
+    """Returns bucket number (int64 numpy array) of every row, computed from hash of reference columns"""
+    return (pd.util.hash_pandas_object(df[ls_ref], index=False).values % np.uint64(n_buckets)).astype('int64')
+
+
+def spill_to_buckets(chunks, ls_ref, n_buckets, spill_dir, prefix, prepare_chunk=None):
+    """Hash partitions the data on reference columns into on-disk parquet bucket files.
+
+    Rows having same reference values always go in same bucket number, so bucket i of source is to be compared only
+    with bucket i of target. Chunks are processed one by one and only one chunk is in memory at a time.
+
+    Parameters
+    ----------
+    chunks : iterable of dataframes
+        Chunks of data, e.g. pd.read_csv(..., chunksize=n) or a list having a dataframe
+    ls_ref : list
+        List of reference columns
+    n_buckets : int
+        Number of buckets to create
+    spill_dir : str
+        Folder where bucket files are written
+    prefix : str
+        Prefix of bucket file names, e.g. 'src' or 'trg'
+    prepare_chunk : function, default None
+        If given, every chunk is passed through this function before partitioning
+
+    returns
+    --------
+    int : total number of rows written in buckets
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writers = {}
+    n_rows = 0
+    try:
+        for df in chunks:
+            if prepare_chunk != None:
+                df = prepare_chunk(df)
+            if len(df) == 0:
+                continue
+            n_rows += len(df)
+
+            # rows of a chunk are grouped by bucket with one stable sort
+            buckets = get_key_buckets(df, ls_ref, n_buckets)
+            order = np.argsort(buckets, kind='stable')
+            bounds = np.searchsorted(buckets[order], np.arange(n_buckets + 1))
+            for b in range(n_buckets):
+                if bounds[b] == bounds[b + 1]:
+                    continue
+                table = pa.Table.from_pandas(df.iloc[order[bounds[b]:bounds[b + 1]]], preserve_index=False)
+                if b not in writers:
+                    writers[b] = pq.ParquetWriter(get_bucket_path(spill_dir, prefix, b), table.schema)
+                writers[b].write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return n_rows
+
+
+def get_bucket_path(spill_dir, prefix, bucket):
+    """Returns path of the bucket file"""
+    return os.path.join(spill_dir, f"{prefix}_{bucket}.parquet")
+
+
+def read_bucket(spill_dir, prefix, bucket, cols):
+    """Reads bucket file in dataframe. If bucket file was not created (no row in bucket), returns blank dataframe having given columns"""
+    path = get_bucket_path(spill_dir, prefix, bucket)
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=cols, dtype=object)
+    return pd.read_parquet(path)[cols]
+
+
+def get_equality_mask(src_vals, trg_vals, threshold=0, column_rules=None):
+    """Compares aligned source and target values column by column, using array operations.
+
+    Without any rule, values are same only if equal. Where a numerical tolerance applies (threshold > 0, 'abs_tol' or
+    'rel_tol' rule), column is converted to numbers once with pd.to_numeric(errors='coerce') and the values that are
+    numbers on both sides are same if their difference is within tolerance. Other values are compared as is.
+
+    Parameters
+    ----------
+    src_vals : dataframe
+        Source values, i-th row is compared with i-th row of trg_vals
+    trg_vals : dataframe
+        Target values having same columns as src_vals
+    threshold : int or float, default 0
+        Acceptable absolute difference between two numbers, for columns not having 'abs_tol' rule
+    column_rules : dict, default None
+        Comparison rules per column as {column name: {rule: value}}. Valid rules are:
+        'abs_tol' (number) - acceptable absolute difference between two numbers
+        'rel_tol' (number) - acceptable difference relative to the larger absolute value, e.g. 1e-6
+        'ignore_case' (bool) - text compared case insensitively
+        'trim' (bool) - leading and trailing spaces ignored
+        'date_only' (bool) - date/timestamps compared on date part only, time is ignored
+        'null_values' (list) - values treated as null, e.g. ['', '(null)', 'NULL']. Two nulls are same, null and non-null are different
+
+    returns
+    --------
+    numpy.ndarray : boolean array of shape (rows, columns), True where source and target values are same
+    """
+    column_rules = column_rules if column_rules != None else {}
+    mask = np.empty(src_vals.shape, dtype=bool)
+    for j, c in enumerate(src_vals.columns):
+        mask[:, j] = _get_column_equality(src_vals[c], trg_vals[c], threshold, column_rules.get(c, {}))
+    return mask
+
+
+def validate_column_rules(column_rules, ls_cols):
+    """Checks the comparison rules given per column and returns them with upper case column names"""
+    if column_rules == None:
+        return {}
+    rules = {str(c).upper(): r for c, r in column_rules.items()}
+    for c, r in rules.items():
+        if c not in ls_cols:
+            raise Exception(f"Comparison rule given for column '{c}' which is not in columns to compare {ls_cols}")
+        invalid = [x for x in r if x not in comparison_rules]
+        if len(invalid) > 0:
+            raise Exception(f"Invalid comparison rule {invalid} for column '{c}'. Valid rules are {comparison_rules}")
+    return rules
+
+
+def _get_column_equality(s, t, threshold, rules):
+    """Returns boolean array, True where source and target values of a column are same as per rules"""
+    s = pd.Series(np.asarray(s, dtype=object))
+    t = pd.Series(np.asarray(t, dtype=object))
+    null_values = list(rules.get('null_values', []))
+
+    if rules.get('trim', False):
+        s, t = s.astype(str).str.strip(), t.astype(str).str.strip()
+        null_values = [str(x).strip() for x in null_values]
+    if rules.get('ignore_case', False):
+        s, t = s.astype(str).str.lower(), t.astype(str).str.lower()
+        null_values = [str(x).lower() for x in null_values]
+
+    same = (s == t).values.astype(bool)
+    same[(s.isna() & t.isna()).values] = True  # two nulls are same, relevant for typed comparison
+
+    abs_tol = rules.get('abs_tol', threshold)
+    rel_tol = rules.get('rel_tol', 0)
+    if abs_tol > 0 or rel_tol > 0 or 'abs_tol' in rules:
+        s_num = pd.to_numeric(s, errors='coerce').values.astype('float64')
+        t_num = pd.to_numeric(t, errors='coerce').values.astype('float64')
+        both_num = ~np.isnan(s_num) & ~np.isnan(t_num)
+        diff = np.abs(s_num[both_num] - t_num[both_num])
+        tol = np.maximum(abs_tol, rel_tol * np.maximum(np.abs(s_num[both_num]), np.abs(t_num[both_num])))
+        same[both_num] = diff <= tol
+
+    if rules.get('date_only', False):
+        s_dt = _to_datetime(s)
+        t_dt = _to_datetime(t)
+        both_dt = (s_dt.notna() & t_dt.notna()).values
+        same[both_dt] = (s_dt.dt.normalize() == t_dt.dt.normalize()).values[both_dt]
+
+    if len(null_values) > 0:
+        s_null = s.isin(null_values).values
+        t_null = t.isin(null_values).values
+        same[s_null & t_null] = True
+        same[s_null != t_null] = False
+    return same
+
+
+def _to_datetime(s):
+    """Converts values to timestamps, values which are not date/timestamp become NaT. Formats may be mixed in column"""
+    if int(pd.__version__.split('.')[0]) >= 2:
+        return pd.to_datetime(s, errors='coerce', format='mixed')
+    return pd.to_datetime(s, errors='coerce')
+
+
+def get_column_profile(df, cols, null_value='(null)', approx_distinct=False):
+    """Computes unique and null counts of columns in a single pass per column, on integer codes of the values.
+
+    Categorical columns use their category codes, other columns are factorized once. Both counts come from a single
+    bincount of the codes, instead of separate nunique() and filter on values.
+
+    Parameters
+    ----------
+    df : dataframe
+        DataFrame having data
+    cols : list
+        List of columns to profile
+    null_value : str, default '(null)'
+        String used as null marker in data, counted as null along with missing values
+    approx_distinct : bool, default False
+        If True, unique counts are estimated by HyperLogLog, which takes much less memory and time for large data.
+        HyperLogLog registers are kept in profile so that profiles of chunks can be merged (see merge_column_profiles())
+
+    returns
+    --------
+    dict : {'rows': row count, 'approx_distinct': approx_distinct, 'columns': {column: {'unique': count, 'nulls': count}}}
+    Column entries have 'hll' registers also if approx_distinct is True. Missing values are not counted as unique values.
+    """
+    profile = {'rows': len(df), 'approx_distinct': approx_distinct, 'columns': dict()}
+    for c in cols:
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+        else:
+            codes, uniques = pd.factorize(s)
+        counts = np.bincount(codes.astype('int64') + 1, minlength=len(uniques) + 1)  # first count is of missing values
+        null_code = pd.Index(uniques).get_indexer([null_value])[0]
+
+        col_profile = {'unique': int((counts[1:] > 0).sum()),
+                       'nulls': int(counts[0] + (counts[null_code + 1] if null_code >= 0 else 0))}
+        if approx_distinct:
+            # hash of every distinct value is added once, value counts do not matter for HyperLogLog
+            col_profile['hll'] = get_hll_registers(np.asarray(uniques)[counts[1:] > 0])
+            col_profile['unique'] = get_hll_estimate(col_profile['hll'])
+        profile['columns'][c] = col_profile
+    return profile
+
+
+def merge_column_profiles(profile1, profile2):
+    """Merges two profiles of same columns computed with approx_distinct=True, e.g. of two chunks of a data set.
+    Either profile can be None."""
+    if profile1 == None or profile2 == None:
+        return profile2 if profile1 == None else profile1
+    profile = {'rows': profile1['rows'] + profile2['rows'], 'approx_distinct': True, 'columns': dict()}
+    for c, p1 in profile1['columns'].items():
+        p2 = profile2['columns'][c]
+        hll = np.maximum(p1['hll'], p2['hll'])
+        profile['columns'][c] = {'unique': get_hll_estimate(hll), 'nulls': p1['nulls'] + p2['nulls'], 'hll': hll}
+    return profile
+
+
+def get_hll_registers(values, p=14):
+    """Returns HyperLogLog registers (uint8 numpy array of size 2**p) of given values. Registers of two sets of
+    values can be merged by np.maximum() to get registers of their union."""
+    h = pd.util.hash_array(np.asarray(values, dtype=object))
+    idx = (h >> np.uint64(64 - p)).astype('int64')
+    rest = h & np.uint64((1 << (64 - p)) - 1)
+    # rank is position of first 1 bit in remaining 64 - p bits, frexp exponent is bit length (exact below 2**53)
+    rank = (64 - p) - np.frexp(rest.astype('float64'))[1] + 1
+    registers = np.zeros(1 << p, dtype='uint8')
+    np.maximum.at(registers, idx, rank.astype('uint8'))
+    return registers
+
+
+def get_hll_estimate(registers):
+    """Returns estimated distinct count from HyperLogLog registers"""
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.power(2.0, -registers.astype('float64')))
+    zeros = int((registers == 0).sum())
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * np.log(m / zeros)  # small range correction
+    return int(round(estimate))
+
+
+def format_profile_counts(src_profile, trg_profile, count):
+    """Returns counts of source and target profiles in summary format e.g. 'COL1: src=10 trg=12;\nCOL2: src=...'.
+    count is 'unique' or 'nulls'. Estimated counts are shown with '~'."""
+    def fmt(profile, c):
+        approx = '~' if count == 'unique' and profile['approx_distinct'] else ''
+        return approx + str(profile['columns'][c][count])
+    return ';\n'.join([c + ': src=' + fmt(src_profile, c) + ' trg=' + fmt(trg_profile, c) for c in src_profile['columns']])
+
+
+def align_column_types(src_df, trg_df, cols, null_value='(null)'):
+    """Converts the columns of source and target to same types so that they can be compared natively, without converting to string.
+
+    Null marker strings (e.g. '(null)' written by db readers) are converted to nulls. Columns having integers on both sides
+    become nullable 'Int64', numbers (int, float, decimal) become 'float64', date/timestamps become datetime and categorical
+    columns get same categories on both sides. Other columns are kept as is if both sides have same kind of values, else
+    converted to string on both sides.
+
+    Parameters
+    ----------
+    src_df : dataframe
+        Source data
+    trg_df : dataframe
+        Target data
+    cols : list
+        List of columns to align, present in both dataframes
+    null_value : str, default '(null)'
+        String used as null marker in data
+
+    returns
+    --------
+    tuple of 2 DataFrames : source and target dataframes having aligned columns, in order of cols
+    """
+    src_cols, trg_cols = {}, {}
+    for c in cols:
+        src_cols[c], trg_cols[c] = _align_types(src_df[c], trg_df[c], null_value)
+    return pd.DataFrame(src_cols, index=src_df.index), pd.DataFrame(trg_cols, index=trg_df.index)
+
+
+def _align_types(s, t, null_value):
+    """Returns source and target column converted to same type"""
+    s = _replace_null_marker(s, null_value)
+    t = _replace_null_marker(t, null_value)
+    ks, kt = _get_type_kind(s), _get_type_kind(t)
+    ks = kt if ks == 'empty' else ks  # column having only nulls takes the type of other side
+    kt = ks if kt == 'empty' else kt
+    # string values of one side are parsed to the type of the other side e.g. numbers read from csv files
+    if ks == 'string' and kt in ['integer', 'floating', 'decimal', 'datetime']:
+        s, ks = _parse_strings(s, kt)
+    elif kt == 'string' and ks in ['integer', 'floating', 'decimal', 'datetime']:
+        t, kt = _parse_strings(t, ks)
+
+    try:
+        if ks == kt == 'integer':
+            return s.astype('Int64'), t.astype('Int64')
+        if ks in ['integer', 'floating', 'decimal'] and kt in ['integer', 'floating', 'decimal']:
+            return pd.to_numeric(s).astype('float64'), pd.to_numeric(t).astype('float64')
+        if ks == kt == 'datetime':
+            return _to_datetime(s), _to_datetime(t)
+        if ks in ['categorical', 'string'] and kt in ['categorical', 'string'] and 'categorical' in [ks, kt]:
+            s, t = s.astype('category'), t.astype('category')
+            categories = s.cat.categories.union(t.cat.categories)
+            return s.cat.set_categories(categories), t.cat.set_categories(categories)
+    except (ValueError, TypeError, OverflowError):
+        ks = None  # values not convertible, compare as string
+
+    if ks == kt and ks != 'empty':
+        return s, t
+    return _to_string(s, null_value), _to_string(t, null_value)
+
+
+def _parse_strings(s, kind):
+    """Returns string column parsed to given kind of values and its new kind, or column as is if all values can not be parsed"""
+    try:
+        if kind == 'datetime':
+            parsed = _to_datetime(s)
+        else:
+            parsed = pd.to_numeric(s)
+    except (ValueError, TypeError, OverflowError):
+        return s, 'string'
+    if parsed.isna().sum() != s.isna().sum():
+        return s, 'string'
+    return parsed, _get_type_kind(parsed)
+
+
+def _replace_null_marker(s, null_value):
+    """Replaces null marker string in column with null"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.remove_categories([null_value]) if null_value in s.cat.categories else s
+    if s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+        return s.where(s != null_value)
+    return s
+
+
+def _get_type_kind(s):
+    """Returns kind of values in column e.g. 'integer', 'floating', 'decimal', 'datetime', 'categorical', 'string', 'empty'"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return 'categorical'
+    kind = pd.api.types.infer_dtype(s, skipna=True)
+    if kind == 'mixed-integer-float':
+        return 'floating'
+    if kind in ['datetime64', 'datetime', 'date']:
+        return 'datetime'
+    return kind
+
+
+def _to_string(s, null_value='(null)'):
+    """Converts column to string, nulls are converted to null marker string"""
+    s = s.astype(object)
+    return s.where(s.notna(), null_value).astype(str)
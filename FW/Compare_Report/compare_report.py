@@ -1,8 +1,10 @@
 import sys, os, shutil, openpyxl, threading, multiprocessing,  time, datetime, pytz, getpass
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from openpyxl import load_workbook 
 from openpyxl.styles import PatternFill
+from openpyxl.cell import WriteOnlyCell
 import FW.Initialize.initialize_global_variables as iniVar
 from openpyxl.styles import Border, Side, Alignment, Font, Color
 from FW.FW_logger import loggerPass, loggerFail, loggerInfo, loggerDisplay
@@ -10,9 +12,22 @@ from FW.FW_logger import add_in_reporting_dict, check_key_in_reporting_dict, get
 import FW.FW_logger as logger
 from FW.FW_exec_db_update import update_exec_db
 from FW.FW_Run_Post_Hook import run_post_test_hook
+import FW.Compare_Report.compare_engine as ce
 
 # Max diffrence records that will be populated in difference dataframes by default 
 default_reportdiffSize = 1000
+# Excel report backends, set by 'ReportBackend' in project_config.ini. 'streaming' writes report of the whole batch in one
+# write only workbook which is saved only once, after the last test of batch
+report_backends = ['openpyxl', 'streaming']
+# Fonts of logger steps in detailed tab, by type of step and if step links to additional detailed tab
+logger_step_fonts = {'PASS': Font(color='FF008000', bold=True), 'FAIL': Font(color='FFFF0000', bold=True),
+                     'PASS_link': Font(italic=True, underline='single', color='FF008000'),
+                     'FAIL_link': Font(italic=True, underline='single', color='FFFF0000')}
+# Report formats, set by 'ReportFormat' in project_config.ini. 'html' writes full differences as parquet files along with
+# static html report having paginated tables loading their rows in chunks, 'both' writes excel report too
+report_formats = ['excel', 'html', 'both']
+# rows in each chunk of paginated tables of html report, even so that source and target rows of a pair are in same chunk
+html_report_chunk_size = 1000
 def set_data_size_in_report(size):
     """Override the number of records to be printed in Excel report for differring and extra records"""
     if str(size).lower() == 'all':
@@ -21,6 +36,26 @@ def set_data_size_in_report(size):
         size = size if size % 2 == 0 else size+1
         add_in_reporting_dict('data_size_in_report', size)
 
+# Modes of colouring the difference cells in report. 'fill' colours each cell, 'conditional' adds one conditional formatting
+# rule over contiguous ranges of difference cells so that formatting cost does not grow with the number of differences
+diff_cells_format_modes = ['fill', 'conditional']
+def set_diff_cells_format_mode(mode):
+    """Override the mode of colouring the difference cells in Excel report, 'fill' (default) or 'conditional'"""
+    if mode not in diff_cells_format_modes:
+        raise Exception(f"Invalid diff cells format mode '{mode}'. Valid modes are {diff_cells_format_modes}")
+    add_in_reporting_dict('diff_cells_format_mode', mode)
+
+def _get_diff_cells_format_mode():
+    """Returns the mode of colouring the difference cells in report of current test"""
+    return get_from_reporting_dict('diff_cells_format_mode') if check_key_in_reporting_dict('diff_cells_format_mode') else 'fill'
+
+def _get_report_format():
+    """Returns format of report set by 'ReportFormat' in project_config.ini, 'excel' by default"""
+    report_format = get_from_reporting_dict('ReportFormat') if check_key_in_reporting_dict('ReportFormat') else 'excel'
+    if report_format not in report_formats:
+        raise Exception(f"Invalid ReportFormat '{report_format}' in project_config.ini. Valid values are {report_formats}")
+    return report_format
+
 def set_custom_name_for_result_report(repName):
     """This sets the custom name of result report. Can be called from main function in script"""
     add_in_reporting_dict('custom_name_for_result_report', repName)
@@ -32,8 +67,7 @@ def get_custom_name_set_for_result_report():
 
 def getAndSaveDuplicateReferenceValuesInDF(df,ls_ref_cols, save_csv_name='duplicate_ref_values'):
     """this will dump the duplicate values in ref columns"""
-    df = df.reset_index()[ls_ref_cols].sort_values(ls_ref_cols)
-    df_dup= df[df.duplicated(ls_ref_cols, keep=False)].groupby(ls_ref_cols).size().reset_index().rename(columns={0:'Count'})
+    df_dup = ce.get_duplicate_keys(df, ls_ref_cols)
 
     save_csv_path = os.path.join(iniVar.current_project_path, "Reports", save_csv_name + ".csv")
     df_dup.to_csv(save_csv_path, index=False)
@@ -41,7 +75,7 @@ def getAndSaveDuplicateReferenceValuesInDF(df,ls_ref_cols, save_csv_name='duplic
 
     return df_dup
 
-def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold = 0):
+def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold = 0, engine = 'standard', n_buckets = 32, spill_dir = None, column_rules = None, compare_mode = 'string', n_jobs = 1, fingerprint_check = True, baseline_snapshot = False, approx_distinct = False):
     """Compares two dataframes and generates diffence dataframe, extra rows in first dataframe, extra rows in second dataframe. Additionally this function will add many runtime information to the reporting dictionary that will be used for report preparation.
 
     This functions compares given 2 dataframes and stores the results into reporting
@@ -59,6 +93,55 @@ def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold =
         If not null, then store the comparison table result in this tab in result report
     numeric_threshold : int or float, default 0
         While comparing 2 data sets, for numerical data, it will not fail if the difference is less than or equal to threshold value specified.
+    column_rules : dict, default None
+        Comparison rules per column, applied together in one pass, as {column name: {rule: value}}. Valid rules are:
+        'abs_tol' (number) - acceptable absolute difference between two numbers, overrides numeric_threshold for the column
+        'rel_tol' (number) - acceptable difference relative to the larger absolute value, e.g. 1e-6
+        'ignore_case' (bool) - text compared case insensitively
+        'trim' (bool) - leading and trailing spaces ignored
+        'date_only' (bool) - date/timestamps compared on date part only, time is ignored
+        'null_values' (list) - values treated as null, e.g. ['', '(null)', 'NULL']. Two nulls are same, null and non-null are different
+        e.g. column_rules = {'PREMIUM_AMT': {'abs_tol': 0.01}, 'INTEREST_RATE': {'abs_tol': 0.000001}, 'LAST_NAME': {'ignore_case': True, 'trim': True}}
+    compare_mode : 'string' or 'typed', default 'string'
+        If 'string', all the values are converted to string before comparison.
+        If 'typed', column types of source and target are aligned (integer, float/decimal, date/timestamp, categorical
+        with same categories) and values are compared natively. '(null)' values are treated as nulls and two nulls are same.
+        Columns having different kind of values in source and target are still compared as string. It takes much less
+        memory than 'string' mode, values are converted to string only for the differences written in report.
+        Not supported with 'out_of_core' engine.
+    n_jobs : int, default 1
+        Number of processes used by 'hash' and 'sorted_merge' engines to compare the columns. If > 1, columns are split
+        in n_jobs groups compared in parallel, useful for wide tables. Differences found are same as with n_jobs = 1.
+        On Windows the calling script must run the comparison under an ``if __name__ == '__main__':`` guard.
+    fingerprint_check : bool, default True
+        If True, an order independent fingerprint (sum of 64-bit row hashes) of source and target is compared first.
+        If same and reference values are unique, data sets are identical and comparison is passed without finding
+        differences. Else only the rows of key buckets having different fingerprints are compared. Not used by 'out_of_core' engine.
+    baseline_snapshot : bool, default False
+        If True, a snapshot having reference values and hash of source and target row per key is saved for the test at
+        Reports/Snapshots/<testName>[_<report_tab_name>].parquet. On next run, only the keys new or changed since snapshot
+        or having differences in snapshot are compared, and new, removed and changed keys are logged. Not used if
+        reference values are not unique. Not supported with 'out_of_core' engine. Requires pyarrow.
+    approx_distinct : bool, default False
+        If True, unique counts of columns in summary are estimated by HyperLogLog (about 1% error), faster and taking
+        less memory for very wide or large data sets. 'out_of_core' engine always estimates unique counts.
+    engine : 'standard', 'hash', 'sorted_merge' or 'out_of_core', default 'standard'
+        Decides how the data sets are compared.
+        If 'standard', data sets are indexed on reference columns and all the common rows are compared.
+        If 'hash', each row is reduced to a 64-bit fingerprint, data sets are joined on reference columns once and only
+        the rows having different fingerprints are compared column by column. It is much faster and takes less memory for large data sets.
+        If 'sorted_merge', data sets already sorted on reference columns (e.g. sql having ORDER BY on reference columns)
+        are matched in key order without indexing or re-sorting them, differences are then found like 'hash' engine.
+        If any data set is not sorted or has duplicate reference values, 'hash' engine is used.
+        If 'out_of_core', both data sets are hash partitioned on reference columns into on-disk parquet buckets and bucket
+        pairs are compared one at a time using 'hash' engine. Use it for data sets larger than RAM. In this case first item
+        of ls_src_info and ls_trg_info can also be an iterable of dataframe chunks, e.g. pd.read_csv(file, chunksize=100000).
+        Summary counts are for complete data, however only a sample of differences is kept for report and reference values
+        are compared as text. Unique counts are estimated in this mode. Requires pyarrow.
+    n_buckets : int, default 32
+        Number of on-disk buckets used by 'out_of_core' engine. Increase it if a bucket pair does not fit in RAM.
+    spill_dir : str, default None
+        Folder where 'out_of_core' engine writes temporary bucket files. If None, system temp folder is used. Files are removed after comparison.
 
     returns
     --------
@@ -75,17 +158,30 @@ def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold =
     #[df_src_tr,['POLICY_NUMBER_TEXT','COVERAGE_NUMBER_TEXT'],['POLICY_NUMBER_TEXT','COVERAGE_NUMBER_TEXT','GENDER_CODE']],
     #[df_trg_tr,['POLICY_NUMBER_TEXT','COVERAGE_NUMBER_TEXT'],['POLICY_NUMBER_TEXT','COVERAGE_NUMBER_TEXT','GENDER_CODE']])
     report_tab_name = report_tab_name.replace("-", "_").replace(" ", "") if report_tab_name != None else None
+    if engine not in ce.compare_engines:
+        raise Exception(f"Invalid compare engine '{engine}'. Valid engines are {ce.compare_engines}")
+    if compare_mode not in ce.compare_modes:
+        raise Exception(f"Invalid compare mode '{compare_mode}'. Valid modes are {ce.compare_modes}")
+    if compare_mode == 'typed' and engine == 'out_of_core':
+        raise Exception("compare_mode 'typed' is not supported with 'out_of_core' engine")
+    add_in_reporting_dict('compare_mode', compare_mode)
 
     # Parse info from list arg
-    src_df = ls_src_info[0]
-    src_df.columns = [x.upper() for x in src_df.columns]
     ls_ref_src = [x.upper() for x in ls_src_info[1]]
     ls_col_to_comp_src = [x.upper() for x in ls_src_info[2]]
+    ls_ref_trg = [x.upper() for x in ls_trg_info[1]]
+    ls_col_to_comp_trg = [x.upper() for x in ls_trg_info[2]]
+
+    if engine == 'out_of_core':
+        _compare_out_of_core(ls_src_info[0], ls_trg_info[0], ls_ref_src, ls_col_to_comp_src, ls_ref_trg, ls_col_to_comp_trg,
+                             report_tab_name, numeric_threshold, reportdiffSize, n_buckets, spill_dir, column_rules)
+        return
+
+    src_df = ls_src_info[0]
+    src_df.columns = [x.upper() for x in src_df.columns]
 
     trg_df = ls_trg_info[0]
     trg_df.columns = [x.upper() for x in trg_df.columns]
-    ls_ref_trg = [x.upper() for x in ls_trg_info[1]]
-    ls_col_to_comp_trg = [x.upper() for x in ls_trg_info[2]]
 
     # required columns only and make type to str for comparison
     # src_df = src_df[ls_col_to_comp_src].copy()
@@ -94,11 +190,15 @@ def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold =
     # src_df = src_df[ls_col_to_comp_src].copy().astype(str)
     # trg_df = trg_df[ls_col_to_comp_trg].copy().astype(str)
 
-    src_df = src_df[ls_col_to_comp_src].copy().astype(object).astype(str)
-    trg_df = trg_df[ls_col_to_comp_trg].copy().astype(object).astype(str)
+    if compare_mode == 'typed':
+        src_df = src_df[ls_col_to_comp_src]
+        trg_df = trg_df[ls_col_to_comp_trg]
+    else:
+        src_df = _get_str_df(src_df[ls_col_to_comp_src])
+        trg_df = _get_str_df(trg_df[ls_col_to_comp_trg])
 
     if report_tab_name == None:
-        _update_dict_for_summary_record_from_compare_function(src_df, trg_df, ls_ref_src)
+        _update_dict_for_summary_record_from_compare_function(src_df, trg_df, ls_ref_src, approx_distinct)
 
     #### all column names in 2 lists should match else error to be raised.==================
     if set(ls_col_to_comp_src) == set(ls_col_to_comp_trg):
@@ -106,36 +206,359 @@ def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold =
     else:
         raise Exception(f"columns to be validated in source and target are different. In source, {ls_col_to_comp_src} and in target {ls_col_to_comp_trg}")
 
-    # Change index to numeric tpye if possible
-    for c in ls_ref_src:
-        if (src_df[c].astype(str).str.isnumeric().all() == True) and (trg_df[c].astype(str).str.isnumeric().all() == True):
-            src_df[c] = src_df[c].astype('int64')
-            trg_df[c] = trg_df[c].astype('int64')
+    if compare_mode == 'typed':
+        # align the column types of source and target, reference columns included
+        src_df, trg_df = ce.align_column_types(src_df, trg_df, ls_col_to_comp_src)
+        trg_df = trg_df[ls_col_to_comp_trg]
+        loggerInfo(f"Typed comparison is done with column types {dict(zip(src_df.columns, [str(x) for x in src_df.dtypes]))}")
+    else:
+        # Change index to numeric tpye if possible
+        for c in ls_ref_src:
+            if (src_df[c].astype(str).str.isnumeric().all() == True) and (trg_df[c].astype(str).str.isnumeric().all() == True):
+                src_df[c] = src_df[c].astype('int64')
+                trg_df[c] = trg_df[c].astype('int64')
+
+    # Comparison threshold info
+    add_in_reporting_dict('numeric_threshold', numeric_threshold)
+    if numeric_threshold > 0:
+        loggerInfo(f"Numerical values comparison is done with a difference threshold of <= {numeric_threshold} as acceptable")
+    column_rules = _set_column_rules(column_rules, ls_col_to_comp_trg)
+
+    # reference values are coded once, codes are used for duplicate check, key buckets and key alignment of hash engine
+    key_codes = ce.get_key_codes(src_df, trg_df, ls_ref_src, ls_ref_trg) if baseline_snapshot or fingerprint_check else None
+
+    if baseline_snapshot:
+        src_df, trg_df, key_codes = _compare_with_baseline_snapshot(src_df, trg_df, key_codes, ls_ref_src, ls_ref_trg, ls_col_to_comp_src, report_tab_name)
+
+    if fingerprint_check:
+        is_identical, src_df, trg_df, key_codes = _compare_fingerprints(src_df, trg_df, key_codes, ls_ref_src, ls_ref_trg, ls_col_to_comp_src)
+        if is_identical:
+            out_cols = ls_ref_src + [c for c in ls_col_to_comp_src if c not in ls_ref_src]
+            _store_compare_results_in_reporting_dict(ce.build_comm_diffs(src_df[out_cols][:0], src_df[out_cols][:0], ls_ref_src),
+                                                     src_df[out_cols][:0], trg_df[ls_ref_trg + out_cols[len(ls_ref_src):]][:0],
+                                                     report_tab_name, reportdiffSize)
+            return
+
+    if engine in ['hash', 'sorted_merge']:
+        ls_cols = [c for c in ls_col_to_comp_trg if c not in ls_ref_trg]
+        src_df = src_df[ls_ref_src + [c for c in ls_col_to_comp_src if c not in ls_ref_src]]
+        trg_df = trg_df[ls_ref_trg + ls_cols]
+
+        # sorted data sets have unique reference values, so uniqueness is checked only if they are compared on hash
+        compare_results = None
+        if engine == 'sorted_merge':
+            compare_results = ce.compare_by_sorted_merge(src_df, trg_df, ls_ref_src, ls_cols, n_jobs, numeric_threshold, column_rules)
+            if compare_results == None:
+                loggerInfo(f"Data is not sorted on reference columns {ls_ref_src} or they are not unique, comparison is done using 'hash' engine")
+
+        if compare_results == None:
+            # keys are aligned once, same key codes are used to check uniqueness of reference columns
+            keys = ce.align_reference_keys(src_df, trg_df, ls_ref_src, ls_ref_trg, key_codes)
+            _reportUniquenessOfReferenceCols(src_df, trg_df, keys, ls_ref_src, ls_ref_trg)
+            compare_results = ce.compare_by_row_hash(src_df, trg_df, ls_ref_src, ls_cols, n_jobs, numeric_threshold, column_rules, keys)
+
+        comm_diffs, extra_src, extra_trg = compare_results
+        comm_diffs, mismatch_bitmap = _remove_same_pairs(comm_diffs)  # mismatching cells are found only once, here
+        comm_diffs, mismatch_bitmap = _get_diffs_with_diffs_on_top(comm_diffs, bitmap=mismatch_bitmap)  # bring diff records in all columns on top
+    else:
+        src_df = src_df.set_index(ls_ref_src).sort_index()
+        trg_df = trg_df.set_index(ls_ref_trg).sort_index()
 
-    src_df = src_df.set_index(ls_ref_src).sort_index()
-    trg_df = trg_df.set_index(ls_ref_trg).sort_index()
+        # common and extra rows are found once and used for all the outputs
+        keys = ce.align_reference_keys(src_df, trg_df, ls_ref_src, ls_ref_trg)
 
-    #### check uniquie ness of reference columns
-    _reportUniquenessOfReferenceCols(src_df,trg_df )
+        #### check uniquie ness of reference columns
+        _reportUniquenessOfReferenceCols(src_df, trg_df, keys)
+
+        # common diffs
+        comm_diffs = _getCommonDiffs(src_df, trg_df, ls_ref_src, 0, None, keys)  #Assuming col names in src and trg are same
+        comm_diffs, mismatch_bitmap = _remove_same_pairs(comm_diffs)  # threshold and rules are applied here with mismatching cells found once
+        comm_diffs, mismatch_bitmap = _get_diffs_with_diffs_on_top(comm_diffs, bitmap=mismatch_bitmap)  # bring diff records in all columns on top
+        # extra in src
+        extra_src  = src_df[keys['left_only']].reset_index()
+        # extra in trg
+        extra_trg = trg_df[keys['right_only']].reset_index()
+
+    _store_compare_results_in_reporting_dict(comm_diffs, extra_src, extra_trg, report_tab_name, reportdiffSize, mismatch_bitmap=mismatch_bitmap)
+
+def compare_pushdown(ls_src_info, ls_trg_info, report_tab_name=None, numeric_threshold=0, engine='standard', column_rules=None,
+                     compare_mode='string', key_chunksize=500, key_full_read_threshold=5000):
+    """Compares query results of two databases without fetching all the rows. Each database returns only reference
+    values and md5 hash of every row (computed by generated SQL), hashes are compared locally and full rows are fetched
+    only for the reference values having different hashes or present on one side only. These rows are then compared
+    using compare() function, so report is same as of compare().
+
+    Supported databases are PostgreSQL ('postgres'), Oracle ('oracle', needs 12c or later) and MS SQL server ('mssql').
+    Hash of a row is same in source and target only if its values have same text in both databases, so it is most
+    useful for same type of databases. Rows having different text (e.g. number or date formats) are fetched and compared.
+
+    Parameters
+    ----------
+    ls_src_info : list
+        Information of source in format [db type, config file name, sql, list of reference columns, list of columns to compare]
+        e.g. ['postgres', 'db_config_src', 'select * from policy', ['POLICY_NUMBER'], ['POLICY_NUMBER', 'GENDER_CODE']]
+    ls_trg_info : list
+        Information of target in same format as ls_src_info
+    report_tab_name : str, default None
+        See compare()
+    numeric_threshold : int or float, default 0
+        See compare()
+    engine : 'standard', 'hash' or 'sorted_merge', default 'standard'
+        Engine used by compare() for the fetched rows
+    column_rules : dict, default None
+        See compare()
+    compare_mode : 'string' or 'typed', default 'string'
+        See compare()
+    key_chunksize : int, default 500
+        Number of reference values fetched in one query
+    key_full_read_threshold : int, default 5000
+        If more reference values are to be fetched, all rows of query are fetched once and filtered locally instead
+
+    returns
+    --------
+    None
+    """
+    import FW.FW_Lib_Connect as lib  # imported here as FW_Lib_Connect imports this module
+
+    db_src, config_src, sql_src, ls_ref_src, ls_col_to_comp_src = ls_src_info
+    db_trg, config_trg, sql_trg, ls_ref_trg, ls_col_to_comp_trg = ls_trg_info
+    if engine == 'out_of_core':
+        raise Exception("'out_of_core' engine is not supported in push down comparison")
+    if db_src != db_trg:
+        loggerInfo(f"Source db is '{db_src}' and target db is '{db_trg}', rows having different text of values in both dbs will also be fetched and compared")
+
+    # hash columns in same order on both sides, target columns are matched on upper case names
+    ls_cols_src = [c for c in ls_col_to_comp_src if c.upper() not in [x.upper() for x in ls_ref_src]]
+    trg_col_names = {c.upper(): c for c in ls_col_to_comp_trg}
+    if set(trg_col_names) != set([c.upper() for c in ls_col_to_comp_src]):
+        raise Exception(f"columns to be validated in source and target are different. In source, {ls_col_to_comp_src} and in target {ls_col_to_comp_trg}")
+    ls_cols_trg = [trg_col_names[c.upper()] for c in ls_cols_src]
+
+    a = time.time()
+    src_hash = lib.read_row_hashes_from_db(db_src, config_src, sql_src, ls_ref_src, ls_cols_src)
+    trg_hash = lib.read_row_hashes_from_db(db_trg, config_trg, sql_trg, ls_ref_trg, ls_cols_trg)
+
+    keys = ce.align_reference_keys(src_hash, trg_hash, ls_ref_src, ls_ref_trg)
+    changed = src_hash['ROW_HASH'].values[keys['src_pos']] != trg_hash['ROW_HASH'].values[keys['trg_pos']]
+    fetch_src = keys['left_only'].copy()
+    fetch_src[keys['src_pos'][changed]] = True
+    fetch_trg = keys['right_only'].copy()
+    fetch_trg[keys['trg_pos'][changed]] = True
+    loggerInfo(f"Push down comparison: {int(changed.sum())} rows have different hashes, {int(keys['left_only'].sum())} rows are only in source "
+               f"and {int(keys['right_only'].sum())} rows are only in target. Hashes compared in {round(time.time() - a, 4)} sec")
+
+    src_keys = list(src_hash.loc[fetch_src, ls_ref_src].itertuples(index=False, name=None))
+    trg_keys = list(trg_hash.loc[fetch_trg, ls_ref_trg].itertuples(index=False, name=None))
+    src_df = lib.read_rows_for_keys_from_db(db_src, config_src, sql_src, ls_ref_src, src_keys, key_chunksize, key_full_read_threshold)
+    trg_df = lib.read_rows_for_keys_from_db(db_trg, config_trg, sql_trg, ls_ref_trg, trg_keys, key_chunksize, key_full_read_threshold)
+
+    compare([src_df, ls_ref_src, ls_col_to_comp_src], [trg_df, ls_ref_trg, ls_col_to_comp_trg], report_tab_name=report_tab_name,
+            numeric_threshold=numeric_threshold, engine=engine, column_rules=column_rules, compare_mode=compare_mode,
+            fingerprint_check=False)
+
+    # summary is of complete data sets, not only of fetched rows
+    if report_tab_name == None:
+        add_in_reporting_dict('size_of_src', str(len(src_hash)) + ' x ' + str(len(ls_cols_src)))
+        add_in_reporting_dict('size_of_trg', str(len(trg_hash)) + ' x ' + str(len(ls_cols_src)))
+        add_in_reporting_dict('unique_cnt', 'Not computed in push down comparison')
+        add_in_reporting_dict('null_cnt', 'Not computed in push down comparison')
+
+def _compare_with_baseline_snapshot(src_df, trg_df, key_codes, ls_ref_src, ls_ref_trg, ls_cols, report_tab_name):
+    """Saves key hash snapshot of the test and returns only the source and target rows to be compared as per previous
+    snapshot, along with their key codes. key_codes is output of compare_engine.get_key_codes() for src_df and trg_df."""
+    if ce.has_duplicate_codes(key_codes[0]) or ce.has_duplicate_codes(key_codes[1]):
+        loggerInfo("Baseline snapshot is not used as reference values are not unique")
+        return src_df, trg_df, key_codes
+
+    snapshot_name = get_from_reporting_dict('testName') + ('_' + report_tab_name if report_tab_name != None else '')
+    snapshot_path = os.path.join(iniVar.current_project_path, "Reports", "Snapshots", snapshot_name + ".parquet")
+
+    ls_cols = [c for c in ls_cols if c not in ls_ref_src]
+    snapshot, src_pos, trg_pos = ce.build_key_hash_snapshot(src_df, trg_df, ls_ref_src, ls_ref_trg, ls_cols, ls_cols)
+
+    old_snapshot = pd.read_parquet(snapshot_path) if os.path.exists(snapshot_path) else None
+    if old_snapshot is not None and list(old_snapshot.columns) != list(snapshot.columns):
+        loggerInfo(f"Baseline snapshot '{snapshot_path}' is of different reference columns, it is not used")
+        old_snapshot = None
+
+    if old_snapshot is not None:
+        to_compare, changes = ce.get_changed_snapshot_keys(snapshot, old_snapshot, ls_ref_src)
+        add_in_reporting_dict('snapshot_changes', changes)
+        loggerInfo(f"Since baseline snapshot, keys new: {changes['new']}, removed: {changes['removed']}, changed: {changes['changed']}. "
+                   f"Only {int(to_compare.sum())} out of {len(snapshot)} keys are compared")
+        src_rows = np.sort(src_pos[to_compare & (src_pos >= 0)])
+        trg_rows = np.sort(trg_pos[to_compare & (trg_pos >= 0)])
+        src_df, trg_df = src_df.iloc[src_rows], trg_df.iloc[trg_rows]
+        key_codes = (key_codes[0][src_rows], key_codes[1][trg_rows])
+    else:
+        loggerInfo(f"Baseline snapshot not found, all the keys are compared")
+
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    snapshot.to_parquet(snapshot_path, index=False)
+    loggerInfo(f"Baseline snapshot of {len(snapshot)} keys saved at '{snapshot_path}'")
+    return src_df, trg_df, key_codes
+
+def _compare_fingerprints(src_df, trg_df, key_codes, ls_ref_src, ls_ref_trg, ls_cols):
+    """Compares order independent fingerprints of source and target. key_codes is output of compare_engine.get_key_codes()
+    for src_df and trg_df, used for duplicate check and key buckets.
+
+    returns
+    --------
+    tuple : (True if data sets are identical, source rows to be compared, target rows to be compared, their key codes).
+    If not identical, only the rows of key buckets having different fingerprints are returned, other buckets have same
+    rows on both sides.
+    """
+    # duplicates are to be reported by comparison, so data having duplicate reference values is neither passed nor narrowed here
+    if ce.has_duplicate_codes(key_codes[0]) or ce.has_duplicate_codes(key_codes[1]):
+        return False, src_df, trg_df, key_codes
+
+    a = time.time()
+    src_fp = ce.get_data_fingerprint(src_df, ls_ref_src, ls_cols, key_codes=key_codes[0])
+    trg_fp = ce.get_data_fingerprint(trg_df, ls_ref_trg, ls_cols, key_codes=key_codes[1])
+
+    if src_fp['total'] == trg_fp['total'] and len(src_df) == len(trg_df):
+        loggerInfo(f"Fingerprints of source and target are same, data is identical. Checked in {round(time.time() - a, 4)} sec")
+        return True, src_df, trg_df, key_codes
+
+    mismatch_buckets = ce.get_mismatching_buckets(src_fp, trg_fp)
+    src_rows, trg_rows = mismatch_buckets[src_fp['buckets']], mismatch_buckets[trg_fp['buckets']]
+    src_df, trg_df = src_df[src_rows], trg_df[trg_rows]
+    loggerInfo(f"Fingerprints of {int(mismatch_buckets.sum())} out of {len(mismatch_buckets)} key buckets are different, only "
+               f"{len(src_df)} source and {len(trg_df)} target rows of these buckets are compared")
+    return False, src_df, trg_df, (key_codes[0][src_rows], key_codes[1][trg_rows])
+
+def _compare_out_of_core(src_data, trg_data, ls_ref_src, ls_col_to_comp_src, ls_ref_trg, ls_col_to_comp_trg,
+                         report_tab_name, numeric_threshold, reportdiffSize, n_buckets, spill_dir, column_rules):
+    """Compares data sets larger than RAM by hash partitioning them into on-disk buckets and comparing bucket pairs one at a time"""
+    import tempfile
+
+    #### all column names in 2 lists should match else error to be raised.==================
+    if set(ls_col_to_comp_src) == set(ls_col_to_comp_trg):
+        loggerInfo(f"columns to be validated are {ls_col_to_comp_trg} and are same in source and target")
+    else:
+        raise Exception(f"columns to be validated in source and target are different. In source, {ls_col_to_comp_src} and in target {ls_col_to_comp_trg}")
 
-    # Comparison threshold info
     add_in_reporting_dict('numeric_threshold', numeric_threshold)
     if numeric_threshold > 0:
         loggerInfo(f"Numerical values comparison is done with a difference threshold of <= {numeric_threshold} as acceptable")
+    column_rules = _set_column_rules(column_rules, ls_col_to_comp_trg)
+
+    ls_cols = [c for c in ls_col_to_comp_trg if c not in ls_ref_trg]
+    src_cols = ls_ref_src + [c for c in ls_col_to_comp_src if c not in ls_ref_src]
+    trg_cols = ls_ref_trg + ls_cols
+    data_profile = {side: ce.get_column_profile(pd.DataFrame(columns=ls_cols), ls_cols, approx_distinct=True) for side in ['src', 'trg']}
+
+    def _prepare_chunk(cols, side):
+        # same preparation as in memory comparison, done chunk by chunk. Profiles of chunks are merged on the way
+        def prepare(df):
+            df.columns = [x.upper() for x in df.columns]
+            df = _get_str_df(df[cols])
+            data_profile[side] = ce.merge_column_profiles(data_profile[side], ce.get_column_profile(df, ls_cols, approx_distinct=True))
+            return df
+        return prepare
+
+    work_dir = tempfile.mkdtemp(prefix='pyetl_compare_', dir=spill_dir)
+    try:
+        a = time.time()
+        n_src = ce.spill_to_buckets(_get_chunks(src_data), ls_ref_src, n_buckets, work_dir, 'src', _prepare_chunk(src_cols, 'src'))
+        n_trg = ce.spill_to_buckets(_get_chunks(trg_data), ls_ref_trg, n_buckets, work_dir, 'trg', _prepare_chunk(trg_cols, 'trg'))
+        loggerInfo(f"Out of core comparison: {n_src} source and {n_trg} target rows partitioned in {n_buckets} buckets in {round(time.time() - a, 4)} sec")
+
+        mismatch_cols_n_cnt = dict()
+        mismatch_rows, extra_src_cnt, extra_trg_cnt = 0, 0, 0
+        ls_cd, ls_bm, ls_x1, ls_x2 = [], [], [], []
+        for b in range(n_buckets):
+            src_df = ce.read_bucket(work_dir, 'src', b, src_cols)
+            trg_df = ce.read_bucket(work_dir, 'trg', b, trg_cols)
+
+            # duplicates of a reference value are always in same bucket
+            keys = ce.align_reference_keys(src_df, trg_df, ls_ref_src, ls_ref_trg)
+            _reportUniquenessOfReferenceCols(src_df, trg_df, keys, ls_ref_src, ls_ref_trg)
+
+            df_cd, df_x1, df_x2 = ce.compare_by_row_hash(src_df, trg_df, ls_ref_src, ls_cols, keys=keys)
+            df_cd, bitmap = _remove_same_pairs(df_cd)
+            src_df, trg_df = [None] * 2
+
+            for c, cnt in _getDiffColumnsCounts(df_cd, bitmap):
+                mismatch_cols_n_cnt[c] = mismatch_cols_n_cnt.get(c, 0) + cnt
+            mismatch_rows += len(df_cd)
+            extra_src_cnt += len(df_x1)
+            extra_trg_cnt += len(df_x2)
+
+            # keep only a sample of differences for report
+            if sum(len(x) for x in ls_cd) < reportdiffSize: ls_cd.append(df_cd); ls_bm.append(bitmap)
+            if sum(len(x) for x in ls_x1) < reportdiffSize: ls_x1.append(df_x1)
+            if sum(len(x) for x in ls_x2) < reportdiffSize: ls_x2.append(df_x2)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    comm_diffs = pd.concat(ls_cd, ignore_index=True)[:reportdiffSize] if len(ls_cd) > 0 else pd.DataFrame(columns=['index'] + trg_cols)
+    mismatch_bitmap = np.concatenate(ls_bm)[:len(comm_diffs) // 2] if len(ls_bm) > 0 else None
+    comm_diffs, mismatch_bitmap = _get_diffs_with_diffs_on_top(comm_diffs, bitmap=mismatch_bitmap)  # bring diff records in all columns on top
+    extra_src = pd.concat(ls_x1, ignore_index=True)[:reportdiffSize] if len(ls_x1) > 0 else pd.DataFrame(columns=src_cols)
+    extra_trg = pd.concat(ls_x2, ignore_index=True)[:reportdiffSize] if len(ls_x2) > 0 else pd.DataFrame(columns=trg_cols)
+
+    if report_tab_name == None:
+        add_in_reporting_dict('col_names', ',\n'.join(ls_cols))
+        add_in_reporting_dict('size_of_src', str(n_src) + ' x ' + str(len(ls_cols)))
+        add_in_reporting_dict('size_of_trg', str(n_trg) + ' x ' + str(len(ls_cols)))
+        add_in_reporting_dict('data_profile', data_profile)
+        add_in_reporting_dict('unique_cnt', ce.format_profile_counts(data_profile['src'], data_profile['trg'], 'unique'))
+        add_in_reporting_dict('null_cnt', ce.format_profile_counts(data_profile['src'], data_profile['trg'], 'nulls'))
+
+    diff_counts = {'mismatch_cnt': mismatch_rows / 2,
+                   'mismatch_cols_n_cnt': _format_diff_columns_counts(list(mismatch_cols_n_cnt.items())),
+                   'extra_src_cnt': extra_src_cnt, 'extra_trg_cnt': extra_trg_cnt}
+    _store_compare_results_in_reporting_dict(comm_diffs, extra_src, extra_trg, report_tab_name, reportdiffSize, diff_counts, mismatch_bitmap)
+
+def _get_chunks(data, chunksize=500000):
+    """Returns chunks of data. Data can be a dataframe or an iterable of dataframe chunks"""
+    if isinstance(data, pd.DataFrame):
+        return (data.iloc[i:i + chunksize] for i in range(0, max(len(data), 1), chunksize))
+    return data
+
+def _set_column_rules(column_rules, ls_cols):
+    """Validates per column comparison rules, logs and stores them in reporting dictionary for later use in report"""
+    column_rules = ce.validate_column_rules(column_rules, ls_cols)
+    add_in_reporting_dict('column_rules', column_rules)
+    if len(column_rules) > 0:
+        loggerInfo(f"Columns are compared with comparison rules : {column_rules}")
+    return column_rules
+
+def _store_compare_results_in_reporting_dict(comm_diffs, extra_src, extra_trg, report_tab_name, reportdiffSize, diff_counts=None,
+                                             mismatch_bitmap=None):
+    """Logs the comparison results and stores the differences in reporting dictionary to be used in report.
+
+    diff_counts is given when comm_diffs, extra_src and extra_trg are only a sample of differences (e.g. out of core
+    comparison). It is a dict having 'mismatch_cnt', 'mismatch_cols_n_cnt', 'extra_src_cnt' and 'extra_trg_cnt' keys.
+    mismatch_bitmap is mismatching cells of comm_diffs (see _get_mismatch_bitmap()), computed if not given. It is stored
+    along with comm_diffs so that report need not find the mismatching cells again.
+    """
 
-    # common diffs
-    comm_diffs = _getCommonDiffs(src_df, trg_df, ls_ref_src, numeric_threshold )  #Assuming col names in src and trg are same
-    comm_diffs = _get_diffs_with_diffs_on_top(comm_diffs)  # bring diff records in all columns on top
-    # extra in src
-    extra_src  = src_df[~src_df.index.isin(trg_df.index)].reset_index()
-    # extra in trg
-    extra_trg = trg_df[~trg_df.index.isin(src_df.index)].reset_index()
+    mismatch_bitmap = _get_mismatch_bitmap(comm_diffs) if mismatch_bitmap is None else mismatch_bitmap
+    if diff_counts == None:
+        diff_counts = {'mismatch_cnt': len(comm_diffs) / 2, 'mismatch_cols_n_cnt': _getTotalDiffColumns(comm_diffs, mismatch_bitmap),
+                       'extra_src_cnt': len(extra_src), 'extra_trg_cnt': len(extra_trg)}
+    report_bitmap = mismatch_bitmap[:len(comm_diffs[:reportdiffSize]) // 2]
+
+    # html report has all the differences, excel report only first reportdiffSize of them
+    if _get_report_format() != 'excel':
+        full_diffs = get_from_reporting_dict('full_diffs') if check_key_in_reporting_dict('full_diffs') else {}
+        full_diffs[report_tab_name] = [comm_diffs, extra_src, extra_trg, mismatch_bitmap]
+        add_in_reporting_dict('full_diffs', full_diffs)
+
+    # In typed comparison, only the differences to be written in report are converted to string
+    compare_mode = get_from_reporting_dict('compare_mode') if check_key_in_reporting_dict('compare_mode') else 'string'
+    if compare_mode == 'typed':
+        comm_diffs, extra_src, extra_trg = [x[:reportdiffSize].apply(ce._to_string) for x in [comm_diffs, extra_src, extra_trg]]
 
     # dfs to be used in reporting
     if report_tab_name == None:
-        _update_dict_with_diffs_records_for_summary_from_compare_function(comm_diffs, extra_src, extra_trg)
+        for key in ['mismatch_cnt', 'extra_src_cnt', 'extra_trg_cnt', 'mismatch_cols_n_cnt']:
+            add_in_reporting_dict(key, diff_counts[key])
 
         add_in_reporting_dict('comm_diffs', comm_diffs[:reportdiffSize])
+        add_in_reporting_dict('comm_diffs_bitmap', report_bitmap)
         add_in_reporting_dict('extra_src', extra_src[:reportdiffSize])
         add_in_reporting_dict('extra_trg', extra_trg[:reportdiffSize])
 
@@ -153,22 +576,24 @@ def compare(ls_src_info, ls_trg_info, report_tab_name =None, numeric_threshold =
 
     #'detail_tabs' will be created
     if report_tab_name != None:
-        if int(len(comm_diffs)/2)==0:
-            loggerPass( f"Total mismatch : {int(len(comm_diffs)/2)}, columns having differences along with counts : {_getTotalDiffColumns(comm_diffs)}")
+        if int(diff_counts['mismatch_cnt'])==0:
+            loggerPass( f"Total mismatch : {int(diff_counts['mismatch_cnt'])}, columns having differences along with counts : {diff_counts['mismatch_cols_n_cnt']}")
         else:
             loggerFail(
-                f"Total mismatch : {int(len(comm_diffs) / 2)}, columns having differences along with counts : {_getTotalDiffColumns(comm_diffs)}")
+                f"Total mismatch : {int(diff_counts['mismatch_cnt'])}, columns having differences along with counts : {diff_counts['mismatch_cols_n_cnt']}")
 
-        if len(extra_src)==0 and len(extra_trg)==0:
-            loggerPass(f"Extra rows in src : {len(extra_src)}, and extra rows in trg : {len(extra_trg)}")
+        if diff_counts['extra_src_cnt']==0 and diff_counts['extra_trg_cnt']==0:
+            loggerPass(f"Extra rows in src : {diff_counts['extra_src_cnt']}, and extra rows in trg : {diff_counts['extra_trg_cnt']}")
         else:
-            loggerFail(f"Extra rows in src : {len(extra_src)}, and extra rows in trg : {len(extra_trg)}")
+            loggerFail(f"Extra rows in src : {diff_counts['extra_src_cnt']}, and extra rows in trg : {diff_counts['extra_trg_cnt']}")
 
-        add_detail_tabs_info_in_reporting_dict(report_tab_name, [comm_diffs[:reportdiffSize], extra_src[:reportdiffSize], extra_trg[:reportdiffSize]])
+        add_detail_tabs_info_in_reporting_dict(report_tab_name, [comm_diffs[:reportdiffSize], extra_src[:reportdiffSize], extra_trg[:reportdiffSize], report_bitmap])
         if len(comm_diffs) ==0 and len(extra_src) ==0 and len(extra_trg) ==0:
-            loggerPass(f"Comparison done successfully and ONLY the differences found are written in report tab {str(threading.get_ident()) + '-' + report_tab_name} ")
+            tab = str(threading.get_ident()) + '-' + report_tab_name
+            loggerPass(f"Comparison done successfully and ONLY the differences found are written in report tab {tab} ", tab)
         else:
-            loggerFail(f"Comparison mismatches found, only the differences are written in report tab {str(threading.get_ident()) + '-' + report_tab_name}")
+            tab = str(threading.get_ident()) + '-' + report_tab_name
+            loggerFail(f"Comparison mismatches found, only the differences are written in report tab {tab}", tab)
 
 def prepareReport(rptCnt, testName, Error, totaltestsCount, reportName="report", replace_spaces_with_star=True):
     """Prepares report of single or multi-script execution. This is part of test script template. It takes various information to
@@ -207,10 +632,73 @@ def prepareReport(rptCnt, testName, Error, totaltestsCount, reportName="report",
     else:
         report_file_path = os.path.join(iniVar.current_project_path, "Reports", "report.xlsx")
             
+    report_backend = get_from_reporting_dict('ReportBackend') if check_key_in_reporting_dict('ReportBackend') else 'openpyxl'
+    if report_backend not in report_backends:
+        raise Exception(f"Invalid ReportBackend '{report_backend}' in project_config.ini. Valid values are {report_backends}")
+    report_format = _get_report_format()
+    html_report_path = os.path.splitext(report_file_path)[0] + "_html"
+
     # adding report file path to reporting dictionary
+    if report_format == 'html':
+        report_file_path = os.path.join(html_report_path, "index.html")
     add_in_reporting_dict('report_path', report_file_path)
+
+    if iniVar.report_artifacts_path != None:
+        # report of batch is assembled by batch runner from result artifacts of all tests, see assemble_report_from_artifacts()
+        _write_test_result_artifact(rptCnt, report_file_path, testName, Error, df_cd, df_x1, df_x2, replace_spaces_with_star,
+                                    html_report_path)
+    else:
+        if report_format != 'html' and report_backend == 'streaming':
+            _write_test_in_streaming_report(rptCnt, totaltestsCount, report_template, report_file_path, testName, Error,
+                                            df_cd, df_x1, df_x2, replace_spaces_with_star)
+        elif report_format != 'html':
+            _write_test_in_report(rptCnt, report_template, report_file_path, testName, Error, df_cd, df_x1, df_x2,
+                                  replace_spaces_with_star)
+        if report_format != 'excel':
+            _write_test_in_html_report(rptCnt, html_report_path, testName, Error, df_cd, df_x1, df_x2,
+                                       summary_done=report_format == 'both')
+
+    # steps below update shared data (execution db, post test hooks, global dict), so tests of a multithreaded batch
+    # run them one at a time, only the report of test is written in parallel
+    with iniVar.lock:
+        # Updade metrics
+        if iniVar.dry_run == False:
+            update_exec_db()
+            #pass
+        else:
+            print("Dry-run = True, no auto-execution-db updated")
+
+        # run_post_test_hook will run for only those functions that are required to be executed in
+        # post hook and where post_test_hook_function_list is not 'none'.
+        post_test_hook_function_list = get_from_reporting_dict('post_test_hook_function_list') if check_key_in_reporting_dict('post_test_hook_function_list') else 'None'
+        if post_test_hook_function_list != 'None':
+            post_test_hook_function_parameter_list = get_from_reporting_dict('post_test_hook_function_parameter_list') if check_key_in_reporting_dict('post_test_hook_function_parameter_list') else None
+            run_post_test_hook(post_test_hook_function_list, post_test_hook_function_parameter_list)
+
+        # Every script execution adds meta data in global dict
+        iniVar._set_test_info_in_global_dict(rptCnt)
+
+    # open report
+    if totaltestsCount ==rptCnt and iniVar.report_artifacts_path == None:
+        loggerInfo("Report generated successfully, now opening it")
+        os.startfile(report_file_path)
+        loggerInfo("Report opened successfully")
+
+        # if iniVar.dry_run == False:  # will be changed to false
+        #     import FW.QTest_Integration.FW_pulse_integration as pulseInt
+        #      pulseInt.send_result_data_to_qtest(report_file_path)
+
+            
+
+def _write_test_in_report(rptCnt, report_template, report_file_path, testName, Error, df_cd, df_x1, df_x2, replace_spaces_with_star):
+    """Writes summary record and detailed tabs of current test in report. Report is opened and saved for every test."""
+
+    reportdiffSize = get_from_reporting_dict('data_size_in_report') if check_key_in_reporting_dict(
+        'data_size_in_report') else default_reportdiffSize
+
     # 1 . copy report to report location with current name only once
-    if rptCnt == 1: shutil.copy(report_template, report_file_path)
+    if rptCnt == 1:
+        shutil.copy(report_template, report_file_path)
     # 2. open report
     wb = load_workbook(report_file_path)
     writer = pd.ExcelWriter(report_file_path, engine='openpyxl')
@@ -248,10 +736,11 @@ def prepareReport(rptCnt, testName, Error, totaltestsCount, reportName="report",
         writer.save()
         #fetch coordinates of diff cells - used later
         
-        df_cd = df_cd.set_index('index')
-        ls_diffCells = _getDiffCellsCoordinates(df_cd)
-        #format the diff tab
-        _formatExcelCellColor(t_sh, ls_diffCells)
+        #format the diff tab, mismatching cells are already known if bitmap is stored along with diffs
+        if check_key_in_reporting_dict('comm_diffs_bitmap'):
+            _formatExcelCellColor(t_sh, bitmap=get_from_reporting_dict('comm_diffs_bitmap'))
+        else:
+            _formatExcelCellColor(t_sh, _getDiffCellsCoordinates(df_cd.set_index('index')))
         writer.save()
 
     #Add additonal detail tabs info and add that in report
@@ -263,6 +752,15 @@ def prepareReport(rptCnt, testName, Error, totaltestsCount, reportName="report",
     writer.save()
 
     # store variable in dict for updating metrics
+    _set_running_time_in_reporting_dict()
+
+    # write logger steps in detail tab for running time update
+    _write_Running_Time_Info_Log_in_Detailed_Sheet(t_sh)
+    writer.save()
+    writer.close()
+
+def _set_running_time_in_reporting_dict():
+    """Sets end time and running time of current test in reporting dictionary"""
     add_in_reporting_dict('test_progress_status', 'End')
     add_in_reporting_dict('end_time', str(datetime.now(pytz.timezone('America/Toronto')))[:23])
 
@@ -272,57 +770,591 @@ def prepareReport(rptCnt, testName, Error, totaltestsCount, reportName="report",
     RunTime = (datetime.strptime(DTEndTime, '%Y-%m-%d %H:%M:%S.%f') - datetime.strptime(DTStarTime,'%Y-%m-%d %H:%M:%S.%f')).seconds
     add_in_reporting_dict('running_time', RunTime)
 
-    # write logger steps in detail tab for running time update
-    _write_Running_Time_Info_Log_in_Detailed_Sheet(t_sh)
-    writer.save()
-    writer.close()
+def _write_test_in_streaming_report(rptCnt, totaltestsCount, report_template, report_file_path, testName, Error, df_cd,
+                                    df_x1, df_x2, replace_spaces_with_star):
+    """Writes summary record and detailed tabs of current test in write only workbook of the batch. Workbook is created
+    from report template for the first test and saved only once, after the last test of batch. Rows are streamed to the
+    workbook as each test is written, so layout of summary and detailed tabs is same as of openpyxl backend.
 
-    # Updade metrics
-    if iniVar.dry_run == False:
-        update_exec_db()
-        #pass
-    else:
-        print("Dry-run = True, no auto-execution-db updated")
+    Workbook of the batch is kept in iniVar.th_local of the thread running the batch, beside its reporting dictionary
+    which is replaced for every test by setupGlobalVariable(), so batches run in different threads have their own
+    workbooks."""
+    reportdiffSize = get_from_reporting_dict('data_size_in_report') if check_key_in_reporting_dict(
+        'data_size_in_report') else default_reportdiffSize
 
-    # run_post_test_hook will run for only those functions that are required to be executed in
-    # post hook and where post_test_hook_function_list is not 'none'.
-    post_test_hook_function_list = get_from_reporting_dict('post_test_hook_function_list') if check_key_in_reporting_dict('post_test_hook_function_list') else 'None'
-    if post_test_hook_function_list != 'None':
-        post_test_hook_function_parameter_list = get_from_reporting_dict('post_test_hook_function_parameter_list') if check_key_in_reporting_dict('post_test_hook_function_parameter_list') else None
-        run_post_test_hook(post_test_hook_function_list, post_test_hook_function_parameter_list)
+    if rptCnt == 1:
+        iniVar.th_local.streaming_report = _create_streaming_workbook(report_template)
+    streaming_report = iniVar.th_local.streaming_report
+    wb, s_sh = streaming_report['wb'], streaming_report['summary']
+    vRow = streaming_report['summary_row']
+    streaming_report['summary_row'] = vRow + 1
 
-    # Every script execution adds meta data in global dict
-    iniVar._set_test_info_in_global_dict(rptCnt)
+    # This will addd new sheet, its rows are written once all of them are known
+    nameofNewSheet = "Script_logs_" + str(vRow - 6)
+    t_sh = wb.create_sheet(nameofNewSheet)
 
-    # open report
-    if totaltestsCount ==rptCnt:
-        loggerInfo("Report generated successfully, now opening it")
-        os.startfile(report_file_path)
-        loggerInfo("Report opened successfully")
+    # Write summary record
+    _update_dict_for_summary_record_from_report_function(df_cd, df_x1, df_x2, testName, nameofNewSheet, Error)
+    record, wrapText = _get_summary_record(vRow)
+    status = "Fail" if wrapText == False or _get_overall_status_of_summary_record(record) == "Fail" else "Pass"
+    _log_overall_status(status)
+    s_sh.append(_get_summary_record_cells(s_sh, record, status, wrapText, nameofNewSheet, streaming_report['summary_max_col']))
 
-        # if iniVar.dry_run == False:  # will be changed to false
-        #     import FW.QTest_Integration.FW_pulse_integration as pulseInt
-        #      pulseInt.send_result_data_to_qtest(report_file_path)
+    # =====================write detailed report tab======================
+    grid = {}
+    if Error == None and repr(type(df_cd)) != "<class 'NoneType'>" and repr(type(df_x1)) != "<class 'NoneType'>" and repr(type(df_x2)) != "<class 'NoneType'>":
+        # write common diffs Replace all blanks with * and export
+        if replace_spaces_with_star == True:
+            df_cd.replace(r'\s','*',regex=True,inplace=True)
+        bitmap = get_from_reporting_dict('comm_diffs_bitmap') if check_key_in_reporting_dict('comm_diffs_bitmap') else None
+        _add_diffs_in_grid(grid, t_sh, df_cd, df_x1, df_x2, reportdiffSize, bitmap, _get_diff_cells_format_mode())
 
-            
-            
-def _get_diffs_with_diffs_on_top(df, num_of_diff_record_on_top =5):
-    '''Rearrange the diffs dataframe such that we have atmost some failed records from each column in top records in report'''
+    #Add additonal detail tabs info and add that in report
+    if logger.check_detail_tabs_info_present_in_reporting_dict() == True:
+        _add_detail_tabs_info_in_streaming_report(wb, reportdiffSize)
+
+    # write logger steps and running time in detail tab
+    _set_running_time_in_reporting_dict()
+    _add_logger_steps_in_grid(grid, t_sh, _get_formatted_logger_steps(), get_from_reporting_dict('overall_status'),
+                              get_from_reporting_dict('running_time'))
+    _write_grid_in_sheet(t_sh, grid)
+
+    # save only once, after the last test of batch
+    if rptCnt == totaltestsCount:
+        wb.save(report_file_path)
+        del iniVar.th_local.streaming_report
+
+def _create_streaming_workbook(report_template):
+    """Creates write only workbook having the sheets of report template, with their values, styles, hyperlinks, column
+    widths and merged cells. Returns dict having the workbook, its Summary sheet, row of next summary record and number of columns in
+    summary record"""
+    from copy import copy
+
+    template = load_workbook(report_template)
+    wb = openpyxl.Workbook(write_only=True)
+    for tsh in template.worksheets:
+        sh = wb.create_sheet(tsh.title)
+        for key, dim in tsh.column_dimensions.items():
+            sh.column_dimensions[key].width = dim.width
+        for key, dim in tsh.row_dimensions.items():
+            sh.row_dimensions[key].height = dim.height
+        for rng in tsh.merged_cells.ranges:
+            sh.merged_cells.add(rng)
+        for trow in tsh.iter_rows():
+            row = []
+            for tcell in trow:
+                cell = WriteOnlyCell(sh, tcell.value)
+                if tcell.has_style:
+                    cell.font, cell.fill, cell.border = copy(tcell.font), copy(tcell.fill), copy(tcell.border)
+                    cell.alignment, cell.number_format = copy(tcell.alignment), tcell.number_format
+                if tcell.hyperlink != None:
+                    cell.hyperlink = copy(tcell.hyperlink)
+                row.append(cell)
+            sh.append(row)
+
+    s_sh = template['Summary']
+    return {'wb': wb, 'summary': wb['Summary'], 'summary_row': s_sh.max_row + 1,
+            'summary_max_col': max(s_sh.max_column, 12)}
+
+def _add_detail_tabs_info_in_streaming_report(wb, reportdiffSize):
+    """Add custom additional tab having details in write only workbook of the batch"""
+
+    lst_tab_names, lst_renamed_tab_names = _set_detail_tabs_names_in_reporting_dict()
+    for nameofNewSheet, nameOfRenamedSheet in zip(lst_tab_names, lst_renamed_tab_names):
+        tab_name_info_lst = logger.get_detail_tabs_info_values_list_from_reporting_dict(nameofNewSheet)
+
+        #Add custom renamed details sheet tab
+        t_sh = wb.create_sheet(nameOfRenamedSheet)  # Add renamed name
+        df_cd = tab_name_info_lst[0]
+        df_cd.replace(r'\s', '*', regex=True, inplace=True)
+        bitmap = tab_name_info_lst[3] if len(tab_name_info_lst) > 3 else None
+        grid = {}
+        _add_diffs_in_grid(grid, t_sh, df_cd, tab_name_info_lst[1], tab_name_info_lst[2], reportdiffSize, bitmap,
+                           _get_diff_cells_format_mode())
+        _write_grid_in_sheet(t_sh, grid)
+
+def _add_diffs_in_grid(grid, ws, df_cd, df_x1, df_x2, reportdiffSize, bitmap=None, format_mode='fill'):
+    """Adds common diffs, extra in source and extra in target in grid of detailed tab (dict of row number and dict of column
+    number and value or cell), at the places _write_in_detailed_report() writes them. Difference cells are coloured red as
+    per format_mode (see set_diff_cells_format_mode())."""
+
+    df_cd, df_x1, df_x2 = df_cd[:reportdiffSize], df_x1[:reportdiffSize], df_x2[:reportdiffSize]
+    grid.setdefault(1, {})[1] = 'Common Diffs'
+    _add_df_in_grid(grid, ws, df_cd, 1, 2)
+    rowtowrite = len(df_cd) + 4
+    grid.setdefault(rowtowrite, {})[1] = 'Extra in Source'
+    _add_df_in_grid(grid, ws, df_x1, rowtowrite, 3)
+    rowtowrite = len(df_cd) + len(df_x1) + 7
+    grid.setdefault(rowtowrite, {})[1] = 'Extra in Target'
+    _add_df_in_grid(grid, ws, df_x2, rowtowrite, 3)
+
+    # colour red the cells of difference, same as _formatExcelCellColor()
+    diff_cells = _get_diff_cells_from_bitmap(bitmap) if bitmap is not None else _getDiffCellsCoordinates(df_cd.set_index('index'))
+    if format_mode == 'conditional':
+        _add_conditional_format_for_diff_cells(ws, diff_cells)
+        return
+    DiffColor = "FFFF0000"
+    fill = PatternFill(start_color=DiffColor, end_color=DiffColor, fill_type="solid")
+    for x, y in diff_cells:
+        for row in [x + 1, x + 2]:
+            value = grid[row].get(y + 1)
+            cell = value if isinstance(value, openpyxl.cell.cell.Cell) else WriteOnlyCell(ws, value)
+            cell.fill = fill
+            grid[row][y + 1] = cell
+
+def _add_df_in_grid(grid, ws, df, row, col):
+    """Adds dataframe with its header in grid at given row and column, header is formatted as pandas to_excel() does"""
+
+    thin = Side(border_style="thin", color="000000")
+    header = grid.setdefault(row, {})
+    for j, name in enumerate(df.columns):
+        cell = WriteOnlyCell(ws, name)
+        cell.font = Font(bold=True)
+        cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal="center", vertical="top")
+        header[col + j] = cell
+
+    values = df.astype(object).where(df.notna(), None)
+    for i, vals in enumerate(values.itertuples(index=False, name=None)):
+        grid.setdefault(row + 1 + i, {}).update(zip(range(col, col + len(vals)), vals))
+
+def _add_logger_steps_in_grid(grid, ws, stepList, overall_status, running_time):
+    """Adds logger steps, overall status and running time in grid of detailed tab, at the places
+    _write_Steps_Info_Log_in_Detailed_Sheet() and _write_Running_Time_Info_Log_in_Detailed_Sheet() write them. stepList is
+    list of formatted logger steps (see _get_formatted_logger_steps())"""
+
+    # two columns after the last column of detailed tab
+    max_col = max([c for cells in grid.values() for c in cells], default=1)
+    col = (1 if max_col == 1 else max_col + 1) + 2
+    if len(stepList)>0:  grid.setdefault(1, {})[col] = "Logger Steps:"
+    for i, (step, hyperlink, font) in enumerate(stepList):
+        #writing logger info in sheet.
+        cell = WriteOnlyCell(ws, step)
+        _format_logger_step_cell(cell, hyperlink, font)
+        grid.setdefault(i + 3, {})[col] = cell
+
+    grid.setdefault(len(stepList) + 4, {})[col] = f"Overall test status = {overall_status.upper()}"
+    grid.setdefault(len(stepList) + 6, {})[col] = f"Script execution time = {running_time} sec"
+
+def _get_formatted_logger_steps():
+    """Returns logger steps of current test as list of logger step, hyperlink of the additional detailed tab referred in step
+    and key of font of step in logger_step_fonts. Hyperlink and font are None if step is not formatted. Steps are formatted
+    in single pass over logger records, with renamed names of additional detailed tabs looked up by their keys."""
+
+    lst_renamed_tab_names = get_from_reporting_dict('lst_renamed_tab_names') if check_key_in_reporting_dict('lst_renamed_tab_names') else None
+    ls_tab_name = get_from_reporting_dict('list_tab_name') if check_key_in_reporting_dict('list_tab_name') else None
+    renamed_tabs = dict(zip(ls_tab_name, lst_renamed_tab_names)) if ls_tab_name != None else {}
+
+    steps = []
+    for record in iniVar.th_local.dict.get('logger_records', []):
+        step = _get_logger_step_text(record)
+        hyperlink, font = None, record['type'] if record['type'] in ['PASS', 'FAIL'] else None
+        # Replace the tab name in the logger step with renamed tab name, and link the step to the tab
+        if record['tab'] in renamed_tabs:
+            step = step.replace(record['tab'], renamed_tabs[record['tab']])
+            hyperlink = "#'" + renamed_tabs[record['tab']] + "'!A1"
+            font = font + '_link' if font != None else None
+        steps.append([step, hyperlink, font])
+    return steps
+
+def _get_logger_step_text(record):
+    """Returns logger step of logger record as written in report, prefixed with its type"""
+    return record['msg'] if record['type'] == None else record['type'] + " - " + record['msg']
+
+def _write_grid_in_sheet(ws, grid):
+    """Appends rows of grid (dict of row number and dict of column number and value or cell) to write only sheet"""
+    for r in range(1, max(grid, default=0) + 1):
+        cells = grid.get(r, {})
+        row = [cells.get(c) for c in range(1, max(cells, default=0) + 1)]
+        try:
+            ws.append(row)
+        except openpyxl.utils.exceptions.IllegalCharacterError:
+            ws.append([x.encode('unicode_escape').decode('utf-8') if isinstance(x, str) else x for x in row])
+
+def _write_test_result_artifact(rptCnt, report_file_path, testName, Error, df_cd, df_x1, df_x2, replace_spaces_with_star,
+                                html_report_path=None):
+    """Writes result of current test in its artifact folder in iniVar.report_artifacts_path, to be assembled in report later
+    by assemble_report_from_artifacts(). Differences are written as parquet files and their mismatch bitmaps as npy files.
+    Summary record, formatted logger steps and names of detailed tabs are written in test_info.json. Nothing is shared
+    with other tests, so tests running in parallel need not wait for each other. When report format has html, all the
+    differences are written too, named html_<n>."""
+    import json
+
+    reportdiffSize = get_from_reporting_dict('data_size_in_report') if check_key_in_reporting_dict(
+        'data_size_in_report') else default_reportdiffSize
+
+    test_path = os.path.join(iniVar.report_artifacts_path, str(rptCnt))
+    os.makedirs(test_path, exist_ok=True)
+
+    # Summary record
+    nameofNewSheet = "Script_logs_" + str(rptCnt)
+    _update_dict_for_summary_record_from_report_function(df_cd, df_x1, df_x2, testName, nameofNewSheet, Error)
+    record, wrapText = _get_summary_record(rptCnt + 6)
+    status = "Fail" if wrapText == False or _get_overall_status_of_summary_record(record) == "Fail" else "Pass"
+    _log_overall_status(status)
+    test_info = {'report_path': report_file_path, 'detailSheetName': nameofNewSheet, 'record': record, 'wrapText': wrapText,
+                 'status': status, 'diffs': False, 'tabs': [], 'diff_cells_format_mode': _get_diff_cells_format_mode()}
+
+    # differences of detailed tab
+    if Error == None and repr(type(df_cd)) != "<class 'NoneType'>" and repr(type(df_x1)) != "<class 'NoneType'>" and repr(type(df_x2)) != "<class 'NoneType'>":
+        if replace_spaces_with_star == True:
+            df_cd.replace(r'\s','*',regex=True,inplace=True)
+        bitmap = get_from_reporting_dict('comm_diffs_bitmap') if check_key_in_reporting_dict('comm_diffs_bitmap') else None
+        _save_diffs_artifact(test_path, 'Script_logs', df_cd, df_x1, df_x2, reportdiffSize, bitmap)
+        test_info['diffs'] = True
+
+    # differences of additional detail tabs
+    if logger.check_detail_tabs_info_present_in_reporting_dict() == True:
+        lst_tab_names, lst_renamed_tab_names = _set_detail_tabs_names_in_reporting_dict()
+        for i, (nameofNewSheet, nameOfRenamedSheet) in enumerate(zip(lst_tab_names, lst_renamed_tab_names)):
+            tab_name_info_lst = logger.get_detail_tabs_info_values_list_from_reporting_dict(nameofNewSheet)
+            df_tab_cd = tab_name_info_lst[0]
+            df_tab_cd.replace(r'\s', '*', regex=True, inplace=True)
+            bitmap = tab_name_info_lst[3] if len(tab_name_info_lst) > 3 else None
+            _save_diffs_artifact(test_path, f'tab_{i}', df_tab_cd, tab_name_info_lst[1], tab_name_info_lst[2], reportdiffSize, bitmap)
+            test_info['tabs'].append(nameOfRenamedSheet)
+
+    # logger steps and running time
+    _set_running_time_in_reporting_dict()
+    test_info['steps'] = _get_formatted_logger_steps()
+    test_info['overall_status'] = get_from_reporting_dict('overall_status')
+    test_info['running_time'] = get_from_reporting_dict('running_time')
+
+    # all the differences for html report
+    test_info['report_format'] = _get_report_format()
+    if test_info['report_format'] != 'excel':
+        test_info['html_report_path'] = html_report_path
+        test_info['html'] = _get_html_test_info(rptCnt, record)
+        test_info['html_tabs'] = []
+        for i, (title, df_cd, df_x1, df_x2, bitmap) in enumerate(_get_html_report_tabs()):
+            _save_diffs_artifact(test_path, f'html_{i}', df_cd, df_x1, df_x2, None, bitmap)
+            test_info['html_tabs'].append(title)
+
+    with open(os.path.join(test_path, 'test_info.json'), 'w') as f:
+        json.dump(test_info, f, default=lambda x: x.item() if hasattr(x, 'item') else str(x))
+
+def _save_diffs_artifact(test_path, name, df_cd, df_x1, df_x2, reportdiffSize, bitmap=None):
+    """Saves differences to be written in a detailed tab as parquet files, along with mismatch bitmap of common diffs"""
+
+    df_cd = df_cd[:reportdiffSize]
+    bitmap = _get_mismatch_bitmap(df_cd) if bitmap is None else bitmap[:len(df_cd) // 2]
+    for key, df in zip(['comm_diffs', 'extra_src', 'extra_trg'], [df_cd, df_x1[:reportdiffSize], df_x2[:reportdiffSize]]):
+        df = df.reset_index(drop=True)
+        df.columns = [str(x) for x in df.columns]
+        try:
+            df.to_parquet(os.path.join(test_path, f'{name}_{key}.parquet'), index=False)
+        except (TypeError, ValueError):
+            # columns having values of mixed types are saved as strings
+            objcols = df.select_dtypes(['object']).columns
+            df[objcols] = df[objcols].where(df[objcols].isna(), df[objcols].astype(str))
+            df.to_parquet(os.path.join(test_path, f'{name}_{key}.parquet'), index=False)
+    np.save(os.path.join(test_path, f'{name}_bitmap.npy'), bitmap)
+
+def _add_diffs_artifact_in_grid(grid, ws, test_path, name, format_mode='fill'):
+    """Adds differences saved by _save_diffs_artifact() in grid of detailed tab"""
+    df_cd, df_x1, df_x2, bitmap = _read_diffs_artifact(test_path, name)
+    _add_diffs_in_grid(grid, ws, df_cd, df_x1, df_x2, None, bitmap, format_mode)
+
+def _read_diffs_artifact(test_path, name):
+    """Returns common diffs, extra in source, extra in target and mismatch bitmap saved by _save_diffs_artifact()"""
+    dfs = [pd.read_parquet(os.path.join(test_path, f'{name}_{key}.parquet')) for key in ['comm_diffs', 'extra_src', 'extra_trg']]
+    return dfs + [np.load(os.path.join(test_path, f'{name}_bitmap.npy'))]
+
+def assemble_report_from_artifacts(artifacts_path):
+    """Assembles report of batch from result artifacts of tests, written by prepareReport() when iniVar.report_artifacts_path
+    is set (e.g. by multithreaded batch runner). Report is written in one pass in write only workbook and saved once.
+
+    Parameters
+    ----------
+    artifacts_path : string
+        Folder having artifact folder of each test of batch, named by report count of test
+
+    returns
+    --------
+    None
+    """
+    import json
+
+    ls_tests = sorted([x for x in os.listdir(artifacts_path) if x.isnumeric()], key=int)
+    if len(ls_tests) == 0:
+        return
+
+    ls_test_info = []
+    for test in ls_tests:
+        with open(os.path.join(artifacts_path, test, 'test_info.json')) as f:
+            ls_test_info.append(json.load(f))
+    report_format = ls_test_info[-1].get('report_format', 'excel')
+
+    if report_format != 'html':
+        _assemble_excel_report_from_artifacts(artifacts_path, ls_tests, ls_test_info)
+
+    if report_format != 'excel':
+        html_report_path = ls_test_info[-1]['html_report_path']
+        shutil.rmtree(html_report_path, ignore_errors=True)
+        for test, test_info in zip(ls_tests, ls_test_info):
+            test_path = os.path.join(artifacts_path, test)
+            tabs = [[title] + _read_diffs_artifact(test_path, f'html_{i}') for i, title in enumerate(test_info['html_tabs'])]
+            _write_html_test_page(html_report_path, test_info['html'], tabs)
+        _write_html_summary(html_report_path)
+
+    # open report, printed only as batch runner calls it on main thread which has no reporting dictionary of a test
+    report_file_path = ls_test_info[-1]['report_path']
+    print("Report generated successfully, now opening it")
+    os.startfile(report_file_path)
+    print("Report opened successfully")
+
+def _assemble_excel_report_from_artifacts(artifacts_path, ls_tests, ls_test_info):
+    """Writes excel report of batch from result artifacts of tests in one write only workbook, saved once"""
 
-    from collections import defaultdict
-    coord = _getDiffCellsCoordinates(df)                # cell coordinates where mismatch occured are fetched.
-    d = defaultdict(list)
-    for v, k in coord:
-        d[k].append(v) if k != 2 else None  #avoid column index
+    report_template = os.path.join(iniVar.current_project_path, "Resources", "report_template.xlsx")
+    report = _create_streaming_workbook(report_template)
+    wb, s_sh = report['wb'], report['summary']
+
+    for test, test_info in zip(ls_tests, ls_test_info):
+        test_path = os.path.join(artifacts_path, test)
+
+        # Write summary record and detailed tabs
+        s_sh.append(_get_summary_record_cells(s_sh, test_info['record'], test_info['status'], test_info['wrapText'],
+                                              test_info['detailSheetName'], report['summary_max_col']))
+        t_sh = wb.create_sheet(test_info['detailSheetName'])
+        grid = {}
+        if test_info['diffs'] == True:
+            _add_diffs_artifact_in_grid(grid, t_sh, test_path, 'Script_logs', test_info['diff_cells_format_mode'])
+
+        for i, nameOfRenamedSheet in enumerate(test_info['tabs']):
+            tab_sh = wb.create_sheet(nameOfRenamedSheet)
+            tab_grid = {}
+            _add_diffs_artifact_in_grid(tab_grid, tab_sh, test_path, f'tab_{i}', test_info['diff_cells_format_mode'])
+            _write_grid_in_sheet(tab_sh, tab_grid)
+
+        _add_logger_steps_in_grid(grid, t_sh, test_info['steps'], test_info['overall_status'], test_info['running_time'])
+        _write_grid_in_sheet(t_sh, grid)
+
+    wb.save(ls_test_info[-1]['report_path'])
+
+def _write_test_in_html_report(rptCnt, html_report_path, testName, Error, df_cd, df_x1, df_x2, summary_done=False):
+    """Writes result of current test in html report, as its page and parquet files of all its differences, and rewrites
+    summary page of report. summary_done is True when summary record and status are already set by excel report."""
+
+    # new html report for first test of batch
+    if rptCnt == 1:
+        shutil.rmtree(html_report_path, ignore_errors=True)
+
+    if summary_done == False:
+        _update_dict_for_summary_record_from_report_function(df_cd, df_x1, df_x2, testName, f"test_{rptCnt}", Error)
+    record, wrapText = _get_summary_record(rptCnt + 6)
+    if summary_done == False:
+        _log_overall_status("Fail" if wrapText == False or _get_overall_status_of_summary_record(record) == "Fail" else "Pass")
+        _set_running_time_in_reporting_dict()
+
+    _write_html_test_page(html_report_path, _get_html_test_info(rptCnt, record), _get_html_report_tabs())
+    _write_html_summary(html_report_path)
+
+def _get_html_test_info(rptCnt, record):
+    """Returns information of current test written in its html report page and summary page"""
+    keys = ['ReleaseName', 'Environment', 'Cycle', 'TeamName', 'LOB', 'TestType']
+    # tabs referred in logger steps are titled without thread id in html report
+    steps = [x[0].replace(str(threading.get_ident()) + '-', '') for x in _get_formatted_logger_steps()]
+    return {'rptCnt': rptCnt, 'record': record, 'status': get_from_reporting_dict('overall_status'),
+            'running_time': get_from_reporting_dict('running_time'), 'steps': steps,
+            'project': {key: get_from_reporting_dict(key) for key in keys if check_key_in_reporting_dict(key)}}
+
+def _get_html_report_tabs():
+    """Returns all the differences of current test for html report, as list of title, common diffs, extra in source, extra
+    in target and mismatch bitmap of each comparison. Only differences written in excel report are available if the
+    comparison did not keep all of them."""
+
+    if check_key_in_reporting_dict('full_diffs'):
+        return [['Comparison' if key == None else key] + value for key, value in get_from_reporting_dict('full_diffs').items()]
+
+    tabs = []
+    if check_key_in_reporting_dict('comm_diffs'):
+        bitmap = get_from_reporting_dict('comm_diffs_bitmap') if check_key_in_reporting_dict('comm_diffs_bitmap') else None
+        tabs.append(['Comparison', get_from_reporting_dict('comm_diffs'), get_from_reporting_dict('extra_src'),
+                     get_from_reporting_dict('extra_trg'), bitmap])
+    for name in logger.get_detail_tabs_name_list_from_reporting_dict():
+        tab_name_info_lst = logger.get_detail_tabs_info_values_list_from_reporting_dict(name)
+        bitmap = tab_name_info_lst[3] if len(tab_name_info_lst) > 3 else None
+        tabs.append([name.split('-', 1)[1]] + tab_name_info_lst[:3] + [bitmap])
+    return tabs
+
+def _write_html_test_page(html_report_path, test_info, tabs):
+    """Writes html page of test, with its logger steps and paginated tables of differences of each comparison. Rows of tables
+    are written in chunk files (see _write_html_table_chunks()) loaded only when their page is shown. All the differences
+    are saved as parquet files too."""
+    import json, html
+
+    test_dir = f"test_{test_info['rptCnt']}"
+    test_path = os.path.join(html_report_path, test_dir)
+    os.makedirs(test_path, exist_ok=True)
+
+    record = test_info['record']
+    body = [f"<p><a href='index.html'>Summary</a></p><h1>{html.escape(str(record['B']))}</h1>",
+            f"<p class='{str(test_info['status']).lower()}'>Overall status : {html.escape(str(test_info['status']))}</p>",
+            f"<p>Running time : {html.escape(str(test_info['running_time']))}</p>"]
+
+    tables = {}
+    for i, (title, df_cd, df_x1, df_x2, bitmap) in enumerate(tabs):
+        _save_diffs_artifact(test_path, f'tab_{i}', df_cd, df_x1, df_x2, None, bitmap)
+        bitmap = _get_mismatch_bitmap(df_cd) if bitmap is None else bitmap
+        body.append(f"<h2>{html.escape(str(title))}</h2>")
+        for key, caption, df, bm in [('comm_diffs', 'Common Diffs', df_cd, bitmap), ('extra_src', 'Extra in Source', df_x1, None),
+                                     ('extra_trg', 'Extra in Target', df_x2, None)]:
+            table_id = f'tab_{i}_{key}'
+            tables[table_id] = {'path': f'{test_dir}/{table_id}_', 'n': _write_html_table_chunks(test_path, table_id, df, bm)}
+            body.append(f"<h3>{caption} ({len(df)} rows, <a href='{test_dir}/{table_id}.parquet'>parquet</a>)</h3>"
+                        f"<div id='{table_id}_pager'></div><table id='{table_id}'></table>")
+
+    body.append("<h2>Logger Steps</h2><ul>")
+    body += [f"<li class='{step[:4].lower()}'>{html.escape(step)}</li>" for step in test_info['steps']]
+    body.append("</ul>")
+
+    with open(os.path.join(html_report_path, f"{test_dir}.html"), 'w', encoding='utf-8') as f:
+        f.write(_get_html_page(str(record['B']), '\n'.join(body), f"var tables = {json.dumps(tables)};\n{_html_report_script}"))
+    with open(os.path.join(test_path, 'test_info.json'), 'w') as f:
+        json.dump(test_info, f, default=lambda x: x.item() if hasattr(x, 'item') else str(x))
+
+def _write_html_table_chunks(test_path, table_id, df, bitmap=None):
+    """Writes rows of dataframe in chunk files of html_report_chunk_size rows, each being a script passing its rows and
+    mismatching cells to pyetlChunk() of html page. Scripts are used as browsers do not let pages opened from disk fetch
+    json files. Returns count of chunks."""
+    import json
+
+    values = df.astype(object).where(df.notna(), None)
+    columns = [str(x) for x in df.columns]
+    n_chunks = max(1, -(-len(df) // html_report_chunk_size))
+    for i in range(n_chunks):
+        start = i * html_report_chunk_size
+        data = {'columns': columns, 'rows': values.iloc[start:start + html_report_chunk_size].values.tolist(), 'diffs': []}
+        if bitmap is not None:
+            # mismatching cells of pairs of source and target rows in chunk, as row and column of chunk
+            pairs, cols = np.nonzero(bitmap[start // 2:(start + html_report_chunk_size) // 2])
+            data['diffs'] = [[2 * p + r, c + 1] for p, c in zip(pairs.tolist(), cols.tolist()) for r in (0, 1)]
+        with open(os.path.join(test_path, f'{table_id}_{i}.js'), 'w', encoding='utf-8') as f:
+            f.write(f"pyetlChunk({json.dumps(table_id)}, {i}, {json.dumps(data, default=str)});")
+    return n_chunks
+
+def _write_html_summary(html_report_path):
+    """Writes index.html of html report, having summary record of every test in report with link to its page"""
+    import json, html
+
+    ls_test_info = []
+    for name in os.listdir(html_report_path):
+        info_path = os.path.join(html_report_path, name, 'test_info.json')
+        if name.startswith('test_') and os.path.isfile(info_path):
+            with open(info_path) as f:
+                ls_test_info.append(json.load(f))
+    ls_test_info.sort(key=lambda x: x['rptCnt'])
+
+    project = ls_test_info[-1]['project'] if len(ls_test_info) > 0 else {}
+    body = ["<h1>Summary</h1><p>" + ", ".join(f"{key} : {html.escape(str(value))}" for key, value in project.items()) + "</p>",
+            "<table><tr>" + "".join(f"<th>{x}</th>" for x in html_summary_columns) + "</tr>"]
+    for test_info in ls_test_info:
+        record = test_info['record']
+        cells = [html.escape(str(record.get(col))) if record.get(col) != None else '' for col in 'ABDEFGHIJKL']
+        cells[1] = f"<a href='test_{test_info['rptCnt']}.html' class='{str(test_info['status']).lower()}'>{cells[1]}</a>"
+        body.append("<tr>" + "".join(f"<td>{x}</td>" for x in cells) + "</tr>")
+    body.append("</table>")
+
+    with open(os.path.join(html_report_path, "index.html"), 'w', encoding='utf-8') as f:
+        f.write(_get_html_page("Summary", "\n".join(body)))
+
+def _get_html_page(title, body, script=''):
+    """Returns html page of html report"""
+    import html
+    return (f"<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"<style>{_html_report_style}</style></head>\n<body>\n{body}\n<script>{script}</script>\n</body></html>")
+
+# Column headers of summary page of html report, for summary record columns A, B and D to L
+html_summary_columns = ['S.No', 'Test Name', 'Columns Compared', 'Source Size', 'Target Size', 'Mismatch Count',
+                        'Mismatch Columns and Counts', 'Extra in Source', 'Extra in Target', 'Unique Counts', 'Null Counts']
+
+_html_report_style = """
+body { font-family: Calibri, Arial, sans-serif; font-size: 13px; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #999; padding: 2px 6px; white-space: pre; }
+th { background: #ddd; }
+td.diff { background: #ffc7ce; }
+.pass { color: #008000; font-weight: bold; }
+.fail { color: #ff0000; font-weight: bold; }
+"""
+
+# Paginated tables of html test page. Rows of page i of table are loaded by adding script of chunk i, which calls pyetlChunk()
+_html_report_script = """
+var chunks = {};
+function pyetlChunk(id, i, data) { chunks[id + '_' + i] = data; showPage(id, i); }
+function loadPage(id, i) {
+  var t = tables[id];
+  if (i < 0 || i >= t.n) return;
+  t.current = i;
+  if (chunks[id + '_' + i]) { showPage(id, i); return; }
+  var s = document.createElement('script');
+  s.src = t.path + i + '.js';
+  document.body.appendChild(s);
+}
+function esc(v) { return v === null ? '' : String(v).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;'); }
+function showPage(id, i) {
+  var t = tables[id], d = chunks[id + '_' + i], diffs = {};
+  if (t.current !== i) return;
+  d.diffs.forEach(function (x) { diffs[x[0] + ',' + x[1]] = true; });
+  var h = '<tr>' + d.columns.map(function (c) { return '<th>' + esc(c) + '</th>'; }).join('') + '</tr>';
+  d.rows.forEach(function (r, ri) {
+    h += '<tr>' + r.map(function (v, ci) { return '<td' + (diffs[ri + ',' + ci] ? ' class="diff"' : '') + '>' + esc(v) + '</td>'; }).join('') + '</tr>';
+  });
+  document.getElementById(id).innerHTML = h;
+  document.getElementById(id + '_pager').innerHTML = t.n < 2 ? '' :
+    '<a href="javascript:loadPage(\\'' + id + '\\',' + (i - 1) + ')">Prev</a> Page ' + (i + 1) + ' of ' + t.n +
+    ' <a href="javascript:loadPage(\\'' + id + '\\',' + (i + 1) + ')">Next</a>';
+}
+window.onload = function () { for (var id in tables) loadPage(id, 0); };
+"""
 
-    ls = []
-    _ = [ls.extend(a) for a in [x[:num_of_diff_record_on_top] for x in d.values()]]
-    ls.extend([x - 1 for x in ls])
-    rowlist = sorted(list(set(ls)))
 
-    df_top = df.iloc[rowlist]
-    df_top = df_top.append(df[~df.index.isin(df_top.index)].dropna())              # rest of the records from df will be added to df_top after df_top has max no of difference records from each column on top.
-    return df_top
+            
+def _get_diffs_with_diffs_on_top(df, num_of_diff_record_on_top =5, bitmap=None):
+    '''Rearrange the diffs dataframe such that we have atmost some failed records from each column in top records in report.
+    bitmap is mismatching cells of df (see _get_mismatch_bitmap()), computed if not given. Returns rearranged df and its bitmap'''
+
+    bitmap = _get_mismatch_bitmap(df) if bitmap is None else bitmap
+    n_pairs = len(bitmap)
+
+    # first few mismatching pairs of every column, in order of pairs
+    on_top = np.zeros(n_pairs, dtype=bool)
+    for j in range(bitmap.shape[1]):
+        on_top[np.nonzero(bitmap[:, j])[0][:num_of_diff_record_on_top]] = True
+    pair_order = np.concatenate([np.nonzero(on_top)[0], np.nonzero(~on_top)[0]])  # rest of the pairs after the pairs on top
+
+    row_order = np.empty(2 * n_pairs, dtype='int64')
+    row_order[0::2] = 2 * pair_order
+    row_order[1::2] = 2 * pair_order + 1
+    return pd.concat([df.iloc[row_order], df.iloc[2 * n_pairs:]]), bitmap[pair_order]
+
+def _remove_same_pairs(df_cd):
+    '''Removes the pairs of rows of differences dataframe which are same as per threshold, comparison rules and comparison
+    mode. Returns remaining differences and their mismatch bitmap'''
+    bitmap = _get_mismatch_bitmap(df_cd)
+    keep = bitmap.any(1)
+    if keep.all():
+        return df_cd, bitmap
+    rows = np.repeat(keep, 2)
+    return df_cd.iloc[np.nonzero(rows)[0]], bitmap[keep]
+
+def _get_mismatch_bitmap(df_cd):
+    '''Returns bool numpy array of mismatching cells of differences dataframe, having a row per pair of source and target
+    rows and a column per column of df_cd other than 'index'. Threshold, comparison rules and comparison mode stored
+    by compare() in reporting dictionary are used.'''
+    numeric_threshold = get_from_reporting_dict('numeric_threshold') if check_key_in_reporting_dict('numeric_threshold') else 0
+    column_rules = get_from_reporting_dict('column_rules') if check_key_in_reporting_dict('column_rules') else {}
+    return ~apply_numerical_threshold(df_cd, numeric_threshold, column_rules).values
+
+def _get_str_df(df):
+    """Returns copy of dataframe with all values as strings for string comparison. Nulls of arrow backed columns, read
+    with fetch_method='arrow', are converted to '(null)' as for other fetch methods"""
+    arrow_cols = [i for i, t in enumerate(df.dtypes) if hasattr(pd, 'ArrowDtype') and isinstance(t, pd.ArrowDtype)]
+    df = df.astype(object)
+    for i in arrow_cols:
+        df.isetitem(i, ce._to_string(df.iloc[:, i]))
+    return df.astype(str)
 
 def _changeDataToCatagory(df, bool_reduce_size = True):
     """Reduces the size of dataframe"""
@@ -357,15 +1389,7 @@ def _add_detail_tabs_info_in_report(writer, wb):
     reportdiffSize = get_from_reporting_dict('data_size_in_report') if check_key_in_reporting_dict(
         'data_size_in_report') else default_reportdiffSize
 
-    lst_tab_names = logger.get_detail_tabs_name_list_from_reporting_dict()
-    add_in_reporting_dict('list_tab_name', lst_tab_names)
-
-    # Add renamed tab names for additional detaild info in reporting dict
-    dSName = logger.get_from_reporting_dict('detailSheetName')
-    #replacing the thread id of detailed sheet name with the first and last character of dSName.
-    lst_renamed_tab_names = [name.replace(str(threading.get_ident()),dSName[0]+dSName[-1]) for name in lst_tab_names]
-    logger.add_in_reporting_dict("lst_renamed_tab_names", lst_renamed_tab_names)
-
+    lst_tab_names, lst_renamed_tab_names = _set_detail_tabs_names_in_reporting_dict()
     for nameofNewSheet, nameOfRenamedSheet in zip(lst_tab_names, lst_renamed_tab_names):
         tab_name_info_lst = logger.get_detail_tabs_info_values_list_from_reporting_dict(nameofNewSheet)
 
@@ -394,30 +1418,44 @@ def _add_detail_tabs_info_in_report(writer, wb):
                                           f'Showing only first {reportdiffSize} records…')   # msg wont be written
         writer.save()
 
-        # fetch coordinates of diff cells - used later
-        df_cd = df_cd.set_index('index')
-        ls_diffCells = _getDiffCellsCoordinates(df_cd)
-        # format the diff tab
-        _formatExcelCellColor(t_sh, ls_diffCells)
+        # format the diff tab, mismatching cells are already known if bitmap is stored along with diffs
+        if len(tab_name_info_lst) > 3:
+            _formatExcelCellColor(t_sh, bitmap=tab_name_info_lst[3])
+        else:
+            _formatExcelCellColor(t_sh, _getDiffCellsCoordinates(df_cd.set_index('index')))
         writer.save()
 
 
+def _set_detail_tabs_names_in_reporting_dict():
+    """Sets names of custom additional tabs and their renamed names in report, in reporting dictionary and returns them"""
+
+    lst_tab_names = logger.get_detail_tabs_name_list_from_reporting_dict()
+    add_in_reporting_dict('list_tab_name', lst_tab_names)
+
+    # Add renamed tab names for additional detaild info in reporting dict
+    dSName = logger.get_from_reporting_dict('detailSheetName')
+    #replacing the thread id of detailed sheet name with the first and last character of dSName.
+    lst_renamed_tab_names = [name.replace(str(threading.get_ident()),dSName[0]+dSName[-1]) for name in lst_tab_names]
+    logger.add_in_reporting_dict("lst_renamed_tab_names", lst_renamed_tab_names)
+    return lst_tab_names, lst_renamed_tab_names
+
+
 def _write_Steps_Info_Log_in_Detailed_Sheet(t_sh):
     """Writes run time loggers in detailed sheet of report"""
 
-    stepList = iniVar.th_local.dict['logger']
-    thId = str(threading.get_ident())
-    stepList = [x[(len(thId)+3) :] for x in stepList if thId in x]
-    
+    stepList = _get_formatted_logger_steps()
+
     col = _get_first_blank_column(t_sh, row = 1) + 2
     if len(stepList)>0:  t_sh.cell(1, col).value = "Logger Steps:"
-    for i, s in enumerate(stepList):
+    for i, (step, hyperlink, font) in enumerate(stepList):
         #writing logger info in sheet.
-        t_sh.cell(i+3, col).value = stepList[i]
-        _format_logger_steps_in_detailed_tab(t_sh.cell(i+3, col) )
+        cell = t_sh.cell(i+3, col)
+        cell.value = step
+        _format_logger_step_cell(cell, hyperlink, font)
 
     st = get_from_reporting_dict('overall_status').upper()
     t_sh.cell(i + 5, col).value = f"Overall test status = {st}"
+    _move_report_cursor(t_sh, i + 5, [col])
 
 
 def _write_Running_Time_Info_Log_in_Detailed_Sheet(t_sh):
@@ -426,53 +1464,23 @@ def _write_Running_Time_Info_Log_in_Detailed_Sheet(t_sh):
     scol_letter = openpyxl.utils.get_column_letter(scol)
     srow = _get_last_non_blank_row(t_sh, col=scol_letter) + 1
     t_sh.cell(srow, scol).value = f"Script execution time = {get_from_reporting_dict('running_time')} sec"
+    _move_report_cursor(t_sh, srow, [scol])
 
 
-def _format_logger_steps_in_detailed_tab(cell):
-    """format steps having reference to additional detailed tab in blue link """
+def _format_logger_step_cell(cell, hyperlink, font):
+    """format steps having reference to additional detailed tab in blue link, font is key of logger_step_fonts"""
 
-    lst_renamed_tab_names = get_from_reporting_dict('lst_renamed_tab_names') if check_key_in_reporting_dict('lst_renamed_tab_names') else None
-    ls_tab_name = get_from_reporting_dict('list_tab_name') if check_key_in_reporting_dict('list_tab_name') else None
-
-    # Format colors of pass and fail normal steps
-    if cell.value[:4]=='PASS':
-        cell.font = Font(color='FF008000', bold=True)
-    if cell.value[:4]=='FAIL':
-        cell.font = Font(color='FFFF0000', bold=True)
-
-    # Format steps having additional information
-    # if ls_tab_name != None and len([tab for tab in ls_tab_name[::-1] if tab in cell.value]) > 0:
-    #     tab_name = [tab for tab in ls_tab_name[::-1] if tab in cell.value][0]
-    # Below code implemented to fix the bug which causes wrong hyperlinks for tabs having couunt >10
-
-    if ls_tab_name != None and len(_check_additional_tab_name_in_logger(cell.value)) > 0:
-        tab_name = _check_additional_tab_name_in_logger(cell.value)
-        # Replace the tab name in the logger step with renamed tab name
-        renamed_tab_name = lst_renamed_tab_names[ls_tab_name.index(tab_name)]
-        renamed_logger_step = cell.value.replace(tab_name,renamed_tab_name )
-
-        # Write renamed logger step in detailed tab
-        cell.hyperlink = "#'" + renamed_tab_name + "'!A1"
-        cell.value = renamed_logger_step
-
-        if cell.value[:4] == 'PASS':
-            cell.font = Font(italic=True, underline='single', color='FF008000')
-        if cell.value[:4] == 'FAIL':
-            cell.font = Font(italic=True, underline='single', color='FFFF0000')
-
-def _check_additional_tab_name_in_logger(cell_value):
-    """returns the additional detail tab name if present in current cell logger"""
-    try:
-        ret = cell_value[cell_value.index(str(threading.get_ident()) + '-'):].strip()
-    except:
-        ret=''
-    return ret
+    if hyperlink != None:
+        cell.hyperlink = hyperlink
+    if font != None:
+        cell.font = logger_step_fonts[font]
 
 
-def _update_dict_for_summary_record_from_compare_function(src_df, trg_df, ls_ref_src):
-    '''Add original datasets info in reporting dictionary'''
+def _update_dict_for_summary_record_from_compare_function(src_df, trg_df, ls_ref_src, approx_distinct=False):
+    '''Add original datasets info in reporting dictionary. Unique and null counts are kept as profile of source and target
+    in 'data_profile' key (see compare_engine.get_column_profile()), summary strings are made from it'''
 
-    ls_cols_validate = [x for x in (set(src_df.columns) - set(ls_ref_src))]
+    ls_cols_validate = [x for x in src_df.columns if x not in ls_ref_src]
     col_names =',\n'.join(ls_cols_validate)
     add_in_reporting_dict('col_names', col_names)
 
@@ -482,11 +1490,12 @@ def _update_dict_for_summary_record_from_compare_function(src_df, trg_df, ls_ref
     size_of_trg = str(len(trg_df)) + ' x ' + str(len(trg_df.columns) - len(ls_ref_src))
     add_in_reporting_dict('size_of_trg', size_of_trg)
 
-    unique_cnt = ';\n'.join([c + ': src=' + str(src_df[c].nunique()) +  ' trg=' + str(trg_df[c].nunique()) for c  in ls_cols_validate])
-    add_in_reporting_dict('unique_cnt', unique_cnt)
+    data_profile = {'src': ce.get_column_profile(src_df, ls_cols_validate, approx_distinct=approx_distinct),
+                    'trg': ce.get_column_profile(trg_df, ls_cols_validate, approx_distinct=approx_distinct)}
+    add_in_reporting_dict('data_profile', data_profile)
 
-    null_cnt = ';\n'.join([c + ': src=' + str(len(src_df[src_df[c]=='(null)'])) +  ' trg=' + str(len(trg_df[trg_df[c]=='(null)'])) for c in ls_cols_validate])
-    add_in_reporting_dict('null_cnt', null_cnt)
+    add_in_reporting_dict('unique_cnt', ce.format_profile_counts(data_profile['src'], data_profile['trg'], 'unique'))
+    add_in_reporting_dict('null_cnt', ce.format_profile_counts(data_profile['src'], data_profile['trg'], 'nulls'))
 
 def _update_dict_with_diffs_records_for_summary_from_compare_function(df_cd, df_x1, df_x2):
     """Dictionary is updated with information of differences like mismatch in col and their count, extra records in source and target if any"""
@@ -521,61 +1530,80 @@ def _update_dict_for_summary_record_from_report_function(df_cd, df_x1, df_x2, te
 def _enter_info_in_summary_result(s_sh, writer):
     """Enter information in summary sheet row based on info available in reporting dictionary"""
 
-    status = "Pass"
     vRow = str(_get_first_blank_row(s_sh))
-    s_sh['A' + vRow] = int(vRow) - 6
-    s_sh['B' + vRow] = get_from_reporting_dict('testName')
+    record, wrapText = _get_summary_record(vRow)
+    for col, value in record.items():
+        s_sh[col + vRow] = value
+    _move_report_cursor(s_sh, int(vRow), [openpyxl.utils.column_index_from_string(col) for col in record])
+
+    writer.save()
+
+    status = "Fail" if wrapText == False or _getOverallStatus(s_sh, vRow) == "Fail" else "Pass"
+    _log_overall_status(status)
+
+    # format the cells in the second row
+    detailSheetName = get_from_reporting_dict("detailSheetName") if check_key_in_reporting_dict('detailSheetName') else None
+    for cell in s_sh[vRow + ":" + vRow]:
+        _format_summary_record_cell(cell, cell.column_letter, status, wrapText, detailSheetName)
+
+def _get_summary_record(vRow):
+    """Returns summary record of current test from reporting dictionary as dict of column letter and value, and if values
+    are to be wrapped (not in case of error)"""
 
+    record = {'A': int(vRow) - 6, 'B': get_from_reporting_dict('testName')}
     if check_key_in_reporting_dict('error') and (get_from_reporting_dict('error')!= None):  # when error
-        s_sh['D' + vRow] = get_from_reporting_dict('error') 
-        status = "Fail"
-        wrapText = False
-    else:
-        wrapText = True
-        s_sh['D' + vRow] = get_from_reporting_dict('col_names') if check_key_in_reporting_dict('col_names') else None
-        s_sh['E' + vRow] = get_from_reporting_dict('size_of_src') if check_key_in_reporting_dict('size_of_src') else None
-        s_sh['F' + vRow] = get_from_reporting_dict('size_of_trg') if check_key_in_reporting_dict('size_of_trg') else None
-        s_sh['G' + vRow] = get_from_reporting_dict('mismatch_cnt') if check_key_in_reporting_dict('mismatch_cnt') else None
-        s_sh['H' + vRow] = get_from_reporting_dict('mismatch_cols_n_cnt') if check_key_in_reporting_dict('mismatch_cols_n_cnt') else None
-        s_sh['I' + vRow] = get_from_reporting_dict('extra_src_cnt') if check_key_in_reporting_dict('extra_src_cnt') else None
-        s_sh['J' + vRow] = get_from_reporting_dict('extra_trg_cnt') if check_key_in_reporting_dict('extra_trg_cnt') else None
-        s_sh['K' + vRow] = get_from_reporting_dict('unique_cnt') if check_key_in_reporting_dict('unique_cnt') else None
-        s_sh['L' + vRow] = get_from_reporting_dict('null_cnt') if check_key_in_reporting_dict('null_cnt') else None
+        record['D'] = get_from_reporting_dict('error')
+        return record, False
 
-    writer.save()
-            
-    if _getOverallStatus(s_sh, vRow) == "Fail":
-        status = "Fail"
+    keys = ['col_names', 'size_of_src', 'size_of_trg', 'mismatch_cnt', 'mismatch_cols_n_cnt', 'extra_src_cnt',
+            'extra_trg_cnt', 'unique_cnt', 'null_cnt']
+    for col, key in zip('DEFGHIJKL', keys):
+        record[col] = get_from_reporting_dict(key) if check_key_in_reporting_dict(key) else None
+    return record, True
 
-    add_in_reporting_dict('overall_status', status)
+def _log_overall_status(status):
+    """Stores overall status of current test in reporting dictionary and logs it"""
 
+    add_in_reporting_dict('overall_status', status)
     if status == "Fail":
         print('')
         loggerFail("Overall test script status is FAILED")
-        s_sh['B' + vRow].fill = PatternFill(start_color='FF0000', end_color='FF0000',fill_type='solid')
         # in case more records to write to report, then below will show warning msg
         _print_wait_info_for_preparing_Report()
     else:
-        s_sh['B' + vRow].fill = PatternFill(start_color='00FF00', end_color='00FF00', fill_type = "solid")
         print('')
         loggerPass("Overall test script status is PASSED")
 
-    if check_key_in_reporting_dict('detailSheetName'):
-        shname = get_from_reporting_dict("detailSheetName")
-        cell = s_sh['C' + vRow]
-        cell.hyperlink = "#" + shname + "!A1"   
+def _get_summary_record_cells(s_sh, record, status, wrapText, detailSheetName, max_col):
+    """Returns formatted cells of summary record to append in write only Summary sheet"""
+    cells = []
+    for col in range(1, max_col + 1):
+        cell = WriteOnlyCell(s_sh, record.get(openpyxl.utils.get_column_letter(col)))
+        _format_summary_record_cell(cell, openpyxl.utils.get_column_letter(col), status, wrapText, detailSheetName)
+        cells.append(cell)
+    return cells
+
+def _format_summary_record_cell(cell, col, status, wrapText, detailSheetName=None):
+    """Formats the cell of summary record in given column letter. Status is coloured in test name and detailed report link
+    is added if detailed sheet name is known"""
+
+    cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True,)
+    thin = Side(border_style="thin", color="000000")
+    cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+
+    if col == 'B' and status == "Fail":
+        cell.fill = PatternFill(start_color='FF0000', end_color='FF0000',fill_type='solid')
+    if col == 'B' and status != "Fail":
+        cell.fill = PatternFill(start_color='00FF00', end_color='00FF00', fill_type = "solid")
+
+    if col == 'C' and detailSheetName != None:
+        cell.hyperlink = "#" + detailSheetName + "!A1"
         cell.value = "Detailed Report Link"
         cell.font = Font(italic=True, underline = 'single', color = 'FF0000FF')
 
-    # format the cells in the second row
-    for cell in s_sh[vRow + ":" + vRow]:
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True,)
-        thin = Side(border_style="thin", color="000000")
-        cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
-        
     # if error, dont wrap error msg
-    if wrapText == False:
-        s_sh['D' + vRow].alignment = Alignment(horizontal="left", vertical="center", wrap_text=False,)
+    if col == 'D' and wrapText == False:
+        cell.alignment = Alignment(horizontal="left", vertical="center", wrap_text=False,)
 
 def _print_wait_info_for_preparing_Report():
     ifPrimaryTabDFPresent = True if check_key_in_reporting_dict('comm_diffs') else False
@@ -602,6 +1630,7 @@ def _print_wait_info_for_preparing_Report():
         loggerDisplay("It may take FEW MINUTES to generate report depending on the size of data to write in report")
         loggerDisplay(
             "It is recommended not to use 'set_data_size_in_report(size)' with size > 1000, due to performance issues in excel report writing, unless very much required.")
+        loggerDisplay("Colouring of differences can be made faster with set_diff_cells_format_mode('conditional').")
         print("Please wait for report generation...")
         loggerDisplay()
 
@@ -612,100 +1641,139 @@ def _print_wait_info_for_preparing_Report():
         loggerDisplay(f"it may take FEW SECONDS to FEW MINUTES to generate report depending of size selected.")
         loggerDisplay(
             "It is recommended not to use 'set_data_size_in_report(size)' with size > 1000, due to performance issues in excel report writing, unless very much required.")
+        loggerDisplay("Colouring of differences can be made faster with set_diff_cells_format_mode('conditional').")
         print("Please wait for report generation...")
         loggerDisplay()
 
 def _getOverallStatus(s_sh, vRow):
     """Determine the status of script based on logger steps"""
 
+    return _get_overall_status_of_summary_record({col: s_sh[col + vRow].value for col in 'GIJKL'})
+
+def _get_overall_status_of_summary_record(record):
+    """Determine the status of script based on logger steps and summary record (dict of column letter and value)"""
+
     status = "Pass"
-    stepList = iniVar.th_local.dict['logger']
-    thId = str(threading.get_ident())
-    stepList = [x[(len(thId)+3) :] for x in stepList if thId in x]
-    jointStepList = ",".join(stepList)
-    
-    if "FAIL -" in jointStepList:
+    if any(step['type'] == 'FAIL' for step in iniVar.th_local.dict.get('logger_records', [])):
         status = "Fail"
         
     #check summary values for status
-    if ((s_sh['G' + vRow].value != None and s_sh['G' + vRow].value!=0) or 
-        (s_sh['I' + vRow].value != None and s_sh['I' + vRow].value!=0) or 
-        (s_sh['J' + vRow].value != None and s_sh['J' + vRow].value!=0)):
+    if ((record.get('G') != None and record.get('G')!=0) or 
+        (record.get('I') != None and record.get('I')!=0) or 
+        (record.get('J') != None and record.get('J')!=0)):
         
             status = "Fail"
         
     # check for uniques
-
-
-    if s_sh['K' + vRow].value != None:
-        import re
-        unqCntStr = s_sh['K' + vRow].value
-        lst = re.findall("=\d+", unqCntStr)
-        for i in range(1, len(lst),2):
-            if lst[i]!=lst[i-1] :
-                # if threshold > 0, then number of uniques can be different and has to be ignored
-                numeric_threshold = get_from_reporting_dict('numeric_threshold') if check_key_in_reporting_dict('numeric_threshold') else 0
-                if numeric_threshold == 0:
-                    status = "Fail"
+    if _is_profile_count_different(record, 'K', 'unique'):
+        # if threshold > 0 or comparison rules are given, then number of uniques can be different and has to be ignored
+        numeric_threshold = get_from_reporting_dict('numeric_threshold') if check_key_in_reporting_dict('numeric_threshold') else 0
+        column_rules = get_from_reporting_dict('column_rules') if check_key_in_reporting_dict('column_rules') else {}
+        if numeric_threshold == 0 and len(column_rules) == 0:
+            status = "Fail"
 
     # check for nulls
-    if s_sh['L' + vRow].value != None:
-        import re
-        unqCntStr = s_sh['L' + vRow].value
-        lst = re.findall("=\d+", unqCntStr)
-        for i in range(1, len(lst),2):
-            if lst[i]!=lst[i-1] :
-                status = "Fail"
+    if _is_profile_count_different(record, 'L', 'nulls'):
+        status = "Fail"
 
     return status
 
+def _is_profile_count_different(record, col, count):
+    """Returns True if unique or null count (count is 'unique' or 'nulls') of any column is different in source and target.
+    Counts are taken from profiles kept by compare function in 'data_profile' key, else from summary string of record in
+    given column, e.g. 'COL1: src=10 trg=~12', estimated counts having '~'."""
+
+    if record.get(col) == None:
+        return False
+    if check_key_in_reporting_dict('data_profile'):
+        data_profile = get_from_reporting_dict('data_profile')
+        return any(p[count] != data_profile['trg']['columns'][c][count] for c, p in data_profile['src']['columns'].items())
+
+    import re
+    lst = re.findall(r"=~?(\d+)", record.get(col))
+    return any(lst[i] != lst[i - 1] for i in range(1, len(lst), 2))
+
 
 def _get_first_blank_row(s_sh, col = 'A'):
     """Find first blank row in sheet"""
 
-    i = 1
-    lst = len(s_sh[col])
-    for i in range(lst,1,-1):
-        if s_sh[col + str(i)].value != '':
-            return i+1
+    return _get_report_cursor(s_sh)['row'] + 1
 
 def _get_last_non_blank_row(s_sh, col = 'A'):
     """Find last no blank row in sheet in given column"""
 
-    lst = len(s_sh[col])+1
-    for i in range(lst,1,-1):
-        if s_sh[col + str(i)].value != None:
-            return i+1
+    return _get_report_cursor(s_sh)['col_rows'].get(openpyxl.utils.column_index_from_string(col), 1) + 1
 
 def _get_first_blank_column(sh, row = 1):
     """Find first blank column in the sheet"""
 
-    i = 1
-    lst = len(sh[row])
+    lst = _get_report_cursor(sh)['col']
     if lst == 1 : return 1
-    
-    for i in range(lst,1,-1):
-        if sh.cell(row, i).value != '':
-            return i+1
-
-
-def _getTotalDiffColumns(df_cd_full):
-    """Gets the name of columns and counts of differences in each column"""
+    return lst + 1
+
+def _get_report_cursor(sh):
+    """Returns cursor of sheet of loaded report, having last used row and column of sheet and last used row of its columns.
+    Cells of sheet are scanned only when sheet is first used after report is loaded, later the cursor is moved as cells are
+    written in sheet, so finding blank rows and columns does not scan the sheet again. Cursor is kept on the sheet object,
+    so it goes away with the loaded workbook and a report loaded again is scanned again."""
+
+    if getattr(sh, 'report_cursor', None) == None:
+        col_rows = {}
+        for row in sh.iter_rows():
+            for cell in row:
+                if cell.value != None:
+                    col_rows[cell.column] = cell.row
+        sh.report_cursor = {'row': sh.max_row, 'col': sh.max_column, 'col_rows': col_rows}
+    return sh.report_cursor
+
+def _move_report_cursor(sh, last_row, cols):
+    """Moves cursor of sheet of current report after cells written till last_row in given columns (numbers)"""
+
+    cursor = _get_report_cursor(sh)
+    cursor['row'] = max(cursor['row'], last_row)
+    cursor['col'] = max([cursor['col']] + list(cols))
+    for col in cols:
+        cursor['col_rows'][col] = max(cursor['col_rows'].get(col, 0), last_row)
+
+
+def _getTotalDiffColumns(df_cd_full, bitmap=None):
+    """Gets the name of columns and counts of differences in each column. bitmap is mismatching cells of df_cd_full, if known"""
     if len(df_cd_full)!=0:
-        numeric_threshold = get_from_reporting_dict('numeric_threshold') if check_key_in_reporting_dict('numeric_threshold') else 0
-        if numeric_threshold == 0:
-            shiftedDiffs = df_cd_full.shift() == df_cd_full
-            diffCounts= shiftedDiffs[shiftedDiffs.reset_index().index % 2 != 0].apply(lambda x: x.value_counts(),axis = 0)
-        else: # if thresold is there
-            diffCounts = apply_numerical_threshold(df_cd_full, numeric_threshold).apply(lambda x: x.value_counts(),axis = 0)
-
-        ggg = diffCounts.reset_index(drop=True).loc[0].dropna().to_frame().sort_values(0,ascending=False)
-        ls_Tuples =  [(x,int(y)) for x,y in zip(ggg.index.tolist(),ggg[0])]
-        shiftedDiffs,diffCounts = [None]*2
-        return str([(x,y) for x,y in ls_Tuples if x != 'index'])[1:-1]
+        return _format_diff_columns_counts(_getDiffColumnsCounts(df_cd_full, bitmap))
     else:
         return 'None'
 
+def _getDiffColumnsCounts(df_cd_full, bitmap=None):
+    """Returns list of tuples (column name, count of differences) for columns having differences. bitmap is mismatching
+    cells of df_cd_full (see _get_mismatch_bitmap()), if known"""
+    if len(df_cd_full)==0:
+        return []
+    if bitmap is not None:
+        cols = [x for x in df_cd_full.columns if x not in ['seq_custom_intenal', 'index']]
+        counts = bitmap.sum(0)
+        return sorted([(c, int(n)) for c, n in zip(cols, counts) if n > 0], key=lambda x: x[1], reverse=True)
+    numeric_threshold = get_from_reporting_dict('numeric_threshold') if check_key_in_reporting_dict('numeric_threshold') else 0
+    column_rules = get_from_reporting_dict('column_rules') if check_key_in_reporting_dict('column_rules') else {}
+    compare_mode = get_from_reporting_dict('compare_mode') if check_key_in_reporting_dict('compare_mode') else 'string'
+    if numeric_threshold == 0 and len(column_rules) == 0 and compare_mode == 'string':
+        shiftedDiffs = df_cd_full.shift() == df_cd_full
+        diffCounts= shiftedDiffs[shiftedDiffs.reset_index().index % 2 != 0].apply(lambda x: x.value_counts(),axis = 0)
+    else: # if thresold or comparison rules are there or typed comparison (nulls are same)
+        diffCounts = (~apply_numerical_threshold(df_cd_full, numeric_threshold, column_rules)).sum()
+        return [(x, int(y)) for x, y in diffCounts[diffCounts > 0].sort_values(ascending=False).items() if x != 'index']
+
+    ggg = diffCounts.reset_index(drop=True).loc[0].dropna().to_frame().sort_values(0,ascending=False)
+    ls_Tuples =  [(x,int(y)) for x,y in zip(ggg.index.tolist(),ggg[0])]
+    shiftedDiffs,diffCounts = [None]*2
+    return [(x,y) for x,y in ls_Tuples if x != 'index']
+
+def _format_diff_columns_counts(ls_Tuples):
+    """Formats list of tuples (column name, count of differences) as written in summary of report"""
+    if len(ls_Tuples)==0:
+        return 'None'
+    ls_Tuples = sorted(ls_Tuples, key=lambda x: x[1], reverse=True)
+    return str(ls_Tuples)[1:-1]
+
 
 def isnumber(x):
     # checks if argument is number or not
@@ -728,9 +1796,9 @@ def diff_for_2_vals(vals, threshold):
         return True if x == y else False
 
 
-def compare_apply_numerical_threshold(df1, threshold):
-    #
-    if threshold==0:
+def compare_apply_numerical_threshold(df1, threshold, column_rules=None):
+    # removes the pairs of rows which are same as per threshold and comparison rules
+    if threshold==0 and not column_rules:
         return df1
 
     #df1['seq_custom_intenal'] = [x for x in range(0, len(df1))]   # adding
@@ -747,19 +1815,22 @@ def compare_apply_numerical_threshold(df1, threshold):
     dfcopy = df1.copy()
     dfcopy['seq_custom_intenal'] = [x for x in range(0, len(dfcopy))]
 
-    dfg = apply_numerical_threshold(df1, threshold)
+    dfg = apply_numerical_threshold(df1, threshold, column_rules)
     dfd = dfg.iloc[:, 1:].all(1)
     ls_indx = dfd[dfd == True].index.to_list()
     ls_indx = [x - 1 for x in ls_indx] + ls_indx
     return dfcopy[~dfcopy['seq_custom_intenal'].isin(ls_indx)].drop(columns=['seq_custom_intenal'])
 
 
-def _getCommonDiffs(df1, df2, ls_ref_src, threshold):
-    """find the set of rows having differences between two datasets"""
+def _getCommonDiffs(df1, df2, ls_ref_src, threshold, column_rules=None, keys=None):
+    """find the set of rows having differences between two datasets. keys is output of compare_engine.align_reference_keys()"""
+
+    if keys == None:
+        keys = ce.align_reference_keys(df1, df2, list(df1.index.names), list(df2.index.names))
 
-    aa = df2[df2.index.isin(df1.index)].reset_index()
+    aa = df2[keys['trg_both']].reset_index()
     aa = aa.rename(index={x:y for x,y in zip(aa.index,['Target' for x in aa.index])})
-    bb=  df1[df1.index.isin(df2.index)].reset_index()
+    bb=  df1[keys['src_both']].reset_index()
     bb = bb.rename(index={x:y for x,y in zip(bb.index,['Source' for x in bb.index])})
     
     sortCols = ls_ref_src + ['index']
@@ -767,21 +1838,28 @@ def _getCommonDiffs(df1, df2, ls_ref_src, threshold):
     df_cd_full = cc.drop_duplicates(subset=bb.columns, keep=False)
     aa,bb,cc = [None]*3
 
-    df_cd_full = compare_apply_numerical_threshold(df_cd_full, threshold=threshold)
+    df_cd_full = compare_apply_numerical_threshold(df_cd_full, threshold=threshold, column_rules=column_rules)
     return df_cd_full
 
-def _reportUniquenessOfReferenceCols(df1,df2):
-    """Check if the reference columns have all the values as unique and if not report it"""
+def _reportUniquenessOfReferenceCols(df1,df2, keys=None, ls_ref1=None, ls_ref2=None):
+    """Check if the reference columns have all the values as unique and if not report it. Reference columns are index
+    of df1 and df2 if ls_ref1 and ls_ref2 are not given. keys is output of compare_engine.align_reference_keys() for df1 and df2,
+    if already computed. Duplicates having most rows are reported on top."""
 
-    def duplicateDF(ddf,index_cols):
-        ddf = ddf.reset_index()[index_cols].sort_values(index_cols)
-        return ddf[ddf.duplicated(index_cols, keep = False)].groupby(index_cols).size().reset_index().rename(columns={0:'Count'})
+    ls_ref1 = list(df1.index.names) if ls_ref1 == None else ls_ref1
+    ls_ref2 = list(df2.index.names) if ls_ref2 == None else ls_ref2
+    if keys == None:
+        keys = ce.align_reference_keys(df1, df2, ls_ref1, ls_ref2)
+
+    def duplicateDF(ddf, index_cols, codes):
+        return ce.get_duplicate_keys(ddf, index_cols, codes).sort_values('Count', ascending=False, kind='mergesort')
     
     n = 3 #gv.NumOfDuplicateRecordDisplay
     
-    isUnique1 = df1.index.is_unique
+    dup1 = duplicateDF(df1, ls_ref1, keys['src_codes'])
+    isUnique1 = len(dup1) == 0
     if not isUnique1:
-        dup = duplicateDF(df1,df1.index.names)
+        dup = dup1
         if len(dup) >n:
             loggerFail(f"Showing only {n} duplicate records in reference column(s) out of {len(dup)} records in File1:")
             # print(f"Showing only {n} duplicate records in reference column(s) out of {len(dup)} records in File1:")
@@ -795,9 +1873,10 @@ def _reportUniquenessOfReferenceCols(df1,df2):
         # print(f'{dup_df}')
         # print('')
         
-    isUnique2 = df2.index.is_unique
+    dup2 = duplicateDF(df2, ls_ref2, keys['trg_codes'])
+    isUnique2 = len(dup2) == 0
     if not isUnique2:
-        dup = duplicateDF(df2,df2.index.names)
+        dup = dup2
         if len(dup) >n:
             loggerFail(f"Showing only {n} duplicate records in reference column(s) out of {len(dup)} records in File2:")
             # (f"Showing only {n} duplicate records in reference column(s) out of {len(dup)} records in File2:")
@@ -832,52 +1911,46 @@ def _write_in_detailed_report(t_sh, rowtowrite, vtype, df, writer, nameofNewShee
     reportdiffSize = get_from_reporting_dict('data_size_in_report') if check_key_in_reporting_dict(
         'data_size_in_report') else default_reportdiffSize
 
+    _move_report_cursor(t_sh, rowtowrite, [1])
+
     if len(df)<=reportdiffSize:
         _write_df_to_sheet(df, writer, nameofNewSheet, row =row, col=col, index=False)
     else: # this part is not being executed as df is sliced to reportdiffsize earlier only
         df = df[:reportdiffSize]
         _write_df_to_sheet(df, writer, nameofNewSheet, row =row, col=col, index=False)
         t_sh['B' + str(rowtowrite + reportdiffSize + 1)] =msg
+        _move_report_cursor(t_sh, rowtowrite + reportdiffSize + 1, [2])
+    # header and rows of df
+    _move_report_cursor(t_sh, row + len(df), range(col, col + len(df.columns)))
     return df
 
-def apply_numerical_threshold(df, threshold):
-    df1 = df.copy()
-    df1['seq_custom_intenal'] = [x for x in range(0, len(df1))]  # adding
-    df1 = df1.reset_index(drop=True)
-
-    cols_to_drop = [x for x in ['seq_custom_intenal', 'index'] if x in list(df1.columns)]
-    df11 = df1[df1.index % 2 != 0].drop(columns=cols_to_drop)
-
-    df22 = df1.shift()
-    df22 = df22[df22.index % 2 != 0].drop(columns=cols_to_drop)
-    df1 = None  # reset df
-
-    dfcon = pd.concat([df11, df22], axis='rows')
-    df11, df22 = [None] * 2  # reset df
+def apply_numerical_threshold(df, threshold, column_rules=None):
+    """Returns True/False dataframe for the target rows (odd rows) of differences dataframe. Value is True where source and
+    target values are same, or both are numbers and their difference is less than or equal to threshold, or they are
+    same as per comparison rules of the column"""
 
-    dfg = dfcon.groupby(level=0, axis=0).apply(lambda frame: frame.apply(diff_for_2_vals, threshold=threshold, axis=0))
-    if len(dfg)==0:
-        dfg = dfcon.drop(index=dfcon.index)
+    cols = [x for x in df.columns if x not in ['seq_custom_intenal', 'index']]
+    n = len(df) // 2
+    mask = ce.get_equality_mask(df[cols].iloc[0:2 * n:2], df[cols].iloc[1:2 * n:2], threshold, column_rules)
+    return pd.DataFrame(mask, index=range(1, 2 * n, 2), columns=cols)
 
-    dfcon = None  # reset df
-    return dfg
+def getCoordinates_by_apply_numerical_threshold(df, threshold, column_rules=None):
+    # generate coordinates based on numerical threshold and comparison rules
 
-def getCoordinates_by_apply_numerical_threshold(df, threshold):
-    # generate coordinates based on numerical threshold
-
-    dfg = apply_numerical_threshold(df, threshold)
-    df_cd1 = dfg.rename(columns={x: y for x, y in zip(dfg.columns, range(1, len(dfg.columns) + 1))})
-    diff_cells = df_cd1[df_cd1 == False].stack().index.tolist()
-    diff_cells = [(x[0], x[1] + 1) for x in diff_cells]
+    dfg = apply_numerical_threshold(df, threshold, column_rules)
+    rows, cols = np.nonzero(~dfg.values)
+    diff_cells = [(x, y + 2) for x, y in zip(dfg.index.values[rows].tolist(), cols.tolist())]
     return diff_cells
 
 
 def _getDiffCellsCoordinates(df_cd):
     """Find the cells coordinates of differnces"""
     numeric_threshold = get_from_reporting_dict('numeric_threshold') if check_key_in_reporting_dict('numeric_threshold') else 0
+    column_rules = get_from_reporting_dict('column_rules') if check_key_in_reporting_dict('column_rules') else {}
+    compare_mode = get_from_reporting_dict('compare_mode') if check_key_in_reporting_dict('compare_mode') else 'string'
 
-    if numeric_threshold > 0:
-        return getCoordinates_by_apply_numerical_threshold(df_cd, numeric_threshold)
+    if numeric_threshold > 0 or len(column_rules) > 0 or compare_mode == 'typed':
+        return getCoordinates_by_apply_numerical_threshold(df_cd, numeric_threshold, column_rules)
     else:
         dd = (df_cd.shift() == df_cd).reset_index()
         ddd= dd[dd.index % 2 != 0]
@@ -887,23 +1960,66 @@ def _getDiffCellsCoordinates(df_cd):
         return diff_cells
 
 
-def _formatExcelCellColor(sh, diff_cells):
-    """Colour red for the difference cells in final report"""
-
-    #Open the difference excel and colour red the cells of difference
-    DiffColor = "FFFF0000"
-    for x,y in diff_cells:
-        sh.cell(x+1,y+1).fill= openpyxl.styles.PatternFill(start_color=DiffColor, end_color=DiffColor, fill_type = "solid")
-        sh.cell(x+2,y+1).fill= openpyxl.styles.PatternFill(start_color=DiffColor, end_color=DiffColor, fill_type = "solid")
-    
-
-
-
-    
+def _get_diff_cells_from_bitmap(bitmap):
+    """Returns coordinates of difference cells, same as _getDiffCellsCoordinates(), from mismatch bitmap of differences"""
+    pairs, cols = np.nonzero(bitmap)
+    return list(zip((2 * pairs + 1).tolist(), (cols + 2).tolist()))
 
 
+def _formatExcelCellColor(sh, diff_cells=None, bitmap=None):
+    """Colour red for the difference cells in final report. Cells are given as coordinates (see _getDiffCellsCoordinates())
+    or as mismatch bitmap of differences written in report (see _get_mismatch_bitmap()). Cells are coloured as per
+    mode set by set_diff_cells_format_mode()"""
 
+    if bitmap is not None:
+        diff_cells = _get_diff_cells_from_bitmap(bitmap)
 
+    if _get_diff_cells_format_mode() == 'conditional':
+        _add_conditional_format_for_diff_cells(sh, diff_cells)
+        return
 
+    #Open the difference excel and colour red the cells of difference, all cells share one fill
+    DiffColor = "FFFF0000"
+    fill = openpyxl.styles.PatternFill(start_color=DiffColor, end_color=DiffColor, fill_type = "solid")
+    for x,y in diff_cells:
+        sh.cell(x+1,y+1).fill= fill
+        sh.cell(x+2,y+1).fill= fill
 
+def _add_conditional_format_for_diff_cells(sh, diff_cells):
+    """Colour red the difference cells with a single conditional formatting rule over the contiguous ranges of cells, so
+    that no style is added per cell"""
+    from openpyxl.formatting.rule import FormulaRule
 
+    ranges = _get_diff_cells_ranges(diff_cells)
+    if len(ranges) == 0:
+        return
+    DiffColor = "FFFF0000"
+    fill = openpyxl.styles.PatternFill(start_color=DiffColor, end_color=DiffColor, fill_type = "solid")
+    sh.conditional_formatting.add(' '.join(ranges), FormulaRule(formula=['TRUE'], fill=fill))
+
+def _get_diff_cells_ranges(diff_cells):
+    """Returns contiguous column ranges (e.g. 'C2:C9') of the cells coloured for difference cells coordinates. Source and
+    target cells of each difference are coloured (see _formatExcelCellColor()) and consecutive rows of a column are merged"""
+
+    cells = np.array(list(diff_cells), dtype='int64').reshape(-1, 2)
+    if len(cells) == 0:
+        return []
+    rows = np.concatenate([cells[:, 0] + 1, cells[:, 0] + 2])
+    cols = np.concatenate([cells[:, 1] + 1, cells[:, 1] + 1])
+    order = np.lexsort((rows, cols))
+    rows, cols = rows[order], cols[order]
+
+    # a range starts where column changes or rows are not consecutive, repeated cells are skipped
+    new = np.ones(len(rows), dtype=bool)
+    new[1:] = (cols[1:] != cols[:-1]) | (rows[1:] != rows[:-1])
+    rows, cols = rows[new], cols[new]
+    start = np.ones(len(rows), dtype=bool)
+    start[1:] = (cols[1:] != cols[:-1]) | (rows[1:] != rows[:-1] + 1)
+    starts = np.nonzero(start)[0]
+    ends = np.append(starts[1:], len(rows)) - 1
+
+    ranges = []
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        letter = openpyxl.utils.get_column_letter(int(cols[s]))
+        ranges.append(f'{letter}{rows[s]}:{letter}{rows[e]}')
+    return ranges
@@ -1,5 +1,5 @@
 import FW.Initialize.initialize_global_variables as iniVar
-import configparser, os, io, time, base64
+import configparser, os, io, time, base64, threading, atexit, contextlib
 import pandas as pd
 import psycopg2, tempfile, shutil
 from psycopg2.extras import execute_batch
@@ -7,6 +7,29 @@ from FW.FW_logger import loggerPass, loggerFail, loggerInfo, get_from_reporting_
 import cx_Oracle, pyodbc
 import FW.Compare_Report.compare_report as cp
 
+# Methods of reading PostgreSQL query results, 'copy' streams COPY ... TO STDOUT output as csv
+fetch_methods = ['fetch', 'copy', 'arrow']
+
+# Process wide pool of idle connections per .ini file and section, see _get_pooled_connection(). At most
+# connection_pool_max_idle idle connections are kept for a database, 0 disables pooling.
+connection_pool = {}
+connection_pool_max_idle = 4
+# At most connection_pool_max_size connections of a database are checked out at a time, None removes the limit. Thread
+# needing one more waits till one is given back, at most connection_pool_timeout seconds.
+connection_pool_max_size = 8
+connection_pool_timeout = 600
+connection_pool_lock = threading.Lock()
+# Semaphore per pool key limiting checked out connections, and semaphore and modification time of .ini file of each
+# checked out connection (by id)
+connection_pool_slots = {}
+connection_pool_checked_out = {}
+# Parsed .ini files with their modification time, see _read_config()
+config_cache = {}
+# Query to check if an idle connection is still usable
+health_check_sql = {'OracleDB': "SELECT 1 FROM DUAL", 'DB2_DB': "SELECT 1 FROM SYSIBM.SYSDUMMY1"}
+# Query resetting session settings (SET ...) of a connection given back to pool, see _release_connection()
+session_reset_sql = {'PostgreDB': "RESET ALL", 'RedshiftDB': "RESET ALL"}
+
 def read_salesforce_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False,  save_csv_suffix = "data_dump"):
     """Executes Salesforce Object Query Language (SOQL) query on Salesforce server db and returns resulted in tabular data frame for the query
 
@@ -27,9 +50,7 @@ def read_salesforce_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv
     from simple_salesforce import Salesforce
 
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
     domain = config['SALESFORCE_DB']['Domain']
     username = config['SALESFORCE_DB']['User']
@@ -82,9 +103,7 @@ def read_salesforce_db_schema(configfile, table_name, schema_columns_list=['name
 
     loggerInfo("Creating Salesforce connection")
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
     domain = config['SALESFORCE_DB']['Domain']
     username = config['SALESFORCE_DB']['User']
@@ -106,7 +125,7 @@ def read_salesforce_db_schema(configfile, table_name, schema_columns_list=['name
     return df_schema
 
 
-def read_Hive_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False, save_csv_suffix="data_dump"):
+def read_Hive_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False, save_csv_suffix="data_dump", fetch_method='fetch'):
     """Executes SQL query on AWS hive db and returs resulted tabular data frame for the query
 
     Parameters
@@ -117,6 +136,10 @@ def read_Hive_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False
         'Select' sql query to execute.
     flag_reduce_df_size: boolean, default True
         If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+    fetch_method : 'fetch' or 'arrow', default 'fetch'
+        If 'arrow', rows are fetched into pyarrow tables column by column and an arrow backed dataframe is returned, so no
+        frame of python objects is made. Nulls of text columns are '(null)', nulls of other columns are kept as nulls.
+        Requires pyarrow and pandas 1.5 or later.
     save_csv : bool, default False
         Flag to indicate if resultant data frame to be stored in the form of .csv file in report folder.
     save_csv_suffix : string, default ""
@@ -131,37 +154,32 @@ def read_Hive_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False
     DSN = AWS_DATA_KNIGHTS
     autocommit = True
     """
-    # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
-    DSN = config['HiveDB']['DSN']
-    autocommit = config['HiveDB']['autocommit']
-
+    _check_fetch_method(fetch_method, 'Hive')
     loggerInfo(f"Executing below SQL query on db :'Hive Db'")
     loggerInfo(f"SQL Query: '{sql}'")
     print("SQL Query execution in progress...")
 
     # execute query against postgre db
-    # pyodbc.autocommit = False
-    cnxn = pyodbc.connect(f"DSN={DSN}", autocommit=autocommit)
-    cursor = cnxn.cursor()
-
-    chunk_list = []
-    dfs = pd.read_sql(sql, cnxn, coerce_float=False, chunksize=8000)
-    for df_ch in dfs:
-        chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
-        # df = pd.concat(chunk_list)
-    # ==========================
-    try:
-        df = pd.concat(chunk_list)  # give error if sql not return anything
-    except:
-        df = pd.read_sql(sql, cnxn, coerce_float=False)  # will execute if df is empty.
-    # ==========================
+    with _pooled_connection(configfile, 'HiveDB') as cnxn:
+        cursor = cnxn.cursor()
 
-    cnxn.close()
+        if fetch_method == 'arrow':
+            df = _read_arrow_df(cnxn, sql, 8000)
+        else:
+            chunk_list = []
+            dfs = pd.read_sql(sql, cnxn, coerce_float=False, chunksize=8000)
+            for df_ch in dfs:
+                chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
+                # df = pd.concat(chunk_list)
+            # ==========================
+            try:
+                df = pd.concat(chunk_list)  # give error if sql not return anything
+            except:
+                df = pd.read_sql(sql, cnxn, coerce_float=False)  # will execute if df is empty.
+            # ==========================
     loggerPass('SQL Query Executed successfully')
-    df.replace([None], '(null)', inplace=True)
+    if fetch_method != 'arrow':
+        df.replace([None], '(null)', inplace=True)
 
     # reduce size of dataframe
     df = cp._changeDataToCatagory(df, flag_reduce_df_size)
@@ -174,7 +192,7 @@ def read_Hive_db_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False
 
     return df
 
-def read_DB2_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump", flag_reduce_df_size=True):
+def read_DB2_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump", flag_reduce_df_size=True, fetch_method='fetch'):
     """Executes SQL query on DB2 database and returs resulted tabular data frame for the query
 
         Parameters
@@ -185,6 +203,10 @@ def read_DB2_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump",
             'Select' sql query to execute.
         flag_reduce_df_size: boolean, default True
             If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+        fetch_method : 'fetch' or 'arrow', default 'fetch'
+            If 'arrow', rows are fetched into pyarrow tables column by column and an arrow backed dataframe is returned, so no
+            frame of python objects is made. Nulls of text columns are '(null)', nulls of other columns are kept as nulls.
+            Requires pyarrow and pandas 1.5 or later.
         save_csv : bool, default False
             Flag to indicate if resultant data frame to be stored in the form of .csv file in report folder.
         save_csv_suffix : string, default ""
@@ -200,37 +222,35 @@ def read_DB2_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump",
         Password = SIjmFudXMjE=
         DSN = D2XU
         """
+    _check_fetch_method(fetch_method, 'DB2')
 
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
     user = config['DB2_DB']['User']
-    password = config['DB2_DB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    DSN = config['DB2_DB']['DSN']
 
     loggerInfo(f"Executing below Target SQL query on db :'DB2' using id: '{user}'")
     loggerInfo(f"SQL Query: '{sql}'")
 
-    conn = pyodbc.connect(DSN=DSN, UID=user, PWD=password)
-
-    loggerInfo('DB2 SQL Query Execution is in progress. It will take some time....')
+    with _pooled_connection(configfile, 'DB2_DB') as conn:
+        loggerInfo('DB2 SQL Query Execution is in progress. It will take some time....')
 
-    chunk_list = []
-
-    dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=15000)
-    for df_ch in dfs:
-        chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
-    # df = pd.concat(chunk_list)
-    # ==========================
-    try:
-        df = pd.concat(chunk_list)  # give error if sql not return anything
-    except:
-        df = pd.read_sql(sql, conn, coerce_float=False)  # will execute if df is empty.
-    # ==========================
-    conn.close()
-
-    df.replace([None], '(null)', inplace=True)
+        if fetch_method == 'arrow':
+            df = _read_arrow_df(conn, sql, 15000)
+        else:
+            chunk_list = []
+
+            dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=15000)
+            for df_ch in dfs:
+                chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
+            # df = pd.concat(chunk_list)
+            # ==========================
+            try:
+                df = pd.concat(chunk_list)  # give error if sql not return anything
+            except:
+                df = pd.read_sql(sql, conn, coerce_float=False)  # will execute if df is empty.
+            # ==========================
+
+    if fetch_method != 'arrow':
+        df.replace([None], '(null)', inplace=True)
 
     # reduce size of dataframe
     df = cp._changeDataToCatagory(df, flag_reduce_df_size)
@@ -245,7 +265,8 @@ def read_DB2_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump",
 
     return df
 
-def read_PostgreSQL_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump", flag_reduce_df_size=True):
+def read_PostgreSQL_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump", flag_reduce_df_size=True, chunksize=None,
+                          fetch_method='fetch', partition_by=None):
     """Executes SQL query on PostgreDB and returs resulted tabular data frame for SQL query.
 
     Parameters
@@ -260,49 +281,66 @@ def read_PostgreSQL_to_df(configfile, sql, save_csv=False, save_csv_suffix="data
         If save_csv argument = True, then save_csv_suffix will append to the name of csv file saved for query result
     flag_reduce_df_size: boolean, default True
             If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+    chunksize : int, default None
+        If given, query is read with server side (named) cursor fetching chunksize rows at a time and a generator of
+        dataframe chunks is returned, so the whole result is never held in memory. Chunks can be passed to compare()
+        with engine='out_of_core' or concatenated with pd.concat(). If save_csv is True, chunks are written to csv file as
+        they are read. Size of chunks is not reduced by flag_reduce_df_size. Fetched chunks have object columns, so
+        dtypes do not change from chunk to chunk, conversion of dtypes is left to caller.
+    fetch_method : 'fetch', 'copy' or 'arrow', default 'fetch'
+        If 'copy', query result is streamed with COPY ... TO STDOUT as csv and read as strings, nulls as '(null)'. It is
+        several times faster than fetching rows for wide text heavy results. Values are text as formatted by database.
+        If 'arrow', rows are fetched into pyarrow tables column by column and an arrow backed dataframe is returned, so no
+        frame of python objects is made. Nulls of text columns are '(null)', nulls of other columns are kept as nulls.
+        Requires pyarrow and pandas 1.5 or later.
+    partition_by : tuple (column, n_partitions), default None
+        If given, query is split in n_partitions queries on hash of column values, which are run in parallel each on its
+        own connection, and results are concatenated. Row count of result is verified with COUNT(*) of query, run before
+        and after the partitions. Column should have many distinct values for partitions to be of similar size. At most
+        connection_pool_max_size partitions run at a time.
 
     returns
     -------
-    DataFrame : Sql query tabular data in the form of pandas dataframe
+    DataFrame : Sql query tabular data in the form of pandas dataframe, or generator of dataframe chunks if chunksize is given
     """
-    # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    _check_fetch_method(fetch_method, 'PostgreSQL')
+    if partition_by != None:
+        if chunksize != None:
+            raise Exception("chunksize and partition_by can not be used together")
+        return _read_partitioned_to_df('postgres', configfile, sql, partition_by, fetch_method, save_csv, save_csv_suffix,
+                                       flag_reduce_df_size)
+    if chunksize != None:
+        return _read_PostgreSQL_in_chunks(configfile, sql, chunksize, save_csv, save_csv_suffix, fetch_method=fetch_method)
 
+    # Read from config file
+    path_config = _get_config_path(configfile)
+    config = _read_config(configfile)
     user = config['PostgreDB']['User']
-    password = config['PostgreDB']['Password']  # 'encrypted'
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['PostgreDB']['Host']
-    port = config['PostgreDB']['Port']
     database = config['PostgreDB']['Database']
 
-    conn = psycopg2.connect(user=user, password=password, host=host, port=port, database=database)
+    with _pooled_connection(configfile, 'PostgreDB') as conn:
+        loggerInfo(f"Executing below SQL query on db :'{database}' using id: '{user}'")
+        loggerInfo(f"SQL Query: '{sql}'")
+        print("SQL Query execution in progress...")
 
-    loggerInfo(f"Executing below SQL query on db :'{database}' using id: '{user}'")
-    loggerInfo(f"SQL Query: '{sql}'")
-    print("SQL Query execution in progress...")
-
-    # capture pid
-    pid = conn.get_backend_pid()
-    print(f"db connection pid = {pid}")
-    with open(r"c:\pyetl\pid.txt", "w") as f:
-        f.write(f"{pid}|{path_config}")
+        # capture pid
+        pid = conn.get_backend_pid()
+        print(f"db connection pid = {pid}")
+        with open(r"c:\pyetl\pid.txt", "w") as f:
+            f.write(f"{pid}|{path_config}")
 
-    with conn.cursor() as cur:
-        sTime = time.time()
-        cur.execute(sql)
-        d = cur.fetchall()
-        if len(d) == 0:
-            df = pd.DataFrame(columns=[desc[0] for desc in cur.description])
-        else:
-            df = pd.DataFrame(d).convert_dtypes(infer_objects=False).T.T  # .astype(str)
-            df.columns = [desc[0] for desc in cur.description]
-        df.replace([None], '(null)', inplace=True)
-        df.replace('<NA>', '(null)', inplace=True)
-
-        loggerPass(f'SQL Query Executed successfully in {round(time.time() - sTime, 4)} sec')
-        df = cp._changeDataToCatagory(df, flag_reduce_df_size)
+        with conn.cursor() as cur:
+            sTime = time.time()
+            if fetch_method == 'copy':
+                df = pd.concat(_read_PostgreSQL_copy_chunks(conn, sql, null_value='(null)'), ignore_index=True)
+            elif fetch_method == 'arrow':
+                df = _read_arrow_df(conn, sql, 100000)
+            else:
+                cur.execute(sql)
+                df = _get_rows_df(cur.fetchall(), [desc[0] for desc in cur.description])
+
+            loggerPass(f'SQL Query Executed successfully in {round(time.time() - sTime, 4)} sec')
+            df = cp._changeDataToCatagory(df, flag_reduce_df_size)
 
     if save_csv == True:
         tN = get_from_reporting_dict('testName')
@@ -312,7 +350,142 @@ def read_PostgreSQL_to_df(configfile, sql, save_csv=False, save_csv_suffix="data
 
     return df
 
-def read_Redshift_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump", flag_reduce_df_size=True):
+def _get_rows_df(rows, columns):
+    """Returns dataframe of rows fetched from database, with nulls as '(null)'"""
+    if len(rows) == 0:
+        df = pd.DataFrame(columns=columns)
+    else:
+        df = pd.DataFrame(rows).convert_dtypes(infer_objects=False).T.T  # .astype(str)
+        df.columns = columns
+    df.replace([None], '(null)', inplace=True)
+    df.replace('<NA>', '(null)', inplace=True)
+    return df
+
+def _read_PostgreSQL_in_chunks(configfile, sql, chunksize, save_csv=False, save_csv_suffix="data_dump", query_type="",
+                              fetch_method='fetch'):
+    """Returns generator of dataframe chunks of SQL query result on PostgreDB, read with server side (named) cursor
+    fetching chunksize rows at a time, or with COPY (see _read_PostgreSQL_copy_chunks()) if fetch_method is 'copy'.
+    Chunks are arrow backed if fetch_method is 'arrow'.
+
+    Connection is checked out and its pid is captured at the call, query is executed when first chunk is requested.
+    Connection is given back to connection pool when generator is exhausted. If generator is closed before, or reading
+    fails, connection is closed, as also when a generator never iterated is garbage collected. An empty result gives one
+    empty chunk having the columns of query."""
+    config = _read_config(configfile)
+    path_config = _get_config_path(configfile)
+    conn = _get_pooled_connection(configfile, 'PostgreDB')
+    try:
+        loggerInfo(f"Executing below {query_type}SQL query on db :'{config['PostgreDB']['Database']}' using id: '{config['PostgreDB']['User']}' in chunks of {chunksize} rows")
+        loggerInfo(f"SQL Query: '{sql}'")
+
+        # capture pid
+        pid = conn.get_backend_pid()
+        print(f"db connection pid = {pid}")
+        with open(r"c:\pyetl\pid.txt", "w") as f:
+            f.write(f"{pid}|{path_config}")
+
+        csv_path = None
+        if save_csv == True:
+            tN = get_from_reporting_dict('testName')
+            csv_path = os.path.join(iniVar.current_project_path, "Reports", tN + "_" + save_csv_suffix + ".csv")
+    except BaseException:
+        _discard_connection(conn)
+        raise
+    return _iter_PostgreSQL_chunks(conn, configfile, sql, chunksize, csv_path, query_type, fetch_method)
+
+def _iter_PostgreSQL_chunks(conn, configfile, sql, chunksize, csv_path=None, query_type="", fetch_method='fetch'):
+    """Generator of _read_PostgreSQL_in_chunks(), reads chunks on checked out connection conn and gives it back to
+    connection pool at the end (see _pooled_connection()). Chunks are written to csv_path if given."""
+    with _pooled_connection(configfile, 'PostgreDB', conn=conn):
+        sTime, n_rows, first = time.time(), 0, True
+        if fetch_method == 'copy':
+            chunks = _read_PostgreSQL_copy_chunks(conn, sql, chunksize, null_value='(null)')
+        else:
+            chunks = _fetch_PostgreSQL_chunks(conn, sql, chunksize, arrow=fetch_method == 'arrow')
+        # chunks generator is closed first, so COPY is stopped before connection is closed
+        with contextlib.closing(chunks):
+            for df in chunks:
+                if csv_path != None:
+                    df.to_csv(csv_path, index=False, mode='w' if first else 'a', header=first)
+                n_rows, first = n_rows + len(df), False
+                yield df
+
+        loggerPass(f'{query_type}SQL Query Executed successfully, {n_rows} rows read in chunks in {round(time.time() - sTime, 4)} sec')
+        if csv_path != None:
+            loggerPass(f"{query_type}SQL query result written to '{csv_path}' successfully")
+
+def _fetch_PostgreSQL_chunks(conn, sql, chunksize, arrow=False):
+    """Generator of dataframe chunks of SQL query result fetched with server side (named) cursor, chunksize rows at a time.
+    Columns of chunks are of object dtype, so dtypes are same in all chunks whatever the values of a chunk, nulls are
+    '(null)'. If arrow is True, chunks are arrow backed dataframes (see _read_arrow_df()), type of a column is inferred
+    from values of the chunk."""
+    with conn.cursor(name='pyetl_chunks') as cur:
+        cur.itersize = chunksize
+        cur.execute(sql)
+        first = True
+        while True:
+            rows = cur.fetchmany(chunksize)
+            if len(rows) == 0 and first == False:
+                break
+            first = False
+            columns = [desc[0] for desc in cur.description]
+            if arrow == True:
+                yield _get_arrow_df([_get_arrow_table(rows, columns)])
+            else:
+                yield _get_rows_df(rows, columns).astype(object)
+            if len(rows) < chunksize:
+                break
+
+def _read_PostgreSQL_copy_chunks(conn, sql, chunksize=100000, null_value=None):
+    """Generator of dataframe chunks of SQL query result read with COPY ... TO STDOUT. COPY output is written in a pipe by
+    a thread and read by chunked pd.read_csv as strings, with nulls written by db as '(null)' and read back as NA, or as
+    null_value if given ('(null)' for readers, same as fetched rows). So values are not adapted to python objects by
+    psycopg2, and no temporary file is written. An empty result gives one empty chunk having the columns of query.
+
+    If generator is closed before the end, or reading fails, pipe is closed and COPY still running is cancelled with
+    conn.cancel(). Connection is then in middle of COPY and is to be closed by caller, not given back to pool (as done by
+    _pooled_connection() when exception goes through it)."""
+    copy_sql = f"COPY ({sql}) TO STDOUT WITH CSV HEADER NULL '(null)'"
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def write_copy_output():
+        try:
+            with os.fdopen(write_fd, 'wb') as f, conn.cursor() as cur:
+                cur.copy_expert(copy_sql, f)
+        except Exception as e:
+            errors.append(e)
+
+    def stop_writer(timeout):
+        # writer stops at its next write to closed pipe, COPY still running on server is cancelled. Returns True if
+        # writer was stopped, i.e. it had not ended by itself within timeout
+        writer.join(timeout)
+        stopped = writer.is_alive()
+        if stopped:
+            conn.cancel()
+        writer.join()
+        return stopped
+
+    writer = threading.Thread(target=write_copy_output, daemon=True)
+    writer.start()
+    try:
+        with os.fdopen(read_fd, 'rb') as f:
+            for df in pd.read_csv(f, chunksize=chunksize, dtype=str, keep_default_na=False, na_values=['(null)']):
+                yield df.fillna(null_value) if null_value != None else df
+    except Exception:
+        # error of COPY, e.g. in sql, ends the csv output and is the cause of csv error
+        if stop_writer(1) == False and len(errors) > 0:
+            raise errors[0]
+        raise
+    except BaseException:
+        # GeneratorExit of generator closed early
+        stop_writer(0)
+        raise
+    writer.join()
+    if len(errors) > 0:
+        raise errors[0]
+
+def read_Redshift_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_dump", flag_reduce_df_size=True, fetch_method='fetch'):
     """Executes SQL query on RedshiftDB and returns resulted tabular data frame for source query.
 
     Parameters
@@ -327,43 +500,49 @@ def read_Redshift_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_d
         If save_csv argument = True, then save_csv_suffix will append to the name of csv file saved for query result
     flag_reduce_df_size: boolean, default True
         If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+    fetch_method : 'fetch', 'copy' or 'arrow', default 'fetch'
+        Redshift does not support COPY ... TO STDOUT, so for 'copy' rows are fetched. 'copy' is accepted for the same calls
+        to work on PostgreSQL and Redshift.
+        If 'arrow', rows are fetched into pyarrow tables column by column and an arrow backed dataframe is returned, so no
+        frame of python objects is made. Nulls of text columns are '(null)', nulls of other columns are kept as nulls.
+        Requires pyarrow and pandas 1.5 or later.
 
     returns
     -------
     DataFrame : Sql query tabular data in the form of pandas dataframe
     """
+    _check_fetch_method(fetch_method, 'Redshift')
+    if fetch_method == 'copy':
+        loggerInfo("COPY TO STDOUT is not supported by Redshift, query result will be fetched instead")
+
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
     user = config['RedshiftDB']['User']
-    password = config['RedshiftDB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['RedshiftDB']['Host']
-    port = config['RedshiftDB']['Port']
     database = config['RedshiftDB']['Database']
 
     loggerInfo(f"Executing below Source SQL query on db :'{database}' using id: '{user}'")
     loggerInfo(f"SQL Query: '{sql}'")
     print("SQL Query execution in progress...")
     # Create connection
-    conn = psycopg2.connect(user=user, password=password, host=host, port=port, database=database)
-
-    chunk_list = []
-    dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=8000)
-    for df_ch in dfs:
-        chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
-    #df = pd.concat(chunk_list)
-    # ==========================
-    try:
-        df = pd.concat(chunk_list)  # give error if sql not return anything
-    except:
-        df = pd.read_sql(sql, conn, coerce_float=False)  # will execute if df is empty.
-    # ==========================
-    conn.close()
+    with _pooled_connection(configfile, 'RedshiftDB') as conn:
+        if fetch_method == 'arrow':
+            df = _read_arrow_df(conn, sql, 8000)
+        else:
+            chunk_list = []
+            dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=8000)
+            for df_ch in dfs:
+                chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
+            #df = pd.concat(chunk_list)
+            # ==========================
+            try:
+                df = pd.concat(chunk_list)  # give error if sql not return anything
+            except:
+                df = pd.read_sql(sql, conn, coerce_float=False)  # will execute if df is empty.
+            # ==========================
     loggerPass('Target SQL Query Executed successfully')
-    df.replace([None], '(null)', inplace=True)
+    if fetch_method != 'arrow':
+        df.replace([None], '(null)', inplace=True)
     # reduce size of dataframe
     df = cp._changeDataToCatagory(df, flag_reduce_df_size)
 
@@ -375,7 +554,7 @@ def read_Redshift_to_df(configfile, sql, save_csv=False, save_csv_suffix="data_d
 
     return df
 
-def read_PostgreSQL_to_df_Source(configfile,sql, save_csv = False, save_csv_suffix = "src", flag_reduce_df_size=True):
+def read_PostgreSQL_to_df_Source(configfile,sql, save_csv = False, save_csv_suffix = "src", flag_reduce_df_size=True, chunksize=None):
     """Warning - Instead of this function, start using read_PostgreSQL_to_df()
 
     Executes SQL query on PostgreDB and returs resulted tabular data frame for source query.
@@ -392,49 +571,43 @@ def read_PostgreSQL_to_df_Source(configfile,sql, save_csv = False, save_csv_suff
         If save_csv argument = True, then save_csv_suffix will append to the name of csv file saved for query result
     flag_reduce_df_size: boolean, default True
             If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+    chunksize : int, default None
+        If given, query is read with server side (named) cursor fetching chunksize rows at a time and a generator of
+        dataframe chunks is returned, so the whole result is never held in memory. Chunks can be passed to compare()
+        with engine='out_of_core' or concatenated with pd.concat(). If save_csv is True, chunks are written to csv file as
+        they are read. Size of chunks is not reduced by flag_reduce_df_size.
 
     returns
     -------
-    DataFrame : Sql query tabular data in the form of pandas dataframe
+    DataFrame : Sql query tabular data in the form of pandas dataframe, or generator of dataframe chunks if chunksize is given
     """
+    if chunksize != None:
+        return _read_PostgreSQL_in_chunks(configfile, sql, chunksize, save_csv, save_csv_suffix, "Source ")
+
     #Read from config file
-    path_config  = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)  
-    
+    path_config = _get_config_path(configfile)
+    config = _read_config(configfile)
     user = config['PostgreDB']['User']
-    password = config['PostgreDB']['Password']  #'encrypted'
-    password = base64.b64decode(password).decode('utf-8')  #'decrypted'
-    host = config['PostgreDB']['Host']
-    port = config['PostgreDB']['Port']
     database = config['PostgreDB']['Database']
 
-    conn = psycopg2.connect(user=user, password=password, host=host, port=port, database=database)
+    with _pooled_connection(configfile, 'PostgreDB') as conn:
+        loggerInfo(f"Executing below Source SQL query on db :'{database}' using id: '{user}'")
+        loggerInfo(f"SQL Query: '{sql}'")
+        print("SQL Query execution in progress...")
 
-    loggerInfo(f"Executing below Source SQL query on db :'{database}' using id: '{user}'")
-    loggerInfo(f"SQL Query: '{sql}'")
-    print("SQL Query execution in progress...")
+        # capture pid
+        pid = conn.get_backend_pid()
+        print(f"db connection pid = {pid}")
+        with open(r"c:\pyetl\pid.txt", "w") as f:
+            f.write(f"{pid}|{path_config}")
 
-    # capture pid
-    pid = conn.get_backend_pid()
-    print(f"db connection pid = {pid}")
-    with open(r"c:\pyetl\pid.txt", "w") as f:
-        f.write(f"{pid}|{path_config}")
-
-    with conn.cursor() as cur:
-        sTime = time.time()
-        cur.execute(sql)
-        d = cur.fetchall()
-        if len(d) == 0:
-            df = pd.DataFrame(columns=[desc[0] for desc in cur.description])
-        else:
-            df = pd.DataFrame(d).convert_dtypes(infer_objects=False).T.T  # .astype(str)
-            df.columns = [desc[0] for desc in cur.description]
-        df.replace([None], '(null)', inplace=True)
-        df.replace('<NA>', '(null)', inplace=True)
+        with conn.cursor() as cur:
+            sTime = time.time()
+            cur.execute(sql)
+            df = _get_rows_df(cur.fetchall(), [desc[0] for desc in cur.description])
 
-        loggerPass(f'Source SQL Query Executed successfully in {round(time.time() - sTime, 4)} sec')
-        df = cp._changeDataToCatagory(df, flag_reduce_df_size)
+            loggerPass(f'Source SQL Query Executed successfully in {round(time.time() - sTime, 4)} sec')
+            df = cp._changeDataToCatagory(df, flag_reduce_df_size)
 
     if save_csv ==True:
         tN = get_from_reporting_dict('testName')
@@ -444,7 +617,7 @@ def read_PostgreSQL_to_df_Source(configfile,sql, save_csv = False, save_csv_suff
 
     return df
 
-def read_PostgreSQL_to_df_Target(configfile,sql, save_csv = False, save_csv_suffix = "trg", flag_reduce_df_size = True):
+def read_PostgreSQL_to_df_Target(configfile,sql, save_csv = False, save_csv_suffix = "trg", flag_reduce_df_size = True, chunksize=None):
     """Warning - Instead of this function, start using read_PostgreSQL_to_df()
 
         Executes SQL query on PostgreDB and returs resulted tabular data frame for target query
@@ -461,50 +634,45 @@ def read_PostgreSQL_to_df_Target(configfile,sql, save_csv = False, save_csv_suff
             If save_csv argument = True, then save_csv_suffix will append to the name of csv file saved for query result
         flag_reduce_df_size: boolean, default True
             If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 30000
+        chunksize : int, default None
+            If given, query is read with server side (named) cursor fetching chunksize rows at a time and a generator of
+            dataframe chunks is returned, so the whole result is never held in memory. Chunks can be passed to compare()
+            with engine='out_of_core' or concatenated with pd.concat(). If save_csv is True, chunks are written to csv file as
+            they are read. Size of chunks is not reduced by flag_reduce_df_size.
 
         return
         ---------
          DataFrame
-            Sql query tabular data in the form of pandas dataframe
+            Sql query tabular data in the form of pandas dataframe, or generator of dataframe chunks if chunksize is given
         """
+    if chunksize != None:
+        return _read_PostgreSQL_in_chunks(configfile, sql, chunksize, save_csv, save_csv_suffix, "Target ")
+
     #Read from config file
-    path_config  = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)  
+    path_config = _get_config_path(configfile)
+    config = _read_config(configfile)
     user = config['PostgreDB']['User']
-    password = config['PostgreDB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['PostgreDB']['Host']
-    port = config['PostgreDB']['Port']
     database = config['PostgreDB']['Database']
 
-    conn = psycopg2.connect(user=user, password=password, host=host, port=port, database=database)
+    with _pooled_connection(configfile, 'PostgreDB') as conn:
+        loggerInfo(f"Executing below Target SQL query on db :'{database}' using id: '{user}'")
+        loggerInfo(f"SQL Query: '{sql}'")
+        print("SQL Query execution in progress...")
 
-    loggerInfo(f"Executing below Target SQL query on db :'{database}' using id: '{user}'")
-    loggerInfo(f"SQL Query: '{sql}'")
-    print("SQL Query execution in progress...")
-
-    #capture pid
-    pid = conn.get_backend_pid()
-    print(f"db connection pid = {pid}")
-    with open(r"c:\pyetl\pid.txt", "w") as f:
-        f.write(f"{pid}|{path_config}")
+        #capture pid
+        pid = conn.get_backend_pid()
+        print(f"db connection pid = {pid}")
+        with open(r"c:\pyetl\pid.txt", "w") as f:
+            f.write(f"{pid}|{path_config}")
 
-    with conn.cursor() as cur:
-        sTime = time.time()
-        cur.execute(sql)
+        with conn.cursor() as cur:
+            sTime = time.time()
+            cur.execute(sql)
 
-        d = cur.fetchall()
-        if len(d) == 0:
-            df = pd.DataFrame(columns=[desc[0] for desc in cur.description])
-        else:
-            df = pd.DataFrame(d).convert_dtypes(infer_objects=False).T.T  # .astype(str)
-            df.columns = [desc[0] for desc in cur.description]
-        df.replace([None], '(null)', inplace=True)
-        df.replace('<NA>', '(null)', inplace=True)
+            df = _get_rows_df(cur.fetchall(), [desc[0] for desc in cur.description])
 
-        loggerPass(f'Source SQL Query Executed successfully in {round(time.time() - sTime, 4)} sec')
-        df = cp._changeDataToCatagory(df, flag_reduce_df_size)
+            loggerPass(f'Source SQL Query Executed successfully in {round(time.time() - sTime, 4)} sec')
+            df = cp._changeDataToCatagory(df, flag_reduce_df_size)
 
     # # Decrypt the password
     # #decoded_data = base64.b64decode(password)
@@ -547,7 +715,8 @@ def read_PostgreSQL_to_df_Target(configfile,sql, save_csv = False, save_csv_suff
 
     return df  
 
-def read_MSSQL_DB_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False,  save_csv_suffix = "data_dump"):
+def read_MSSQL_DB_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=False,  save_csv_suffix = "data_dump", fetch_method='fetch',
+                        partition_by=None):
     """Executes SQL query on MS SQL server db and returs resulted tabular data frame for the query
 
     Parameters
@@ -558,30 +727,33 @@ def read_MSSQL_DB_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=Fals
         'Select' sql query to execute.
     flag_reduce_df_size: boolean, default True
         If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+    fetch_method : 'fetch' or 'arrow', default 'fetch'
+        If 'arrow', rows are fetched into pyarrow tables column by column and an arrow backed dataframe is returned, so no
+        frame of python objects is made. Nulls of text columns are '(null)', nulls of other columns are kept as nulls.
+        Requires pyarrow and pandas 1.5 or later.
+    partition_by : tuple (column, n_partitions), default None
+        If given, query is split in n_partitions queries on hash of column values, which are run in parallel each on its
+        own connection, and results are concatenated. Row count of result is verified with COUNT(*) of query, run before
+        and after the partitions. Column should have many distinct values for partitions to be of similar size. At most
+        connection_pool_max_size partitions run at a time.
 
     returns
     ---------
     DataFrame : Sql query tabular data in the form of pandas dataframe
 
     """
+    _check_fetch_method(fetch_method, 'MSSQL')
+    if partition_by != None:
+        return _read_partitioned_to_df('mssql', configfile, sql, partition_by, fetch_method, save_csv, save_csv_suffix,
+                                       flag_reduce_df_size)
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
-    server = config['MSSQL_DB']['Server']
     database = config['MSSQL_DB']['Database']
-    trusted_connection = config['MSSQL_DB']['Trusted_Connection']
-    # Connection string
     if (config.has_option('MSSQL_DB', 'Trusted_Connection') == False) or (
             config['MSSQL_DB']['Trusted_Connection'] == 'No'):
-        user = config['MSSQL_DB']['User']
-        password = config['MSSQL_DB']['Password']
-        password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-        conn_str = 'Driver={SQL Server};Server=' + server + ';Database=' + database + ';uid=' + user + ';pwd=' + password
-        loggerInfo(f"Loading the dataset to db :'{database}' using id: '{user}'")
+        loggerInfo(f"Loading the dataset to db :'{database}' using id: '{config['MSSQL_DB']['User']}'")
     else:
-        conn_str = f"""Driver={{SQL Server}};Server={server};Database={database};Trusted_Connection={trusted_connection};"""
         loggerInfo(f"Loading the dataset to db :'{database}'")
 
     loggerInfo(f"Executing below SQL query on db :'{database}' ")
@@ -589,24 +761,12 @@ def read_MSSQL_DB_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=Fals
     print("SQL Query execution in progress...")
 
     # execute query against postgre db
-    #conn_str = f"""Driver={{SQL Server}};Server={server};Database={database};Trusted_Connection={trusted_connection};"""
-    conn = pyodbc.connect(conn_str)
-
-    chunk_list = []
-    dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=8000)
-    for df_ch in dfs:
-        chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
-    #df = pd.concat(chunk_list)
-    # ==========================
-    try:
-        df = pd.concat(chunk_list)  # give error if sql not return anything
-    except:
-        df = pd.read_sql(sql, conn, coerce_float=False)  # will execute if df is empty.
-    # ==========================
-
-    conn.close()
+    with _pooled_connection(configfile, 'MSSQL_DB') as conn:
+        if fetch_method == 'arrow':
+            df = _read_arrow_df(conn, sql, 8000)
+        else:
+            df = _read_MSSQL_df(conn, sql)
     loggerPass('Target SQL Query Executed successfully')
-    df.replace([None], '(null)', inplace=True)
 
     # reduce size of dataframe
     df = cp._changeDataToCatagory(df, flag_reduce_df_size)
@@ -619,7 +779,8 @@ def read_MSSQL_DB_to_df(configfile, sql, flag_reduce_df_size=True, save_csv=Fals
 
     return df
 
-def read_Oracle_to_df(configfile, sql, save_csv=False,  save_csv_suffix = "data_dump", flag_reduce_df_size=True, encoding=None):
+def read_Oracle_to_df(configfile, sql, save_csv=False,  save_csv_suffix = "data_dump", flag_reduce_df_size=True, encoding=None, fetch_method='fetch',
+                      partition_by=None):
     """Executes SQL query on PostgreDB and returs resulted tabular data frame for source query.
 
     Parameters
@@ -634,73 +795,724 @@ def read_Oracle_to_df(configfile, sql, save_csv=False,  save_csv_suffix = "data_
         If save_csv argument = True, then save_csv_suffix will append to the name of csv file saved for query result
     flag_reduce_df_size: boolean, default True
         If false, then dataframe size will not be reduced. This will take more RAM in client machine but will be faster. By default it is on if row count in dataset > 50000
+    fetch_method : 'fetch' or 'arrow', default 'fetch'
+        If 'arrow', rows are fetched into pyarrow tables column by column and an arrow backed dataframe is returned, so no
+        frame of python objects is made. Nulls of text columns are '(null)', nulls of other columns are kept as nulls.
+        Requires pyarrow and pandas 1.5 or later.
+    partition_by : tuple (column, n_partitions), default None
+        If given, query is split in n_partitions queries on hash of column values, which are run in parallel each on its
+        own connection, and results are concatenated. Row count of result is verified with COUNT(*) of query, run before
+        and after the partitions. Column should have many distinct values for partitions to be of similar size. At most
+        connection_pool_max_size partitions run at a time.
 
     returns
     -------
     DataFrame : Sql query tabular data in the form of pandas dataframe
     """
+    _check_fetch_method(fetch_method, 'Oracle')
+    if partition_by != None:
+        return _read_partitioned_to_df('oracle', configfile, sql, partition_by, fetch_method, save_csv, save_csv_suffix,
+                                       flag_reduce_df_size, encoding)
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
     user = config['OracleDB']['User']
-    password = config['OracleDB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['OracleDB']['Host']
-    port = config['OracleDB']['Port']
 
     if config.has_option('OracleDB','Database'):
         db = config['OracleDB']['Database']
-        dsn = cx_Oracle.makedsn(host, port, service_name=db)
         loggerInfo(f"Executing below Source SQL query on db :'{db}' using id: '{user}'")
     if config.has_option('OracleDB','SID'):
         sid = config['OracleDB']['SID']
-        dsn = cx_Oracle.makedsn(host, port, sid=sid)
         loggerInfo(f"Executing below Source SQL query on system id:'{sid}' using id: '{user}'")
 
     loggerInfo(f"SQL Query: '{sql}'")
     print("SQL Query execution in progress...")
 
-    # Decrypt the password
-    if encoding==None:
-        conn = cx_Oracle.connect(user=user, password=password, dsn=dsn)
-    else:
-        conn = cx_Oracle.connect(user=user, password=password, dsn=dsn, encoding=encoding, nencoding=encoding)
+    with _pooled_connection(configfile, 'OracleDB', encoding) as conn:
+        #This method is not optimum and would be updated in future
+        loggerInfo('Oracle SQL Query Execution is in progress. It will take some time....')
 
-    #This method is not optimum and would be updated in future
-    loggerInfo('Oracle SQL Query Execution is in progress. It will take some time....')
+        if fetch_method == 'arrow':
+            df = _read_arrow_df(conn, sql, 15000)
+        else:
+            df = _read_Oracle_df(conn, sql)
 
-    chunk_list = []
+    # reduce size of dataframe
+    df = cp._changeDataToCatagory(df, flag_reduce_df_size)
+
+    loggerPass('Source SQL Query Executed successfully')
 
-    dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=15000)
+    if save_csv == True:
+        tN = get_from_reporting_dict('testName')
+        src_csv_path = os.path.join(iniVar.current_project_path, "Reports",  tN + "_" +  save_csv_suffix + ".csv")
+        df.to_csv(src_csv_path, index=False)
+        loggerPass(f"Source query result written to '{src_csv_path}' successfully")
+
+    return df
+
+def _read_MSSQL_df(conn, sql):
+    """Reads result of SQL query on MS SQL server connection with pd.read_sql(), nulls as '(null)'. Used by
+    read_MSSQL_DB_to_df() for whole query and for each of its partitions, so both give same values and dtypes."""
+    df = _read_sql_in_chunks(conn, sql, 8000)
+    df.replace([None], '(null)', inplace=True)
+    return df
+
+def _read_Oracle_df(conn, sql):
+    """Reads result of SQL query on Oracle connection with pd.read_sql(), nulls as '(null)'. Used by read_Oracle_to_df()
+    for whole query and for each of its partitions, so both give same values and dtypes."""
+    df = _read_sql_in_chunks(conn, sql, 15000)
+    # Replace nulls to standard null string
+    df = df.fillna('(null)')
+    df.replace([None], '(null)', inplace=True)
+    return df
+
+def _read_sql_in_chunks(conn, sql, chunksize):
+    """Reads result of SQL query with pd.read_sql() in chunks of chunksize rows, dtypes of every chunk are converted as
+    they are read"""
+    chunk_list = []
+    dfs = pd.read_sql(sql, conn, coerce_float=False, chunksize=chunksize)
     for df_ch in dfs:
         chunk_list.append(df_ch.convert_dtypes(infer_objects=False).T.T)
-    # df = pd.concat(chunk_list)
     #==========================
     try:
-        df = pd.concat(chunk_list)   # give error if sql not return anything
+        return pd.concat(chunk_list)   # give error if sql not return anything
     except:
-        df = pd.read_sql(sql, conn, coerce_float=False) # will execute if df is empty.
+        return pd.read_sql(sql, conn, coerce_float=False) # will execute if df is empty.
     #==========================
-    conn.close()
-    # Replace nulls to standard null string
-    df = df.fillna('(null)')
-    df.replace([None], '(null)', inplace=True)
+
+# Databases supported by push down comparison
+pushdown_db_types = ['postgres', 'oracle', 'mssql']
+# Number of value digests hashed together in row hash, keeps the concatenation within 4000 bytes of Oracle VARCHAR2
+row_hash_group_size = 100
+
+def _check_fetch_method(fetch_method, db_name):
+    """Raises exception if fetch_method is not valid for reading from db_name"""
+    if fetch_method not in fetch_methods:
+        raise Exception(f"Invalid fetch_method '{fetch_method}'. Valid methods are {fetch_methods}")
+    if fetch_method == 'copy' and db_name not in ['PostgreSQL', 'Redshift']:
+        raise Exception(f"fetch_method 'copy' is not supported for {db_name}")
+
+def _read_arrow_df(conn, sql, chunksize):
+    """Executes sql on DB-API connection and returns arrow backed dataframe of result. Rows are fetched chunksize at a
+    time and each chunk is turned into a pyarrow table column by column, so whole result is never held as python rows
+    or as a frame of python objects."""
+    return _get_arrow_df(_fetch_arrow_tables(conn, sql, chunksize))
+
+def _fetch_arrow_tables(conn, sql, chunksize):
+    """Executes sql on DB-API connection and returns list of pyarrow tables of chunks of chunksize rows"""
+    tables = []
+    cur = conn.cursor()
+    try:
+        cur.execute(sql)
+        columns = [desc[0] for desc in cur.description]
+        while True:
+            rows = cur.fetchmany(chunksize)
+            if len(rows) == 0:
+                break
+            tables.append(_get_arrow_table(rows, columns))
+            if len(rows) < chunksize:
+                break
+    finally:
+        cur.close()
+    if len(tables) == 0:
+        tables.append(_get_arrow_table([], columns))
+    return tables
+
+def _get_arrow_table(rows, columns):
+    """Returns pyarrow table of fetched rows. Type of column is inferred by pyarrow, column having values of mixed types
+    is made string column. Decimal values of a column are stored with largest scale of column."""
+    import pyarrow as pa
+
+    values = list(zip(*rows)) if len(rows) > 0 else [[] for _ in columns]
+    arrays = []
+    for col_values in values:
+        try:
+            arrays.append(pa.array(col_values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else str(v) for v in col_values], type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=[str(c) for c in columns])
+
+def _get_arrow_df(tables):
+    """Concatenates pyarrow tables of chunks, replaces nulls of text columns by '(null)' and returns arrow backed
+    dataframe"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not hasattr(pd, 'ArrowDtype'):
+        raise Exception("fetch_method 'arrow' requires pandas 1.5 or later")
+    # null column of a chunk is promoted to type of same column in other chunks
+    promote = {'promote_options': 'default'} if int(pa.__version__.split('.')[0]) >= 14 else {'promote': True}
+    try:
+        table = pa.concat_tables(tables, **promote)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # type of column differs between chunks, e.g. numbers in one chunk and text in other
+        table = pa.concat_tables([t.cast(pa.schema([(f.name, pa.string()) for f in t.schema])) for t in tables])
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type) or pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            col = pc.fill_null(table.column(i).cast(pa.string()), '(null)')
+            table = table.set_column(i, field.name, col)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+def get_row_hash_sql(db_type, sql, ls_ref, ls_cols):
+    """Generates SQL returning only reference columns and a md5 hash of the other columns for every row of given query.
+
+    Every value is cast to text and hashed on its own, null is hashed as '-'. Row hash is md5 of the '|' separated value
+    hashes (upper case hex), so values containing '|' or having text '(null)' can not make same hash for different rows
+    and the concatenation has fixed length whatever the size of values. More than row_hash_group_size columns are hashed
+    in groups and then the group hashes are hashed again. Text is NVARCHAR(MAX) in MS SQL. In Oracle text of a value is
+    TO_CHAR(), so CLOB columns longer than 4000 bytes are to be cut in the query (e.g. with DBMS_LOB.SUBSTR()).
+
+    Parameters
+    ----------
+    db_type : string
+        Type of database, one of 'postgres', 'oracle', 'mssql'
+    sql : string
+        'Select' sql query of data set
+    ls_ref : list
+        List of reference columns of query
+    ls_cols : list
+        List of columns to be hashed, other than reference columns
+
+    returns
+    -------
+    string : SQL query having reference columns (as text) and ROW_HASH column
+    """
+    if db_type not in pushdown_db_types:
+        raise Exception(f"Push down comparison is not supported for db type '{db_type}'. Supported db types are {pushdown_db_types}")
+
+    keys = ', '.join([f"{_get_text_expr(db_type, c)} AS {c}" for c in ls_ref])
+    hashes = [_get_value_hash_expr(db_type, c) for c in ls_cols] if len(ls_cols) > 0 else ["''"]
+    while True:
+        hashes = [_get_md5_expr(db_type, hashes[i:i + row_hash_group_size]) for i in range(0, len(hashes), row_hash_group_size)]
+        if len(hashes) == 1:
+            break
+    return f"SELECT {keys}, {hashes[0]} AS ROW_HASH FROM ({sql}) q_hash"
+
+def get_rows_for_keys_sql(db_type, sql, ls_ref, keys):
+    """Generates SQL returning the rows of given query having given reference values.
+
+    Parameters
+    ----------
+    db_type : string
+        Type of database, one of 'postgres', 'oracle', 'mssql'
+    sql : string
+        'Select' sql query of data set
+    ls_ref : list
+        List of reference columns of query
+    keys : list
+        List of tuples of reference values as text (as returned by get_row_hash_sql())
+
+    returns
+    -------
+    string : SQL query
+    """
+    if len(keys) == 0:
+        # still returns the columns of query
+        return f"SELECT * FROM ({sql}) q_keys WHERE 1 = 0"
+    exprs = [_get_text_expr(db_type, c) for c in ls_ref]
+    def literal(v):
+        return "'" + str(v).replace("'", "''") + "'"
+    if len(ls_ref) == 1:
+        condition = f"{exprs[0]} IN ({', '.join([literal(k[0]) for k in keys])})"
+    else:
+        condition = ' OR '.join(['(' + ' AND '.join([f"{e} = {literal(v)}" for e, v in zip(exprs, k)]) + ')' for k in keys])
+    return f"SELECT * FROM ({sql}) q_keys WHERE {condition}"
+
+def get_rows_with_key_text_sql(db_type, sql, ls_ref):
+    """Generates SQL returning all the rows of given query, followed by text of reference columns (as in
+    get_row_hash_sql()) as last columns, used to select rows of given reference values locally.
+
+    Parameters
+    ----------
+    db_type : string
+        Type of database, one of 'postgres', 'oracle', 'mssql'
+    sql : string
+        'Select' sql query of data set
+    ls_ref : list
+        List of reference columns of query
+
+    returns
+    -------
+    string : SQL query
+    """
+    exprs = ', '.join([f"{_get_text_expr(db_type, c)} AS KEY_TEXT_{i}" for i, c in enumerate(ls_ref)])
+    return f"SELECT q_keys.*, {exprs} FROM ({sql}) q_keys"
+
+def get_partition_sql(db_type, sql, column, n_partitions, partition):
+    """Generates SQL returning one of n_partitions partitions of given query, made on hash of column values. Rows having
+    null in column are in partition 0. Hash is ORA_HASH() for Oracle, CHECKSUM() for MS SQL and hashtext() for PostgreSQL.
+
+    Parameters
+    ----------
+    db_type : string
+        Type of database, one of 'postgres', 'oracle', 'mssql'
+    sql : string
+        'Select' sql query of data set
+    column : string
+        Column of query on which partitions are made
+    n_partitions : int
+        Number of partitions
+    partition : int
+        Partition number, from 0 to n_partitions - 1
+
+    returns
+    -------
+    string : SQL query
+    """
+    if db_type == 'postgres':
+        bucket = f"(hashtext(CAST({column} AS text)) & 2147483647) % {n_partitions}"
+    elif db_type == 'oracle':
+        bucket = f"ORA_HASH({column}, {n_partitions - 1})"
+    elif db_type == 'mssql':
+        bucket = f"(CHECKSUM({column}) & 2147483647) % {n_partitions}"
+    else:
+        raise Exception(f"Partitioned read is not supported for db type '{db_type}'. Supported db types are {pushdown_db_types}")
+    return f"SELECT * FROM ({sql}) q_part WHERE (CASE WHEN {column} IS NULL THEN 0 ELSE {bucket} END) = {partition}"
+
+def _read_partitioned_to_df(db_type, configfile, sql, partition_by, fetch_method='fetch', save_csv=False,
+                            save_csv_suffix="data_dump", flag_reduce_df_size=True, encoding=None):
+    """Reads result of SQL query in partitions (see get_partition_sql()) run in a thread pool, each on its own connection,
+    and returns concatenated dataframe. COUNT(*) of query is run before and after the partitions. If it is same, exception
+    is raised if row count of result is different, else row count can not be verified and failure is logged."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    column, n_partitions = partition_by
+    if int(n_partitions) < 1:
+        raise Exception(f"Invalid number of partitions {n_partitions} in partition_by, it should be 1 or more")
+    n_partitions = int(n_partitions)
+
+    loggerInfo(f"Executing below SQL query in {n_partitions} partitions on column '{column}' in parallel")
+    loggerInfo(f"SQL Query: '{sql}'")
+    print("SQL Query execution in progress...")
+
+    sTime = time.time()
+    # partitions run on connections of their own, each seeing data as of its own start. So rows are counted before and
+    # after the partitions, and row count is verified only if data of query did not change meanwhile
+    count_sql = f"SELECT COUNT(*) FROM ({sql}) q_count"
+    n_count = _read_count(db_type, configfile, count_sql, encoding)
+    # partitions beyond connection_pool_max_size wait for a connection, so they are not given threads of their own
+    max_workers = n_partitions if connection_pool_max_size == None else min(n_partitions, connection_pool_max_size)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_read_partition, db_type, configfile, get_partition_sql(db_type, sql, column, n_partitions, i),
+                                   fetch_method, encoding) for i in range(n_partitions)]
+        chunk_list = [f.result() for f in futures]
+    n_count_after = _read_count(db_type, configfile, count_sql, encoding)
+
+    if fetch_method == 'arrow':
+        df = _get_arrow_df([t for tables in chunk_list for t in tables])
+    else:
+        df = pd.concat(chunk_list, ignore_index=True)
+    if n_count != n_count_after:
+        loggerFail(f"{len(df)} rows read in {n_partitions} partitions in {round(time.time() - sTime, 4)} sec could not be verified, "
+                   f"COUNT(*) of query changed from {n_count} to {n_count_after} while reading")
+    elif len(df) != n_count:
+        raise Exception(f"{len(df)} rows read in {n_partitions} partitions on column '{column}' but COUNT(*) of query is {n_count}")
+    else:
+        loggerPass(f"SQL Query Executed successfully, {len(df)} rows read in {n_partitions} partitions in {round(time.time() - sTime, 4)} sec, same as COUNT(*) of query")
 
     # reduce size of dataframe
     df = cp._changeDataToCatagory(df, flag_reduce_df_size)
 
-    loggerPass('Source SQL Query Executed successfully')
-
     if save_csv == True:
         tN = get_from_reporting_dict('testName')
-        src_csv_path = os.path.join(iniVar.current_project_path, "Reports",  tN + "_" +  save_csv_suffix + ".csv")
-        df.to_csv(src_csv_path, index=False)
-        loggerPass(f"Source query result written to '{src_csv_path}' successfully")
+        csv_path = os.path.join(iniVar.current_project_path, "Reports", tN + "_" + save_csv_suffix + ".csv")
+        df.to_csv(csv_path, index=False)
+        loggerPass(f"SQL query result written to '{csv_path}' successfully")
 
     return df
 
+def _read_partition(db_type, configfile, sql, fetch_method='fetch', encoding=None):
+    """Reads one partition of _read_partitioned_to_df() on a connection of its own. Returns list of pyarrow tables if
+    fetch_method is 'arrow', else dataframe with nulls as '(null)'. Rows are converted same way as by the reader of
+    db_type reading whole query."""
+    with _db_connection(db_type, configfile, encoding) as conn:
+        if fetch_method == 'arrow':
+            return _fetch_arrow_tables(conn, sql, 100000)
+        if fetch_method == 'copy':
+            return pd.concat(_read_PostgreSQL_copy_chunks(conn, sql, null_value='(null)'), ignore_index=True)
+        if db_type == 'oracle':
+            return _read_Oracle_df(conn, sql)
+        if db_type == 'mssql':
+            return _read_MSSQL_df(conn, sql)
+        cur = conn.cursor()
+        cur.execute(sql)
+        df = _get_rows_df(cur.fetchall(), [desc[0] for desc in cur.description])
+        cur.close()
+        return df
+
+def _read_count(db_type, configfile, sql, encoding=None):
+    """Returns value of given COUNT(*) query run on a connection of its own"""
+    with _db_connection(db_type, configfile, encoding) as conn:
+        cur = conn.cursor()
+        cur.execute(sql)
+        n_count = int(cur.fetchone()[0])
+        cur.close()
+        return n_count
+
+def _get_text_expr(db_type, col):
+    """Returns SQL expression of column value as text, null as '(null)'"""
+    if db_type == 'postgres':
+        return f"coalesce({col}::text, '(null)')"
+    if db_type == 'oracle':
+        return f"NVL(TO_CHAR({col}), '(null)')"
+    return f"ISNULL(CAST({col} AS NVARCHAR(MAX)), '(null)')"
+
+def _get_value_hash_expr(db_type, col):
+    """Returns SQL expression of md5 hash (upper case hex) of column value as text, null as '-'"""
+    if db_type == 'postgres':
+        return f"coalesce(upper(md5({col}::text)), '-')"
+    if db_type == 'oracle':
+        return f"NVL(RAWTOHEX(STANDARD_HASH(TO_CHAR({col}), 'MD5')), '-')"
+    return f"ISNULL(CONVERT(VARCHAR(32), HASHBYTES('MD5', CAST({col} AS NVARCHAR(MAX))), 2), '-')"
+
+def _get_md5_expr(db_type, exprs):
+    """Returns SQL expression of md5 hash (upper case hex) of given text expressions joined with '|'"""
+    if db_type == 'postgres':
+        return "upper(md5(concat_ws('|', " + ", ".join(exprs) + ")))"
+    if db_type == 'oracle':
+        return "RAWTOHEX(STANDARD_HASH(" + " || '|' || ".join(exprs) + ", 'MD5'))"
+    return "CONVERT(VARCHAR(32), HASHBYTES('MD5', " + " + '|' + ".join(exprs) + "), 2)"
+
+def read_row_hashes_from_db(db_type, configfile, sql, ls_ref, ls_cols):
+    """Executes generated row hash SQL (see get_row_hash_sql()) on database and returns reference values and row hashes.
+
+    Parameters
+    ----------
+    db_type : string
+        Type of database, one of 'postgres', 'oracle', 'mssql'
+    configfile : string
+        Location of .ini file containing database connection details.
+    sql : string
+        'Select' sql query of data set
+    ls_ref : list
+        List of reference columns of query
+    ls_cols : list
+        List of columns to be hashed, other than reference columns
+
+    returns
+    -------
+    DataFrame : reference columns and ROW_HASH column, all as text
+    """
+    hash_sql = get_row_hash_sql(db_type, sql, ls_ref, ls_cols)
+    loggerInfo(f"Row hash SQL Query: '{hash_sql}'")
+
+    with _db_connection(db_type, configfile) as conn:
+        sTime = time.time()
+        cur = conn.cursor()
+        cur.execute(hash_sql)
+        df = pd.DataFrame.from_records(cur.fetchall(), columns=ls_ref + ['ROW_HASH'])
+        cur.close()
+    loggerPass(f"Row hashes of {len(df)} rows fetched successfully in {round(time.time() - sTime, 4)} sec")
+    return df.astype(str)
+
+def read_rows_for_keys_from_db(db_type, configfile, sql, ls_ref, keys, chunksize=500, full_read_threshold=5000):
+    """Executes given SQL on database and returns only the rows having given reference values, fetched in chunks of keys.
+
+    Every chunk runs the query again with a filter on text of reference columns, which can not use indexes. So if
+    there are more than full_read_threshold keys, the query is run only once (see get_rows_with_key_text_sql()) and
+    the rows are selected locally.
+
+    Parameters
+    ----------
+    db_type : string
+        Type of database, one of 'postgres', 'oracle', 'mssql'
+    configfile : string
+        Location of .ini file containing database connection details.
+    sql : string
+        'Select' sql query of data set
+    ls_ref : list
+        List of reference columns of query
+    keys : list
+        List of tuples of reference values as text (as returned by read_row_hashes_from_db())
+    chunksize : int, default 500
+        Number of keys fetched in one query
+    full_read_threshold : int, default 5000
+        Number of keys above which all rows of query are fetched in one query and filtered locally
+
+    returns
+    -------
+    DataFrame : rows of query having given reference values, nulls as '(null)'
+    """
+    full_read = len(keys) > full_read_threshold
+    if full_read:
+        ls_sql = [get_rows_with_key_text_sql(db_type, sql, ls_ref)]
+        loggerInfo(f"{len(keys)} reference values are more than {full_read_threshold}, all rows of query are fetched once and filtered")
+    else:
+        ls_sql = [get_rows_for_keys_sql(db_type, sql, ls_ref, keys[i:i + chunksize]) for i in range(0, max(len(keys), 1), chunksize)]
+
+    chunk_list = []
+    with _db_connection(db_type, configfile) as conn:
+        cur = conn.cursor()
+        for sql_keys in ls_sql:
+            cur.execute(sql_keys)
+            columns = [desc[0] for desc in cur.description]
+            chunk_list.append(pd.DataFrame.from_records(cur.fetchall(), columns=columns))
+        cur.close()
+
+    df = pd.concat(chunk_list, ignore_index=True)
+    if full_read:
+        # last columns are text of reference columns
+        n_ref = len(ls_ref)
+        key_text = list(df.iloc[:, -n_ref:].astype(str).itertuples(index=False, name=None))
+        df = df.iloc[:, :-n_ref][pd.Series(key_text).isin(set(tuple(str(v) for v in k) for k in keys)).values].reset_index(drop=True)
+    df.replace([None], '(null)', inplace=True)
+    loggerInfo(f"{len(df)} rows fetched for {len(keys)} reference values")
+    return df
+
+def _db_connection(db_type, configfile, encoding=None):
+    """Context manager of connection to database of given type from connection pool (see _pooled_connection()), using
+    connection details in .ini file"""
+    return _pooled_connection(configfile, _get_db_section(db_type), encoding)
+
+def _get_db_section(db_type):
+    """Returns section of .ini file having connection details of database of given type"""
+    sections = {'postgres': 'PostgreDB', 'oracle': 'OracleDB', 'mssql': 'MSSQL_DB'}
+    if db_type not in sections:
+        raise Exception(f"Invalid db type '{db_type}'. Supported db types are {pushdown_db_types}")
+    return sections[db_type]
+
+@contextlib.contextmanager
+def _pooled_connection(configfile, section, encoding=None, conn=None):
+    """Context manager checking out connection from connection pool (see _get_pooled_connection()) and giving it back
+    at exit of with block. If block raises an exception, also GeneratorExit of a generator closed early, connection is
+    closed instead, as it may be in middle of a query or COPY.
+
+    Parameters
+    ----------
+    configfile : string
+        Location of .ini file containing database connection details.
+    section : string
+        Section of .ini file, see _get_pooled_connection()
+    encoding : string, default None
+        Encoding of Oracle connection
+    conn : connection, default None
+        Connection already checked out with _get_pooled_connection(), to be given back instead of checking out one
+    """
+    if conn == None:
+        conn = _get_pooled_connection(configfile, section, encoding)
+    try:
+        yield conn
+    except BaseException:
+        _discard_connection(conn)
+        raise
+    _release_connection(conn, configfile, section, encoding)
+
+def _get_pooled_connection(configfile, section, encoding=None):
+    """Checks out connection to database of given section of .ini file from connection pool. Idle connection of pool is
+    health checked with a trivial query before it is returned, else a new connection is made. Connection is used only by
+    the calling thread till it is given back with _release_connection() or closed with _discard_connection(). Readers
+    use _pooled_connection() instead, so connection is given back also on errors.
+
+    If connection_pool_max_size connections of the database are already checked out, call waits till one is given back
+    or closed, and raises exception after connection_pool_timeout seconds. Idle connections are closed when the .ini
+    file is modified (see _read_config()), so changed connection details are used by next connection.
+
+    Pooled connection keeps its session: temporary tables and session settings of other databases than PostgreSQL and
+    Redshift (e.g. ALTER SESSION of Oracle) are still there for next user of connection. Queries changing session state
+    should undo it, or connection_pool_max_idle can be set to 0 to disable pooling.
+
+    Parameters
+    ----------
+    configfile : string
+        Location of .ini file containing database connection details.
+    section : string
+        Section of .ini file, one of 'PostgreDB', 'RedshiftDB', 'OracleDB', 'MSSQL_DB', 'HiveDB', 'DB2_DB'
+    encoding : string, default None
+        Encoding of Oracle connection
+
+    returns
+    -------
+    connection : DB-API connection
+    """
+    key = _get_pool_key(configfile, section, encoding)
+    slots = _acquire_connection_slot(key)
+    try:
+        _read_config(configfile)
+        while True:
+            with connection_pool_lock:
+                idle = connection_pool.get(key, [])
+                conn = idle.pop() if len(idle) > 0 else None
+                mtime = config_cache[key[0]][0]
+            if conn == None:
+                conn = _connection_factories[section](configfile, encoding)
+                break
+            if _is_connection_healthy(conn, section):
+                break
+            _close_connection(conn)
+    except BaseException:
+        if slots != None:
+            slots.release()
+        raise
+    with connection_pool_lock:
+        connection_pool_checked_out[id(conn)] = (slots, mtime)
+    return conn
+
+def _acquire_connection_slot(key):
+    """Waits till less than connection_pool_max_size connections of pool key are checked out and returns semaphore of
+    the key, acquired. Returns None if connection_pool_max_size is None."""
+    if connection_pool_max_size == None:
+        return None
+    with connection_pool_lock:
+        if key not in connection_pool_slots:
+            connection_pool_slots[key] = threading.BoundedSemaphore(connection_pool_max_size)
+        slots = connection_pool_slots[key]
+    if not slots.acquire(timeout=connection_pool_timeout):
+        raise Exception(f"No connection to '{key[1]}' of '{key[0]}' available in {connection_pool_timeout} seconds, "
+                        f"{connection_pool_max_size} connections (connection_pool_max_size) are checked out")
+    return slots
+
+def _check_in_connection(conn):
+    """Removes connection from checked out connections, freeing its slot of connection_pool_max_size"""
+    with connection_pool_lock:
+        slots = connection_pool_checked_out.pop(id(conn), (None, None))[0]
+    if slots != None:
+        slots.release()
+
+def _discard_connection(conn):
+    """Closes connection checked out with _get_pooled_connection() instead of giving it back to connection pool, e.g.
+    when it may be in middle of a query"""
+    _close_connection(conn)
+    _check_in_connection(conn)
+
+def _release_connection(conn, configfile, section, encoding=None):
+    """Gives back connection checked out with _get_pooled_connection() to connection pool. Open transaction is rolled
+    back and session settings are reset with session_reset_sql of the section. Connection is closed if it is broken, if
+    .ini file was modified since connection was checked out, or if pool already has connection_pool_max_idle idle
+    connections of the same database."""
+    try:
+        conn.rollback()
+        if section in session_reset_sql:
+            cur = conn.cursor()
+            cur.execute(session_reset_sql[section])
+            cur.close()
+            conn.commit()
+    except Exception:
+        _discard_connection(conn)
+        return
+    _read_config(configfile)
+    key = _get_pool_key(configfile, section, encoding)
+    with connection_pool_lock:
+        idle = connection_pool.setdefault(key, [])
+        mtime = config_cache[key[0]][0]
+        _, mtime_checked_out = connection_pool_checked_out.get(id(conn), (None, mtime))
+        is_pooled = mtime_checked_out == mtime and len(idle) < connection_pool_max_idle
+        if is_pooled:
+            idle.append(conn)
+    if not is_pooled:
+        _close_connection(conn)
+    _check_in_connection(conn)
+
+def close_connection_pool():
+    """Closes all idle connections of connection pool. It is called at exit of python process."""
+    with connection_pool_lock:
+        ls_conn = [conn for idle in connection_pool.values() for conn in idle]
+        connection_pool.clear()
+    for conn in ls_conn:
+        _close_connection(conn)
+
+atexit.register(close_connection_pool)
+
+def _get_pool_key(configfile, section, encoding=None):
+    """Returns key of connection pool, path of .ini file is used so same file name in two projects is not mixed up"""
+    return (_get_config_path(configfile), section, encoding)
+
+def _is_connection_healthy(conn, section):
+    """Returns True if trivial query runs on connection"""
+    try:
+        cur = conn.cursor()
+        cur.execute(health_check_sql.get(section, "SELECT 1"))
+        cur.fetchall()
+        cur.close()
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+def _close_connection(conn):
+    """Closes connection, error of already broken connection is ignored"""
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+def _get_config_path(configfile):
+    """Returns path of .ini file of Configrations folder"""
+    return os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
+
+def _read_config(configfile):
+    """Reads .ini file of Configrations folder. Parsed file is cached till the file is modified, then idle connections
+    of connection pool made with the file are closed."""
+    path_config = _get_config_path(configfile)
+    mtime = os.path.getmtime(path_config) if os.path.exists(path_config) else None
+    with connection_pool_lock:
+        if path_config in config_cache and config_cache[path_config][0] == mtime:
+            return config_cache[path_config][1]
+    config = configparser.ConfigParser()
+    config.read(path_config)
+    ls_conn = []
+    with connection_pool_lock:
+        if path_config in config_cache and config_cache[path_config][0] != mtime:
+            for key in [key for key in connection_pool if key[0] == path_config]:
+                ls_conn += connection_pool.pop(key)
+        config_cache[path_config] = (mtime, config)
+    for conn in ls_conn:
+        _close_connection(conn)
+    return config
+
+def _get_PostgreSQL_connection(configfile, encoding=None, section='PostgreDB'):
+    """Returns new connection to PostgreDB (or RedshiftDB) given in .ini file"""
+    config = _read_config(configfile)
+    password = base64.b64decode(config[section]['Password']).decode('utf-8')  # 'decrypted'
+    return psycopg2.connect(user=config[section]['User'], password=password, host=config[section]['Host'],
+                            port=config[section]['Port'], database=config[section]['Database'])
+
+def _get_Redshift_connection(configfile, encoding=None):
+    """Returns new connection to RedshiftDB given in .ini file"""
+    return _get_PostgreSQL_connection(configfile, section='RedshiftDB')
+
+def _get_Oracle_connection(configfile, encoding=None):
+    """Returns new connection to OracleDB given in .ini file"""
+    config = _read_config(configfile)
+    password = base64.b64decode(config['OracleDB']['Password']).decode('utf-8')  # 'decrypted'
+    host = config['OracleDB']['Host']
+    port = config['OracleDB']['Port']
+    if config.has_option('OracleDB', 'Database'):
+        dsn = cx_Oracle.makedsn(host, port, service_name=config['OracleDB']['Database'])
+    else:
+        dsn = cx_Oracle.makedsn(host, port, sid=config['OracleDB']['SID'])
+
+    if encoding == None:
+        return cx_Oracle.connect(user=config['OracleDB']['User'], password=password, dsn=dsn)
+    return cx_Oracle.connect(user=config['OracleDB']['User'], password=password, dsn=dsn, encoding=encoding, nencoding=encoding)
+
+def _get_MSSQL_connection(configfile, encoding=None):
+    """Returns new connection to MSSQL_DB given in .ini file"""
+    config = _read_config(configfile)
+    server = config['MSSQL_DB']['Server']
+    database = config['MSSQL_DB']['Database']
+    if (config.has_option('MSSQL_DB', 'Trusted_Connection') == False) or (config['MSSQL_DB']['Trusted_Connection'] == 'No'):
+        password = base64.b64decode(config['MSSQL_DB']['Password']).decode('utf-8')  # 'decrypted'
+        conn_str = 'Driver={SQL Server};Server=' + server + ';Database=' + database + ';uid=' + config['MSSQL_DB']['User'] + ';pwd=' + password
+    else:
+        conn_str = f"""Driver={{SQL Server}};Server={server};Database={database};Trusted_Connection={config['MSSQL_DB']['Trusted_Connection']};"""
+    return pyodbc.connect(conn_str)
+
+def _get_Hive_connection(configfile, encoding=None):
+    """Returns new connection to HiveDB given in .ini file"""
+    config = _read_config(configfile)
+    return pyodbc.connect(f"DSN={config['HiveDB']['DSN']}", autocommit=config['HiveDB']['autocommit'])
+
+def _get_DB2_connection(configfile, encoding=None):
+    """Returns new connection to DB2_DB given in .ini file"""
+    config = _read_config(configfile)
+    password = base64.b64decode(config['DB2_DB']['Password']).decode('utf-8')  # 'decrypted'
+    return pyodbc.connect(DSN=config['DB2_DB']['DSN'], UID=config['DB2_DB']['User'], PWD=password)
+
+# New connection for each section of .ini file, used by connection pool
+_connection_factories = {'PostgreDB': _get_PostgreSQL_connection, 'RedshiftDB': _get_Redshift_connection,
+                         'OracleDB': _get_Oracle_connection, 'MSSQL_DB': _get_MSSQL_connection,
+                         'HiveDB': _get_Hive_connection, 'DB2_DB': _get_DB2_connection}
+
 def read_FWF_to_df(configfile=None, columns_not_to_trim = None, columns_left_trim_only = None, columns_right_trim_only = None, fileencoding =None,
                    file_location =None, fWf_col_spec = 'fWf_Col_Spec', col_names = 'col_Names', add_column_for_file_name = False, flag_reduce_df_size=True):
     """Reads fixed width (position) flat file in a dataframe. It is very useful when the file size is very very large.
@@ -960,78 +1772,64 @@ def df_to_redshift_table(df_src, configfile, vTableName, append=False, create_co
     """
 
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
     user = config['RedshiftDB']['User']
-    password = config['RedshiftDB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['RedshiftDB']['Host']
-    port = config['RedshiftDB']['Port']
     database = config['RedshiftDB']['Database']
 
-    # Decrypt the password
-    # decoded_data = base64.b64decode(password)
     # Create connection
-    conn = psycopg2.connect(user=user, password=password,
-                            host=host,
-                            port=port,
-                            database=database)
-
-    loggerInfo(f"Loading the dataset to db :'{database}' using id: '{user}'")
-
-    df_columns = list(df_src)
-    columns = ",".join(df_columns)
-    # default table column description
-    if create_col_des == None:
-        create_col_des = ",".join([col + ' VARCHAR (100)' for col in df_columns])
-    else:
-        create_col_des = create_col_des
-
-    # create table by default
-    if append == False:
-        create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
-        with conn.cursor() as cur:
-            cur.execute(create_sql)
-        conn.commit()
-
-        loggerPass(f"Created Table:'{vTableName}' successfully")
+    with _pooled_connection(configfile, 'RedshiftDB') as conn:
+        loggerInfo(f"Loading the dataset to db :'{database}' using id: '{user}'")
 
-    # insert/append the new data to existing table
-    totRec = len(df_src)
-    loggerInfo(f"Total records : {totRec}, starting loading data in table...")
-    df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # to handle backslash
+        df_columns = list(df_src)
+        columns = ",".join(df_columns)
+        # default table column description
+        if create_col_des == None:
+            create_col_des = ",".join([col + ' VARCHAR (100)' for col in df_columns])
+        else:
+            create_col_des = create_col_des
 
-    if load_method == 'fast':
-        a = time.time()
-        f = io.StringIO()
-        internal_sep = _find_internal_sep(f) if internal_sep == None else internal_sep
-        df_src.to_csv(f, index=False, header=False, sep=internal_sep)
-        f.seek(0)
-        with conn.cursor() as cur:
-            cur.copy_from(f, vTableName, sep=internal_sep)
-        conn.commit()
-        loggerInfo(f"Time taken to load data: {time.time() - a}")
+        # create table by default
+        if append == False:
+            create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
+            with conn.cursor() as cur:
+                cur.execute(create_sql)
+            conn.commit()
 
-    if load_method == 'slow':
-        a = time.time()
-        values = "VALUES({})".format(",".join(["%s" for _ in list(df_src)]))
-        insert_stmt = "INSERT INTO {} ({}) {}".format(vTableName, columns, values)
-        with conn.cursor() as cur:
-            execute_batch(cur, insert_stmt, df_src.values)
-        conn.commit()
+            loggerPass(f"Created Table:'{vTableName}' successfully")
 
-        loggerInfo(f"Time taken to load data: {time.time() - a}")
+        # insert/append the new data to existing table
+        totRec = len(df_src)
+        loggerInfo(f"Total records : {totRec}, starting loading data in table...")
+        df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # to handle backslash
+
+        if load_method == 'fast':
+            a = time.time()
+            f = io.StringIO()
+            internal_sep = _find_internal_sep(f) if internal_sep == None else internal_sep
+            df_src.to_csv(f, index=False, header=False, sep=internal_sep)
+            f.seek(0)
+            with conn.cursor() as cur:
+                cur.copy_from(f, vTableName, sep=internal_sep)
+            conn.commit()
+            loggerInfo(f"Time taken to load data: {time.time() - a}")
+
+        if load_method == 'slow':
+            a = time.time()
+            values = "VALUES({})".format(",".join(["%s" for _ in list(df_src)]))
+            insert_stmt = "INSERT INTO {} ({}) {}".format(vTableName, columns, values)
+            with conn.cursor() as cur:
+                execute_batch(cur, insert_stmt, df_src.values)
+            conn.commit()
 
-    if grant_all_privilege_to_public == True:
-        sql = f"grant ALL PRIVILEGES on {vTableName} to public"
-        with conn.cursor() as cur:
-            cur.execute(sql)
-        conn.commit()
-        loggerPass(f"All previleges are given to PUBLIC successfully")
+            loggerInfo(f"Time taken to load data: {time.time() - a}")
 
-    conn.close()
+        if grant_all_privilege_to_public == True:
+            sql = f"grant ALL PRIVILEGES on {vTableName} to public"
+            with conn.cursor() as cur:
+                cur.execute(sql)
+            conn.commit()
+            loggerPass(f"All previleges are given to PUBLIC successfully")
     loggerPass(f"Data loaded successfully in Table:{vTableName}")
 
 def df_to_mssql_table(df_src, configfile, vTableName, create_col_des=None, if_Table="New"):
@@ -1057,22 +1855,12 @@ def df_to_mssql_table(df_src, configfile, vTableName, create_col_des=None, if_Ta
     """
 
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
-    server = config['MSSQL_DB']['Server']
     database = config['MSSQL_DB']['Database']
-    trusted_connection = config['MSSQL_DB']['Trusted_Connection']
-    # Connection string
     if (config.has_option('MSSQL_DB','Trusted_Connection')==False) or (config['MSSQL_DB']['Trusted_Connection']=='No'):
-        user = config['MSSQL_DB']['User']
-        password = config['MSSQL_DB']['Password']
-        password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-        conn_str = 'Driver={SQL Server};Server=' + server + ';Database=' + database + ';uid=' + user + ';pwd=' + password
-        loggerInfo(f"Loading the dataset to db :'{database}' using id: '{user}'")
+        loggerInfo(f"Loading the dataset to db :'{database}' using id: '{config['MSSQL_DB']['User']}'")
     else:
-        conn_str = f"""Driver={{SQL Server}};Server={server};Database={database};Trusted_Connection={trusted_connection};"""
         loggerInfo(f"Loading the dataset to db :'{database}'")
 
     # default table column description
@@ -1083,35 +1871,33 @@ def df_to_mssql_table(df_src, configfile, vTableName, create_col_des=None, if_Ta
         create_col_des = create_col_des
 
     # Create connectiona and cursor object
-    conn = pyodbc.connect(conn_str)
-    with conn.cursor() as cur:
-        if if_Table == "Replace": # Droppping old table
-            cur.execute(f"drop table {vTableName}")
-            conn.commit()
-            if_Table ="New"  # set to create new table
-
-        # create table by default
-        if if_Table == "New":
-            create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
-            cur.execute(create_sql)
-            conn.commit()
-            loggerPass(f"Created Table:'{vTableName}' successfully")
-
-        if if_Table == "New" or if_Table == "Append":
-            loggerInfo(f"Total records : {len(df_src)}, starting loading data in table...")
-            df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # to handle backslash
-
-            # insert/append the new data to existing table
-            df_columns = list(df_src)
-            insert_sql = f"insert into {vTableName} values ({','.join(['?' for v in df_columns])})"
-            insert_cols = df_src.values.tolist()
-            cur.fast_executemany = True
-            cur.executemany(insert_sql, insert_cols)
-            conn.commit()
-        else:
-            raise Exception("Invalid Table Operation ")
-
-    conn.close()
+    with _pooled_connection(configfile, 'MSSQL_DB') as conn:
+        with conn.cursor() as cur:
+            if if_Table == "Replace": # Droppping old table
+                cur.execute(f"drop table {vTableName}")
+                conn.commit()
+                if_Table ="New"  # set to create new table
+
+            # create table by default
+            if if_Table == "New":
+                create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
+                cur.execute(create_sql)
+                conn.commit()
+                loggerPass(f"Created Table:'{vTableName}' successfully")
+
+            if if_Table == "New" or if_Table == "Append":
+                loggerInfo(f"Total records : {len(df_src)}, starting loading data in table...")
+                df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # to handle backslash
+
+                # insert/append the new data to existing table
+                df_columns = list(df_src)
+                insert_sql = f"insert into {vTableName} values ({','.join(['?' for v in df_columns])})"
+                insert_cols = df_src.values.tolist()
+                cur.fast_executemany = True
+                cur.executemany(insert_sql, insert_cols)
+                conn.commit()
+            else:
+                raise Exception("Invalid Table Operation ")
     loggerPass(f"Table successfully loaded")
 
 def df_to_postgre_table(df_src, configfile, vTableName, append=False, create_col_des=None, load_method='fast',
@@ -1143,83 +1929,69 @@ def df_to_postgre_table(df_src, configfile, vTableName, append=False, create_col
     """
 
     # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
+    config = _read_config(configfile)
 
     user = config['PostgreDB']['User']
-    password = config['PostgreDB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['PostgreDB']['Host']
-    port = config['PostgreDB']['Port']
     database = config['PostgreDB']['Database']
 
-    # Decrypt the password
-    #decoded_data = base64.b64decode(password)
     # Create connection
-    conn = psycopg2.connect(user=user, password=password,
-                            host=host,
-                            port=port,
-                            database=database)
-
-    loggerInfo(f"Loading the dataset to db :'{database}' using id: '{user}'")
-
-    df_columns = list(df_src)
-    columns = ",".join(df_columns)
-    # default table column description
-    if create_col_des == None:
-        create_col_des = ",".join([col + ' VARCHAR (100)' for col in df_columns])
-    else:
-        create_col_des = create_col_des
-
-    # create table by default
-    if append == False:
-        create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
-        with conn.cursor() as cur:
-            cur.execute(create_sql)
-        conn.commit()
+    with _pooled_connection(configfile, 'PostgreDB') as conn:
+        loggerInfo(f"Loading the dataset to db :'{database}' using id: '{user}'")
 
-        loggerPass(f"Created Table:'{vTableName}' successfully")
+        df_columns = list(df_src)
+        columns = ",".join(df_columns)
+        # default table column description
+        if create_col_des == None:
+            create_col_des = ",".join([col + ' VARCHAR (100)' for col in df_columns])
+        else:
+            create_col_des = create_col_des
 
-    # insert/append the new data to existing table
-    totRec = len(df_src)
-    loggerInfo(f"Total records : {totRec}, starting loading data in table...")
-    df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # to handle backslash
+        # create table by default
+        if append == False:
+            create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
+            with conn.cursor() as cur:
+                cur.execute(create_sql)
+            conn.commit()
 
-    if load_method == 'fast':
-        import csv
-        a = time.time()
-        f = io.StringIO()
+            loggerPass(f"Created Table:'{vTableName}' successfully")
 
-        internal_sep = _char_not_in_df(df_src) if internal_sep == None else internal_sep
+        # insert/append the new data to existing table
+        totRec = len(df_src)
+        loggerInfo(f"Total records : {totRec}, starting loading data in table...")
+        df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # to handle backslash
 
-        df_src.to_csv(f, index=False, header=False, sep=internal_sep, quotechar=internal_sep ) #To handle double quote in values
-        f.seek(0)
-        with conn.cursor() as cur:
-            cur.copy_from(f, vTableName, sep=internal_sep)
+        if load_method == 'fast':
+            import csv
+            a = time.time()
+            f = io.StringIO()
 
-        conn.commit()
-        loggerInfo(f"Time taken to load data: {time.time() - a}")
+            internal_sep = _char_not_in_df(df_src) if internal_sep == None else internal_sep
 
-    if load_method == 'slow':
-        a = time.time()
-        values = "VALUES({})".format(",".join(["%s" for _ in list(df_src)]))
-        insert_stmt = "INSERT INTO {} ({}) {}".format(vTableName, columns, values)
-        with conn.cursor() as cur:
-            execute_batch(cur, insert_stmt, df_src.values)
-        conn.commit()
+            df_src.to_csv(f, index=False, header=False, sep=internal_sep, quotechar=internal_sep ) #To handle double quote in values
+            f.seek(0)
+            with conn.cursor() as cur:
+                cur.copy_from(f, vTableName, sep=internal_sep)
 
-        loggerInfo(f"Time taken to load data: {time.time() - a}")
+            conn.commit()
+            loggerInfo(f"Time taken to load data: {time.time() - a}")
+
+        if load_method == 'slow':
+            a = time.time()
+            values = "VALUES({})".format(",".join(["%s" for _ in list(df_src)]))
+            insert_stmt = "INSERT INTO {} ({}) {}".format(vTableName, columns, values)
+            with conn.cursor() as cur:
+                execute_batch(cur, insert_stmt, df_src.values)
+            conn.commit()
 
-    if grant_all_privilege_to_public == True:
-        sql = f"grant ALL PRIVILEGES on {vTableName} to public"
-        with conn.cursor() as cur:
-            cur.execute(sql)
+            loggerInfo(f"Time taken to load data: {time.time() - a}")
 
-        conn.commit()
-        loggerPass(f"All previleges are given to PUBLIC successfully")
+        if grant_all_privilege_to_public == True:
+            sql = f"grant ALL PRIVILEGES on {vTableName} to public"
+            with conn.cursor() as cur:
+                cur.execute(sql)
 
-    conn.close()
+            conn.commit()
+            loggerPass(f"All previleges are given to PUBLIC successfully")
     loggerPass(f"Data loaded successfully in Table:{vTableName}")
 
 def load_fwf_to_postgre_table(file_configfile, db_configfile, vTableName, columns_not_to_trim = None, fileencoding =None, file_location =None,
@@ -1327,26 +2099,6 @@ def df_to_oracle_table(df_src, configfile, vTableName, append=False, create_col_
         ---------
         None
         """
-    # Read from config file
-    path_config = os.path.join(iniVar.current_project_path, "Configrations", configfile + ".ini")
-    config = configparser.ConfigParser()
-    config.read(path_config)
-
-    user = config['OracleDB']['User']
-    password = config['OracleDB']['Password']
-    password = base64.b64decode(password).decode('utf-8')  # 'decrypted'
-    host = config['OracleDB']['Host']
-    port = config['OracleDB']['Port']
-    database = config['OracleDB']['Database']
-
-    if config.has_option('OracleDB','Database'):
-        db = config['OracleDB']['Database']
-        dsn = cx_Oracle.makedsn(host, port, service_name=db)
-
-    if config.has_option('OracleDB','SID'):
-        sid = config['OracleDB']['SID']
-        dsn = cx_Oracle.makedsn(host, port, sid=sid)
-
     #columns from dataframe
     df_columns = list(df_src)
     columns = ",".join(df_columns)
@@ -1356,32 +2108,29 @@ def df_to_oracle_table(df_src, configfile, vTableName, append=False, create_col_
     else:
         create_col_des = create_col_des
 
-    conn = cx_Oracle.connect(user=user, password=password, dsn=dsn)
-
-    # create table by default
-    if append == False:
-        create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
-        with conn.cursor() as cur:
-            cur.execute(create_sql)
-        conn.commit()
-
-        loggerPass(f"Created Table:'{vTableName}' successfully")
+    with _pooled_connection(configfile, 'OracleDB') as conn:
+        # create table by default
+        if append == False:
+            create_sql = f"""CREATE TABLE {vTableName} ({create_col_des})"""
+            with conn.cursor() as cur:
+                cur.execute(create_sql)
+            conn.commit()
 
-    totRec = len(df_src)
-    loggerInfo(f"Total records : {totRec}, starting loading data in table...")
-    #df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # Commented, no need to handle backslash in Oracle
+            loggerPass(f"Created Table:'{vTableName}' successfully")
 
-    a = time.time()
-    values = "VALUES({})".format(",".join([f":{m}" for m in range(0, len(df_src.columns.values) )]))
-    insert_stmt = "INSERT INTO {} {}".format(vTableName, values)
+        totRec = len(df_src)
+        loggerInfo(f"Total records : {totRec}, starting loading data in table...")
+        #df_src = df_src.replace(r'\\', r'\\\\', regex=True)  # Commented, no need to handle backslash in Oracle
 
-    with conn.cursor() as cur:
-        cur.executemany(insert_stmt,df_src.values.tolist())
-    conn.commit()
+        a = time.time()
+        values = "VALUES({})".format(",".join([f":{m}" for m in range(0, len(df_src.columns.values) )]))
+        insert_stmt = "INSERT INTO {} {}".format(vTableName, values)
 
-    loggerInfo(f"Time taken to load data: {time.time() - a}")
+        with conn.cursor() as cur:
+            cur.executemany(insert_stmt,df_src.values.tolist())
+        conn.commit()
 
-    conn.close()
+        loggerInfo(f"Time taken to load data: {time.time() - a}")
     loggerPass(f"Data loaded successfully in Table:{vTableName}")
 
 def load_csv_to_oracle_table(csvfilepath, db_configfile, vTableName, delimiter=",", lst_colNames = None, PickInitial_n_records = None, add_column_for_file_name = False, encoding = None,
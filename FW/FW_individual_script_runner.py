@@ -41,7 +41,7 @@ def run_individual_script(test_main_fn,test_reporting_fn, current_test_name, dry
                 test_main_fn(current_test_name)
         except Exception as e:
             print("ERROR - " + str(e))
-            iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - ERROR - " + str(e))
+            logger._add_logger_step("ERROR", str(e))
             vError = "ERROR - " + str(e)
     
     if verbose_debug==True:
@@ -6,13 +6,15 @@ import pandas as pd
 lock = RLock()
 
 
-def loggerPass(msg):
+def loggerPass(msg, tab=None):
     """Write msg string to console and generated report. This will prefix the string with 'PASS' in green colored background.
 
     Parameters
     ----------
     msg : string
         String to write to console or report
+    tab : string, default None
+        Key of additional detail tab referred in msg, step is linked to the tab in report
 
     returns
     --------
@@ -20,21 +22,23 @@ def loggerPass(msg):
     """
 #    print(threading.current_thread().name)
 #    print(threading.get_ident())
-    _helper("PASS", msg)
+    _helper("PASS", msg, tab)
 
-def loggerFail(msg):
+def loggerFail(msg, tab=None):
     """Write msg string to console and generated report. This will prefix the string with 'FAIL' in red colored background.
 
     Parameters
     ----------
     msg : string
         String to write to console or report
+    tab : string, default None
+        Key of additional detail tab referred in msg, step is linked to the tab in report
 
     returns
     --------
     None
     """
-    _helper("FAIL", msg)
+    _helper("FAIL", msg, tab)
     
 def loggerInfo(msg):
     """Write msg string to console and generated report. This will prefix the string with 'INFO' in gray colored background.
@@ -69,19 +73,19 @@ def loggerDisplay(msg=''):
     # Checking if the execution type is sequential or multithread and accordingly update the reporting dictionary.
     if threading.current_thread().name == 'MainThread':
         print(msg)
-        iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - " +  msg)
+        _add_logger_step(None, msg)
     else:
         with lock:
             print( msg)
-            iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - "  + msg)
+            _add_logger_step(None, msg)
     if isinstance(msg, pd.DataFrame):
         pd.pd.reset_option("max_columns")
         pd.set_option('expand_frame_repr', True)
 
 
     
-def _helper(type, msg):
-    """colour coding message according to the type"""
+def _helper(type, msg, tab=None):
+    """colour coding message according to the type. tab is key of additional detail tab referred in msg, if any"""
     if type == 'PASS':
         vMsg = colors().bg.green + type + colors.reset + " - " + msg
     if type == 'FAIL':
@@ -92,12 +96,19 @@ def _helper(type, msg):
     if threading.current_thread().name == 'MainThread':
         #print(type + " - " + msg)
         print(vMsg)
-        iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - " + type + " - " + msg)
+        _add_logger_step(type, msg, tab)
     else:
         #lock = multiprocessing.Manager().Lock()
         with lock:
             print(type + " - " + msg)
-            iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - " + type  + " - " + msg)
+            _add_logger_step(type, msg, tab)
+
+def _add_logger_step(type, msg, tab=None):
+    """Adds logger step of current test in 'logger_records' list of reporting dictionary, as record of its type (PASS,
+    FAIL, INFO, ERROR or None), message and key of additional detail tab it refers to, so that report can render the
+    steps without parsing them."""
+
+    iniVar.th_local.dict.setdefault('logger_records', []).append({'type': type, 'msg': msg, 'tab': tab})
 
 
 def add_in_reporting_dict(dict_key, dict_val):
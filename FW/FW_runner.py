@@ -1,7 +1,8 @@
 import FW.Initialize.initialize_global_variables as iniVar
 from concurrent.futures import ThreadPoolExecutor
-import importlib, time, multiprocessing, threading, datetime,os
+import importlib, time, multiprocessing, threading, datetime,os, tempfile, shutil
 import FW.FW_logger as logger
+import FW.Compare_Report.compare_report as cp
 
 gRrptCnt = 0
 totaltestsCount = 0
@@ -32,10 +33,17 @@ def runner(tests_and_path_list, exeType):
         totaltestsCount = len(tests_list)
         threadCnt = totaltestsCount
         lock = multiprocessing.Manager().Lock()
-        with ThreadPoolExecutor(max_workers=threadCnt) as executor:
-            futures = [executor.submit(_run_test, testName, path_name, lock) for testName, path_name in zip(tests_list, path_list)]
-            for future in futures:
-                future.result()
+        # tests write their results as artifacts without waiting for each other, report is assembled from them in the end
+        iniVar.report_artifacts_path = tempfile.mkdtemp(prefix='report_artifacts_')
+        try:
+            with ThreadPoolExecutor(max_workers=threadCnt) as executor:
+                futures = [executor.submit(_run_test, testName, path_name, lock) for testName, path_name in zip(tests_list, path_list)]
+                for future in futures:
+                    future.result()
+            cp.assemble_report_from_artifacts(iniVar.report_artifacts_path)
+        finally:
+            shutil.rmtree(iniVar.report_artifacts_path, ignore_errors=True)
+            iniVar.report_artifacts_path = None
         print(f'Total time taken with multi-threaded executions : {time.time()-a}')
     
     
@@ -60,7 +68,7 @@ def runner(tests_and_path_list, exeType):
                 getattr(test_module, "test_main")(testName)
             except Exception as e:
                 vError = str(e)
-                iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - ERROR - " + str(e))
+                logger._add_logger_step("ERROR", str(e))
                 print(str(e))
             gRrptCnt =gRrptCnt+1
             
@@ -100,15 +108,10 @@ def _run_test(testName, tstPath, lock):
         getattr(test_module, "test_main")(testName)
     except Exception as e:
         vError = str(e)
-        iniVar.th_local.dict['logger'].append(str(threading.get_ident()) + " - ERROR - " + str(e))
+        logger._add_logger_step("ERROR", str(e))
         print(str(e))
+    # result of test is written in its own artifact without lock, shared steps after it are serialized by prepareReport()
     with lock:
         gRrptCnt =gRrptCnt+1
-        getattr(test_module, "test_reporting")(gRrptCnt,testName, vError, totaltestsCount)
-    
- 
-    
-    
-    
-    
-    
\ No newline at end of file
+        rptCnt = gRrptCnt
+    getattr(test_module, "test_reporting")(rptCnt,testName, vError, totaltestsCount)
@@ -1,4 +1,5 @@
 current_project_path,current_project_root_path,current_project_test_path, dry_run = [None]*4   #reporting_dict
+report_artifacts_path = None   # set by batch runner when report is assembled from result artifacts of tests at the end of batch
 global_dict={}
 
 from datetime import datetime
@@ -38,7 +39,7 @@ def setupGlobalVariable(curr_project_path,curr_project_root_path,curr_project_te
     current_project_test_path = curr_project_test_path
 
     th_local.dict = initial_dict
-    th_local.dict['logger'] = []
+    th_local.dict['logger_records'] = []
     th_local.dict['detail_tabs'] = dict()
 
     _add_in_reporting_dict_during_setup('testName', var_TestName.replace(".py",""), th_local.dict)
@@ -73,6 +74,14 @@ def read_project_config(reporting_dict):
         _add_in_reporting_dict_during_setup('qTest_Project_ID', qTest_Project_ID, reporting_dict)
         _add_in_reporting_dict_during_setup('qTest_Test_Cycle_ID', qTest_Test_Cycle_ID, reporting_dict)
 
+    # Excel report backend, 'streaming' writes the report of whole batch in one write only workbook saved only once at the end
+    ReportBackend = config['Project_setup']['ReportBackend'].strip().lower() if config.has_option('Project_setup','ReportBackend') else 'openpyxl'
+    _add_in_reporting_dict_during_setup('ReportBackend', ReportBackend, reporting_dict)
+
+    # Report format, 'html' writes full differences as parquet files with static html report, 'both' writes excel report too
+    ReportFormat = config['Project_setup']['ReportFormat'].strip().lower() if config.has_option('Project_setup','ReportFormat') else 'excel'
+    _add_in_reporting_dict_during_setup('ReportFormat', ReportFormat, reporting_dict)
+
     _add_in_reporting_dict_during_setup('TestType', TestType, reporting_dict)
     _add_in_reporting_dict_during_setup('ReleaseName', ReleaseName, reporting_dict)
     _add_in_reporting_dict_during_setup('Environment', Environment, reporting_dict)
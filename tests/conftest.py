@@ -0,0 +1,31 @@
+import os, sys, types
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Database drivers and the Jenkins/qTest integration packages are not needed by the unit tests, empty modules are used
+# where they are not installed so that framework modules can be imported
+for name in ['pyodbc', 'psycopg2', 'psycopg2.extras', 'cx_Oracle', 'FW.Jenkins_Integration',
+             'FW.Jenkins_Integration.FW_jenkins_integration', 'FW.QTest_Integration',
+             'FW.QTest_Integration.FW_pulse_integration']:
+    try:
+        __import__(name)
+    except ImportError:
+        sys.modules[name] = types.ModuleType(name)
+if not hasattr(sys.modules['psycopg2.extras'], 'execute_batch'):
+    sys.modules['psycopg2.extras'].execute_batch = None
+
+import FW.Initialize.initialize_global_variables as iniVar
+from FW.FW_logger import add_in_reporting_dict
+
+
+@pytest.fixture
+def reporting_dict(tmp_path):
+    """Fresh reporting dictionary of current thread and empty project folder"""
+    os.makedirs(tmp_path / "Configrations")
+    os.makedirs(tmp_path / "Reports")
+    iniVar.current_project_path = str(tmp_path)
+    iniVar.th_local.dict = {'logger_records': [], 'detail_tabs': dict()}
+    add_in_reporting_dict('testName', 'test_script')
+    yield iniVar.th_local.dict
+    iniVar.th_local.dict = {}
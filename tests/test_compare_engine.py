@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import FW.Compare_Report.compare_engine as ce
+
+
+def test_diff_mask_in_parallel_matches_sequential_compare():
+    src = pd.DataFrame({'A': ['a', 'b', 'c', 'd'], 'B': [1, 2, 3, 4], 'C': ['x', 'y', 'z', 'w']})
+    trg = pd.DataFrame({'A': ['d', 'C', 'b', 'a'], 'B': [4, 3, 2, 9], 'C': ['w', 'z', 'y', 'x']})
+    src_pos, trg_pos = np.array([0, 1, 2, 3]), np.array([3, 2, 1, 0])
+    mask = ce.get_diff_mask_in_parallel(src, trg, src_pos, trg_pos, ['A', 'B', 'C'], 2)
+    assert mask.tolist() == [[False, True, False], [False, False, False], [True, False, False], [False, False, False]]
+    rules = {'A': {'ignore_case': True}}
+    mask = ce.get_diff_mask_in_parallel(src, trg, src_pos, trg_pos, ['A', 'B', 'C'], 2, column_rules=rules)
+    assert mask.any(1).tolist() == [True, False, False, False]
+    seq_src, seq_trg = ce.get_diff_pairs(src, trg, src_pos, trg_pos, ['A', 'B', 'C'])
+    assert seq_src.tolist() == [0, 2] and seq_trg.tolist() == [3, 1]
+
+
+def test_align_types_integer_and_float_become_float():
+    src = pd.DataFrame({'A': [1, 2, 3], 'B': [1, 2, 3]})
+    trg = pd.DataFrame({'A': [1.0, 2.5, 3.0], 'B': ['1', '(null)', '3']})
+    src_al, trg_al = ce.align_column_types(src, trg, ['A', 'B'])
+    assert str(src_al['A'].dtype) == str(trg_al['A'].dtype) == 'float64'
+    assert ce.get_equality_mask(src_al[['A']], trg_al[['A']])[:, 0].tolist() == [True, False, True]
+    # integers read as text on one side are parsed, null marker becomes null
+    assert str(src_al['B'].dtype) == 'float64' and trg_al['B'].isna().tolist() == [False, True, False]
+
+
+def test_align_types_date_and_timestamp_compared_as_timestamps():
+    import datetime as dt
+    src = pd.DataFrame({'D': [dt.date(2024, 1, 1), dt.date(2024, 1, 2), None]})
+    trg = pd.DataFrame({'D': pd.to_datetime(['2024-01-01 00:00', '2024-01-02 10:00', None])})
+    src_al, trg_al = ce.align_column_types(src, trg, ['D'])
+    assert pd.api.types.is_datetime64_any_dtype(src_al['D']) and pd.api.types.is_datetime64_any_dtype(trg_al['D'])
+    assert ce.get_equality_mask(src_al, trg_al)[:, 0].tolist() == [True, False, True]
+
+
+def test_align_types_categoricals_get_same_categories():
+    src = pd.DataFrame({'C': pd.Categorical(['a', 'b', 'a'])})
+    trg = pd.DataFrame({'C': pd.Categorical(['a', 'c', 'b'], categories=['c', 'b', 'a'])})
+    src_al, trg_al = ce.align_column_types(src, trg, ['C'])
+    assert list(src_al['C'].cat.categories) == list(trg_al['C'].cat.categories) == ['a', 'b', 'c']
+    assert ce.get_equality_mask(src_al, trg_al)[:, 0].tolist() == [True, False, False]
+
+
+def test_align_types_mixed_kinds_compared_as_string():
+    src = pd.DataFrame({'M': ['x', '1', '(null)']})
+    trg = pd.DataFrame({'M': [1, 1, 2]})
+    src_al, trg_al = ce.align_column_types(src, trg, ['M'])
+    assert src_al['M'].tolist() == ['x', '1', '(null)'] and trg_al['M'].tolist() == ['1', '1', '2']
+    assert ce.get_equality_mask(src_al, trg_al)[:, 0].tolist() == [False, True, False]
+
+
+def test_sorted_merge_matches_composite_keys_without_hashing(monkeypatch):
+    src = pd.DataFrame({'K1': ['a', 'a', 'b', 'b', 'd'], 'K2': [1, 3, 1, 2, 1], 'V': ['x', 'y', 'z', 'w', 'v']})
+    trg = pd.DataFrame({'K1': ['a', 'b', 'b', 'c', 'd'], 'K2': [3, 0, 2, 1, 1], 'V': ['y', 'q', 'W', 'r', 'v']})
+    monkeypatch.setattr(pd, 'factorize', None)
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', None)
+    src_pos, trg_pos, extra_src, extra_trg = ce.get_sorted_merge_positions(src, trg, ['K1', 'K2'])
+    assert src_pos.tolist() == [1, 3, 4] and trg_pos.tolist() == [0, 2, 4]
+    assert extra_src.tolist() == [0, 2] and extra_trg.tolist() == [1, 3]
+
+
+def test_sorted_merge_compare_gives_same_results_as_hash_engine():
+    src = pd.DataFrame({'K1': ['a', 'a', 'b', 'b', 'd'], 'K2': [1, 3, 1, 2, 1], 'V': ['x', 'y', 'z', 'w', 'v']})
+    trg = pd.DataFrame({'K1': ['a', 'b', 'b', 'c', 'd'], 'K2': [3, 0, 2, 1, 1], 'V': ['y', 'q', 'W', 'r', 'v']})
+    merged = ce.compare_by_sorted_merge(src, trg, ['K1', 'K2'], ['V'])
+    hashed = ce.compare_by_row_hash(src, trg, ['K1', 'K2'], ['V'])
+    for df_merged, df_hashed in zip(merged, hashed):
+        pd.testing.assert_frame_equal(df_merged, df_hashed)
+    assert merged[0]['V'].tolist() == ['w', 'W']
+
+
+def test_sorted_merge_falls_back_when_unsorted_or_duplicate():
+    trg = pd.DataFrame({'K': [1, 2, 3], 'V': ['a', 'b', 'c']})
+    unsorted = pd.DataFrame({'K': [2, 1, 3], 'V': ['b', 'a', 'c']})
+    duplicate = pd.DataFrame({'K': [1, 2, 2], 'V': ['a', 'b', 'c']})
+    not_comparable = pd.DataFrame({'K': ['1', '2', '3'], 'V': ['a', 'b', 'c']}).astype(object)
+    assert ce.compare_by_sorted_merge(unsorted, trg, ['K'], ['V']) == None
+    assert ce.compare_by_sorted_merge(trg, duplicate, ['K'], ['V']) == None
+    assert ce.compare_by_sorted_merge(not_comparable, trg.astype(object), ['K'], ['V']) == None
+
+
+def test_align_reference_keys_uses_first_matching_target_row():
+    src = pd.DataFrame({'K': ['b', 'a', 'c']})
+    trg = pd.DataFrame({'K': ['a', 'b', 'a', 'b', 'd', 'a']})
+    keys = ce.align_reference_keys(src, trg, ['K'])
+    assert keys['src_pos'].tolist() == [0, 1] and keys['trg_pos'].tolist() == [1, 0]
+    assert keys['right_only'].tolist() == [False, False, False, False, True, False]
+    df_dup = ce.get_duplicate_keys(trg, ['K'])
+    assert df_dup['K'].tolist() == ['a', 'b'] and df_dup['Count'].tolist() == [3, 2]
@@ -0,0 +1,287 @@
+import pandas as pd
+import FW.Compare_Report.compare_report as cp
+import FW.Compare_Report.compare_engine as ce
+from FW.FW_logger import add_in_reporting_dict
+
+
+def _record(unique_cnt, null_cnt):
+    return {'G': 0, 'I': 0, 'J': 0, 'K': unique_cnt, 'L': null_cnt}
+
+
+def test_status_pass_when_counts_match(reporting_dict):
+    assert cp._get_overall_status_of_summary_record(_record('A: src=3 trg=3', 'A: src=0 trg=0')) == "Pass"
+
+
+def test_status_fail_when_approx_unique_counts_differ_in_summary_string(reporting_dict):
+    assert cp._get_overall_status_of_summary_record(_record('A: src=~3 trg=~4', 'A: src=0 trg=0')) == "Fail"
+
+
+def test_status_fail_when_approx_unique_counts_differ_in_profile(reporting_dict):
+    src = pd.DataFrame({'A': ['a', 'b', 'c', 'c']})
+    trg = pd.DataFrame({'A': ['a', 'b', 'c', 'd']})
+    profile = {'src': ce.get_column_profile(src, ['A'], approx_distinct=True),
+               'trg': ce.get_column_profile(trg, ['A'], approx_distinct=True)}
+    add_in_reporting_dict('data_profile', profile)
+    unique_cnt = ce.format_profile_counts(profile['src'], profile['trg'], 'unique')
+    assert '~' in unique_cnt
+    assert cp._get_overall_status_of_summary_record(_record(unique_cnt, 'A: src=0 trg=0')) == "Fail"
+
+
+def test_status_ignores_unique_counts_with_numeric_threshold(reporting_dict):
+    add_in_reporting_dict('numeric_threshold', 0.5)
+    assert cp._get_overall_status_of_summary_record(_record('A: src=~3 trg=~4', 'A: src=0 trg=0')) == "Pass"
+
+
+def test_status_fail_when_null_counts_differ(reporting_dict):
+    assert cp._get_overall_status_of_summary_record(_record('A: src=3 trg=3', 'A: src=1 trg=0')) == "Fail"
+
+
+def test_status_fail_on_out_of_core_unique_count_difference(reporting_dict):
+    src = pd.DataFrame({'ID': ['1', '2', '3'], 'A': ['x', 'y', 'y']})
+    trg = pd.DataFrame({'ID': ['1', '2', '3'], 'A': ['x', 'y', 'z']})
+    cp.compare([[src], ['ID'], ['ID', 'A']], [[trg], ['ID'], ['ID', 'A']], engine='out_of_core')
+    record, wrapText = cp._get_summary_record(7)
+    assert '~' in record['K']
+    assert cp._get_overall_status_of_summary_record(record) == "Fail"
+
+
+def test_assemble_report_on_thread_without_reporting_dict(tmp_path, monkeypatch):
+    import json, os
+    import FW.Initialize.initialize_global_variables as iniVar
+    os.makedirs(tmp_path / "1")
+    with open(tmp_path / "1" / "test_info.json", "w") as f:
+        json.dump({'report_format': 'excel', 'report_path': str(tmp_path / "report.xlsx")}, f)
+    opened = []
+    monkeypatch.setattr(cp, '_assemble_excel_report_from_artifacts', lambda *args: None)
+    monkeypatch.setattr(os, 'startfile', opened.append, raising=False)
+    monkeypatch.delattr(iniVar.th_local, 'dict', raising=False)
+    cp.assemble_report_from_artifacts(str(tmp_path))
+    assert opened == [str(tmp_path / "report.xlsx")]
+
+
+def test_status_fail_on_fail_step_only(reporting_dict):
+    from FW.FW_logger import loggerInfo, loggerFail
+    loggerInfo("Column 'FAIL - reason' is compared")
+    assert cp._get_overall_status_of_summary_record(_record('A: src=3 trg=3', 'A: src=0 trg=0')) == "Pass"
+    loggerFail("Row counts are different")
+    assert cp._get_overall_status_of_summary_record(_record('A: src=3 trg=3', 'A: src=0 trg=0')) == "Fail"
+
+
+def test_logger_steps_are_records_linked_to_tabs(reporting_dict):
+    from FW.FW_logger import loggerPass, loggerFail
+    loggerPass("Comparison done", 'tab1')
+    loggerFail("Mismatch found")
+    assert reporting_dict['logger_records'] == [{'type': 'PASS', 'msg': "Comparison done", 'tab': 'tab1'},
+                                                {'type': 'FAIL', 'msg': "Mismatch found", 'tab': None}]
+    assert 'logger' not in reporting_dict
+
+
+def test_streaming_workbook_keeps_template_hyperlinks(tmp_path):
+    import openpyxl
+    template = openpyxl.Workbook()
+    template.active.title = 'Summary'
+    template['Summary']['A1'] = 'Guide'
+    template['Summary']['A1'].hyperlink = 'https://example.com/guide'
+    template.save(tmp_path / "template.xlsx")
+    report = cp._create_streaming_workbook(str(tmp_path / "template.xlsx"))
+    report['wb'].save(tmp_path / "report.xlsx")
+    assert openpyxl.load_workbook(tmp_path / "report.xlsx")['Summary']['A1'].hyperlink.target == 'https://example.com/guide'
+
+
+def test_streaming_workbook_is_kept_per_thread(reporting_dict, tmp_path):
+    import threading, openpyxl
+    import FW.Initialize.initialize_global_variables as iniVar
+    template = openpyxl.Workbook()
+    template.active.title = 'Summary'
+    template.save(tmp_path / "template.xlsx")
+    barrier = threading.Barrier(2, timeout=10)
+    def run_batch(name):
+        # tests of both batches are written in turn, test 1 of both before test 2 of any
+        for rptCnt in [1, 2]:
+            iniVar.th_local.dict = {'logger_records': [], 'detail_tabs': dict()}
+            add_in_reporting_dict('testName', name)
+            add_in_reporting_dict('start_time', '2024-01-01 00:00:00.000')
+            cp._write_test_in_streaming_report(rptCnt, 2, str(tmp_path / "template.xlsx"), str(tmp_path / f"{name}.xlsx"),
+                                               f"{name}_{rptCnt}", 'script error', None, None, None, True)
+            barrier.wait()
+    threads = [threading.Thread(target=run_batch, args=(f"batch_{i}",)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for i in range(2):
+        summary = openpyxl.load_workbook(tmp_path / f"batch_{i}.xlsx")['Summary']
+        assert [row[1] for row in summary.iter_rows(values_only=True)] == [f"batch_{i}_1", f"batch_{i}_2"]
+
+
+def test_typed_compare_finds_differences_on_native_types(reporting_dict):
+    from FW.FW_logger import get_from_reporting_dict
+    src = pd.DataFrame({'ID': [1, 2, 3], 'AMT': [10, 20, 30], 'DT': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])})
+    trg = pd.DataFrame({'ID': ['1', '2', '3'], 'AMT': [10.0, 20.5, 30.0], 'DT': ['2024-01-01', '2024-01-02', '2024-01-04']})
+    cp.compare([src, ['ID'], ['ID', 'AMT', 'DT']], [trg, ['ID'], ['ID', 'AMT', 'DT']], engine='hash', compare_mode='typed')
+    assert get_from_reporting_dict('mismatch_cnt') == 2
+    comm_diffs = get_from_reporting_dict('comm_diffs')
+    assert comm_diffs['ID'].tolist() == ['2', '2', '3', '3']
+    assert comm_diffs['AMT'].tolist() == ['20.0', '20.5', '30.0', '30.0']
+
+
+def test_fingerprint_check_passes_identical_data_without_comparing(reporting_dict, monkeypatch):
+    from FW.FW_logger import get_from_reporting_dict
+    src = pd.DataFrame({'ID': [str(i) for i in range(100)], 'A': [str(i % 7) for i in range(100)]})
+    trg = src.sample(frac=1, random_state=1)
+    monkeypatch.setattr(ce, 'compare_by_row_hash', None)
+    monkeypatch.setattr(ce, 'align_reference_keys', None)
+    cp.compare([src, ['ID'], ['ID', 'A']], [trg, ['ID'], ['ID', 'A']], engine='hash')
+    assert get_from_reporting_dict('mismatch_cnt') == 0 and get_from_reporting_dict('extra_trg_cnt') == 0
+
+
+def test_fingerprint_check_narrows_comparison_to_mismatching_buckets(reporting_dict):
+    src = pd.DataFrame({'ID': [str(i) for i in range(1000)], 'A': ['x'] * 1000})
+    trg = src.copy()
+    trg.loc[[10, 500], 'A'] = 'y'
+    key_codes = ce.get_key_codes(src, trg, ['ID'], ['ID'])
+    is_identical, src_rows, trg_rows, codes = cp._compare_fingerprints(src, trg, key_codes, ['ID'], ['ID'], ['A'])
+    assert not is_identical
+    assert set(src_rows['ID']) == set(trg_rows['ID']) and {'10', '500'} <= set(src_rows['ID'])
+    assert len(src_rows) < 20
+    assert codes[0].tolist() == key_codes[0][src_rows.index].tolist()
+
+
+def test_fingerprint_check_skips_hashing_when_keys_are_duplicate(reporting_dict, monkeypatch):
+    src = pd.DataFrame({'ID': ['1', '1', '2'], 'A': ['x', 'y', 'z']})
+    trg = pd.DataFrame({'ID': ['1', '2'], 'A': ['x', 'z']})
+    monkeypatch.setattr(ce, 'get_row_fingerprints', None)
+    key_codes = ce.get_key_codes(src, trg, ['ID'], ['ID'])
+    is_identical, src_rows, trg_rows, codes = cp._compare_fingerprints(src, trg, key_codes, ['ID'], ['ID'], ['A'])
+    assert not is_identical and len(src_rows) == 3 and len(trg_rows) == 2
+
+
+def test_baseline_snapshot_compares_only_new_and_changed_keys(reporting_dict):
+    import os
+    from FW.FW_logger import get_from_reporting_dict
+    def run(src, trg, ls_ref=['ID']):
+        cp.compare([src.copy(), ls_ref, ['ID', 'A', 'B']], [trg.copy(), ls_ref, ['ID', 'A', 'B']], engine='hash',
+                   baseline_snapshot=True, fingerprint_check=False)
+        return {k: get_from_reporting_dict(k) for k in ['mismatch_cnt', 'extra_src_cnt', 'extra_trg_cnt']}
+    src = pd.DataFrame({'ID': ['1', '2', '3', '4', '5'], 'A': ['a', 'b', 'c', 'd', 'e'], 'B': ['x'] * 5})
+    trg = pd.DataFrame({'ID': ['1', '2', '3', '4', '6'], 'A': ['a', 'b', 'C', 'd', 'f'], 'B': ['x'] * 5})
+    assert run(src, trg) == {'mismatch_cnt': 1, 'extra_src_cnt': 1, 'extra_trg_cnt': 1}
+    assert os.path.exists(os.path.join(cp.iniVar.current_project_path, "Reports", "Snapshots", "test_script.parquet"))
+
+    # key 2 changed in target, key 4 removed from target, key 7 new in source
+    src2 = pd.concat([src, pd.DataFrame({'ID': ['7'], 'A': ['g'], 'B': ['x']})], ignore_index=True)
+    trg2 = trg[trg['ID'] != '4'].copy()
+    trg2.loc[trg2['ID'] == '2', 'B'] = 'y'
+    assert run(src2, trg2) == {'mismatch_cnt': 2, 'extra_src_cnt': 3, 'extra_trg_cnt': 1}
+    assert get_from_reporting_dict('snapshot_changes') == {'new': 1, 'removed': 0, 'changed': 2}
+    assert get_from_reporting_dict('extra_src')['ID'].tolist() == [4, 5, 7]
+
+    # snapshot of other reference columns is not used, all the keys are compared
+    assert run(src2, trg2, ['ID', 'B'])['extra_src_cnt'] == 4
+
+
+def test_shared_steps_after_report_run_one_test_at_a_time(tmp_path, monkeypatch):
+    import threading, time
+    import FW.Initialize.initialize_global_variables as iniVar
+    running, overlaps, artifacts = [], [], []
+    def shared_step(*args):
+        running.append(1)
+        overlaps.append(len(running) > 1)
+        time.sleep(0.05)
+        running.pop()
+    monkeypatch.setattr(iniVar, 'report_artifacts_path', str(tmp_path))
+    monkeypatch.setattr(iniVar, 'dry_run', False)
+    monkeypatch.setattr(iniVar, 'current_project_path', str(tmp_path))
+    monkeypatch.setattr(cp, '_write_test_result_artifact', lambda *args: artifacts.append(args[0]))
+    monkeypatch.setattr(cp, 'update_exec_db', shared_step)
+    monkeypatch.setattr(iniVar, '_set_test_info_in_global_dict', shared_step)
+    def run_test(rptCnt):
+        iniVar.th_local.dict = {'logger_records': [], 'detail_tabs': dict()}
+        cp.prepareReport(rptCnt, f"test_{rptCnt}", None, 4)
+    threads = [threading.Thread(target=run_test, args=(i + 1,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(artifacts) == [1, 2, 3, 4]
+    assert len(overlaps) == 8 and not any(overlaps)
+
+
+def test_conditional_format_covers_exactly_mismatching_cells(reporting_dict, tmp_path):
+    import openpyxl
+    from FW.FW_logger import get_from_reporting_dict
+    from openpyxl.utils.cell import range_boundaries
+    template = openpyxl.Workbook()
+    template.active.title = 'Summary'
+    template.save(tmp_path / "template.xlsx")
+    add_in_reporting_dict('start_time', '2024-01-01 00:00:00.000')
+    cp.set_diff_cells_format_mode('conditional')
+    src = pd.DataFrame({'K': ['1', '2', '3', '4', '5'], 'A': ['a', 'b', 'c', 'd', 'e'], 'B': ['x', 'y', 'z', 'w', 'v']})
+    trg = pd.DataFrame({'K': ['1', '2', '3', '4', '5'], 'A': ['a', 'B', 'C', 'D', 'e'], 'B': ['x', 'Y', 'z', 'w', 'V']})
+    cp.compare([src, ['K'], ['K', 'A', 'B']], [trg, ['K'], ['K', 'A', 'B']], engine='hash')
+    cp._write_test_in_streaming_report(1, 1, str(tmp_path / "template.xlsx"), str(tmp_path / "report.xlsx"), 'test_script', None,
+                                       get_from_reporting_dict('comm_diffs'), get_from_reporting_dict('extra_src'),
+                                       get_from_reporting_dict('extra_trg'), True)
+
+    wb = openpyxl.load_workbook(tmp_path / "report.xlsx")
+    ws = wb[wb.sheetnames[-1]]
+    formatted = set()
+    for cf in ws.conditional_formatting:
+        assert [rule.formula for rule in cf.rules] == [['TRUE']]
+        for cell_range in str(cf.sqref).split():
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+            formatted |= {(r, c) for r in range(min_row, max_row + 1) for c in range(min_col, max_col + 1)}
+    # source and target rows of common diffs are written one after the other from row 2, columns from C
+    expected = set()
+    for r in range(2, 2 + 2 * 4, 2):
+        for c in range(3, 6):
+            if ws.cell(r, c).value != ws.cell(r + 1, c).value:
+                expected |= {(r, c), (r + 1, c)}
+    assert ws.cell(2, 2).value == 'Source' and len(expected) == 10
+    assert formatted == expected
+
+
+def test_html_report_has_summary_page_and_all_differences_in_parquet(reporting_dict, tmp_path):
+    import os
+    from FW.FW_logger import get_from_reporting_dict
+    add_in_reporting_dict('ReportFormat', 'html')
+    add_in_reporting_dict('data_size_in_report', 4)
+    add_in_reporting_dict('start_time', '2024-01-01 00:00:00.000')
+    src = pd.DataFrame({'K': [str(i) for i in range(10)], 'A': ['a'] * 10})
+    trg = pd.DataFrame({'K': [str(i) for i in range(1, 11)], 'A': ['a', 'b'] * 5})
+    cp.compare([src, ['K'], ['K', 'A']], [trg, ['K'], ['K', 'A']], engine='hash')
+    html_path = str(tmp_path / "report_html")
+    cp._write_test_in_html_report(1, html_path, 'test_script', None, get_from_reporting_dict('comm_diffs'),
+                                  get_from_reporting_dict('extra_src'), get_from_reporting_dict('extra_trg'))
+
+    with open(os.path.join(html_path, "index.html"), encoding='utf-8') as f:
+        index = f.read()
+    assert "<a href='test_1.html' class='fail'>test_script</a>" in index
+    assert os.path.exists(os.path.join(html_path, "test_1.html"))
+    # parquet files have all the differences, not only the ones kept for excel report
+    comm_diffs = pd.read_parquet(os.path.join(html_path, "test_1", "tab_0_comm_diffs.parquet"))
+    assert len(get_from_reporting_dict('comm_diffs')) == 4 and len(comm_diffs) == 8
+    assert sorted(comm_diffs['K'].unique().tolist()) == [2, 4, 6, 8]
+    assert pd.read_parquet(os.path.join(html_path, "test_1", "tab_0_extra_src.parquet"))['K'].tolist() == [0]
+    assert pd.read_parquet(os.path.join(html_path, "test_1", "tab_0_extra_trg.parquet"))['K'].tolist() == [10]
+
+
+def test_report_cursor_finds_blank_cells_and_is_not_kept_after_reload(tmp_path):
+    import openpyxl
+    wb = openpyxl.Workbook()
+    sh = wb.active
+    sh['A1'], sh['A7'], sh['C3'] = 'title', 1, 'x'
+    assert cp._get_first_blank_row(sh) == 8 and cp._get_last_non_blank_row(sh, col='C') == 4
+    assert cp._get_first_blank_column(sh) == 4
+
+    # cells written by report functions move the cursor, sheet is not scanned again
+    sh['A8'], sh['E8'] = 2, 'y'
+    cp._move_report_cursor(sh, 8, [1, 5])
+    sh['A20'] = 'not written by report'
+    assert cp._get_first_blank_row(sh) == 9 and cp._get_last_non_blank_row(sh, col='E') == 9
+    assert cp._get_first_blank_column(sh) == 6
+
+    # report changed outside and loaded again is scanned again
+    wb.save(tmp_path / "report.xlsx")
+    sh = openpyxl.load_workbook(tmp_path / "report.xlsx")['Sheet']
+    assert cp._get_first_blank_row(sh) == 21
@@ -0,0 +1,325 @@
+import io, os, threading, time
+import pandas as pd
+import pytest
+import FW.FW_Lib_Connect as lib
+
+
+class FakeCursor:
+    """Cursor returning rows of a dataframe for every executed query"""
+
+    def __init__(self, df):
+        self.df, self.queries, self.description, self.pos = df, [], None, 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        self.queries.append(sql)
+        self.description = [(c,) for c in self.df.columns]
+
+    def fetchall(self):
+        return list(self.df.itertuples(index=False, name=None))
+
+    def fetchmany(self, n):
+        self.pos += n
+        return self.fetchall()[self.pos - n:self.pos]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection giving one FakeCursor, recording rollback, commit and close"""
+
+    def __init__(self, cursor=None):
+        self.cur = cursor if cursor != None else FakeCursor(pd.DataFrame({'X': [1]}))
+        self.rollbacks, self.commits, self.closed = 0, 0, False
+
+    def cursor(self, name=None):
+        return self.cur
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(reporting_dict, monkeypatch):
+    """Empty connection pool whose new connections are FakeConnection"""
+    opened = []
+    def connect(configfile, encoding=None):
+        opened.append(FakeConnection())
+        return opened[-1]
+    monkeypatch.setitem(lib._connection_factories, 'PostgreDB', connect)
+    monkeypatch.setattr(lib, 'connection_pool', {})
+    monkeypatch.setattr(lib, 'connection_pool_slots', {})
+    monkeypatch.setattr(lib, 'connection_pool_checked_out', {})
+    monkeypatch.setattr(lib, 'config_cache', {})
+    yield opened
+
+
+def test_pooled_connection_is_reused_and_session_reset(pool):
+    for i in range(2):
+        with lib._pooled_connection('pg', 'PostgreDB') as conn:
+            pass
+    assert len(pool) == 1 and not conn.closed
+    assert conn.cur.queries[-1] == 'RESET ALL' and conn.commits == 2
+
+
+def test_pooled_connection_is_closed_on_error(pool):
+    with pytest.raises(ValueError):
+        with lib._pooled_connection('pg', 'PostgreDB') as conn:
+            raise ValueError('query failed')
+    assert conn.closed
+    assert all(conn not in idle for idle in lib.connection_pool.values())
+    assert lib.connection_pool_checked_out == {}
+
+
+def test_checked_out_connections_are_limited(pool, monkeypatch):
+    monkeypatch.setattr(lib, 'connection_pool_max_size', 2)
+    monkeypatch.setattr(lib, 'connection_pool_timeout', 0.1)
+    conns = [lib._get_pooled_connection('pg', 'PostgreDB') for i in range(2)]
+    with pytest.raises(Exception, match="connection_pool_max_size"):
+        lib._get_pooled_connection('pg', 'PostgreDB')
+
+    monkeypatch.setattr(lib, 'connection_pool_timeout', 10)
+    waiting = threading.Thread(target=lambda: conns.append(lib._get_pooled_connection('pg', 'PostgreDB')))
+    waiting.start()
+    time.sleep(0.1)
+    assert waiting.is_alive()
+    lib._release_connection(conns[0], 'pg', 'PostgreDB')
+    waiting.join(10)
+    assert not waiting.is_alive() and conns[2] is conns[0]  # idle connection given back is reused
+    lib._discard_connection(conns[1])
+    assert lib._get_pooled_connection('pg', 'PostgreDB') is pool[-1] and len(pool) == 3
+
+
+def _write_config(configfile, host, mtime):
+    path_config = lib._get_config_path(configfile)
+    with open(path_config, 'w') as f:
+        f.write(f"[PostgreDB]\nHost={host}\n")
+    os.utime(path_config, (mtime, mtime))
+
+
+def test_pooled_connections_are_not_reused_when_config_is_modified(pool):
+    _write_config('pg', 'old_host', 1000)
+    idle_conn = lib._get_pooled_connection('pg', 'PostgreDB')
+    busy_conn = lib._get_pooled_connection('pg', 'PostgreDB')
+    lib._release_connection(idle_conn, 'pg', 'PostgreDB')
+
+    _write_config('pg', 'new_host', 2000)
+    conn = lib._get_pooled_connection('pg', 'PostgreDB')
+    assert conn is pool[-1] and len(pool) == 3 and idle_conn.closed
+    lib._release_connection(busy_conn, 'pg', 'PostgreDB')  # checked out with previous file
+    lib._release_connection(conn, 'pg', 'PostgreDB')
+    assert busy_conn.closed and lib.connection_pool[lib._get_pool_key('pg', 'PostgreDB')] == [conn]
+    assert lib._read_config('pg')['PostgreDB']['Host'] == 'new_host'
+
+
+def test_pooled_connection_is_closed_when_generator_is_closed_early(pool):
+    def read():
+        with lib._pooled_connection('pg', 'PostgreDB') as conn:
+            yield conn
+            yield conn
+    gen = read()
+    conn = next(gen)
+    gen.close()
+    assert conn.closed
+    assert all(conn not in idle for idle in lib.connection_pool.values())
+
+
+@pytest.mark.parametrize('db_type', lib.pushdown_db_types)
+def test_row_hash_sql_hashes_every_value_separately(db_type):
+    sql = lib.get_row_hash_sql(db_type, 'select * from t', ['ID'], ['A', 'B'])
+    assert sql.count('(null)') == 1  # only the reference column, nulls of values are hashed as '-'
+    assert "'|'" in sql and "'-'" in sql
+    assert 'NVARCHAR(4000)' not in sql
+
+
+def test_row_hash_sql_hashes_wide_rows_in_groups():
+    ls_cols = [f"C{i}" for i in range(250)]
+    sql = lib.get_row_hash_sql('oracle', 'select * from t', ['ID'], ls_cols)
+    # 250 value hashes, 3 group hashes and the row hash
+    assert sql.count('STANDARD_HASH') == 254
+    assert lib.get_row_hash_sql('postgres', 'select * from t', ['ID'], ['A']).count('md5') == 2
+
+
+def test_row_hash_sql_rejects_unsupported_db():
+    with pytest.raises(Exception):
+        lib.get_row_hash_sql('hive', 'select * from t', ['ID'], ['A'])
+
+
+def test_rows_for_keys_sql_quotes_values():
+    sql = lib.get_rows_for_keys_sql('mssql', 'select * from t', ['ID', 'D'], [('1', "o'k")])
+    assert sql == ("SELECT * FROM (select * from t) q_keys WHERE (ISNULL(CAST(ID AS NVARCHAR(MAX)), '(null)') = '1' AND "
+                   "ISNULL(CAST(D AS NVARCHAR(MAX)), '(null)') = 'o''k')")
+    assert lib.get_rows_for_keys_sql('postgres', 'select * from t', ['ID'], []).endswith('WHERE 1 = 0')
+
+
+def _patch_connection(monkeypatch, cursor):
+    monkeypatch.setattr(lib, '_get_pooled_connection', lambda *args: FakeConnection(cursor))
+    monkeypatch.setattr(lib, '_release_connection', lambda *args: None)
+
+
+def test_read_rows_for_keys_in_chunks(reporting_dict, monkeypatch):
+    cursor = FakeCursor(pd.DataFrame({'ID': [1, 2], 'A': ['x', None]}))
+    _patch_connection(monkeypatch, cursor)
+    keys = [(str(i),) for i in range(5)]
+    df = lib.read_rows_for_keys_from_db('postgres', 'cfg', 'select * from t', ['ID'], keys, chunksize=2)
+    assert len(cursor.queries) == 3
+    assert df['A'].tolist() == ['x', '(null)', 'x', '(null)', 'x', '(null)']
+
+
+def test_read_rows_for_keys_reads_once_above_threshold(reporting_dict, monkeypatch):
+    cursor = FakeCursor(pd.DataFrame({'ID': [1, 2, 3], 'A': ['x', None, 'z'], 'KEY_TEXT_0': ['1', '2', '3']}))
+    _patch_connection(monkeypatch, cursor)
+    df = lib.read_rows_for_keys_from_db('postgres', 'cfg', 'select * from t', ['ID'], [('1',), ('3',), ('4',)],
+                                        chunksize=1, full_read_threshold=2)
+    assert cursor.queries == [lib.get_rows_with_key_text_sql('postgres', 'select * from t', ['ID'])]
+    assert df.columns.tolist() == ['ID', 'A']
+    assert df.values.tolist() == [[1, 'x'], [3, 'z']]
+
+
+class CopyConnection(FakeConnection):
+    """Connection whose COPY writes csv rows of ids from 0 to n_rows. If stall is True, COPY then waits like a slow
+    query till it is cancelled."""
+
+    def __init__(self, n_rows, stall=False):
+        super().__init__()
+        self.n_rows, self.stall, self.cancelled, self.written = n_rows, stall, False, threading.Event()
+
+    def cursor(self, name=None):
+        conn = self
+        class CopyCursor(FakeCursor):
+            def copy_expert(self, sql, f):
+                f.write(b"ID,NAME\n")
+                for i in range(conn.n_rows):
+                    f.write(f"{i:08d},{'(null)' if i % 2 else 'v'}\n".encode())
+                f.flush()
+                conn.written.set()
+                while conn.stall and not conn.cancelled:
+                    time.sleep(0.01)
+                if conn.cancelled:
+                    raise Exception('canceling statement due to user request')
+        return CopyCursor(pd.DataFrame())
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_copy_chunks_read_nulls_as_na_or_null_value():
+    chunks = list(lib._read_PostgreSQL_copy_chunks(CopyConnection(5), 'select', chunksize=2))
+    df = pd.concat(chunks, ignore_index=True)
+    assert len(chunks) == 3 and df['ID'].tolist() == ['00000000', '00000001', '00000002', '00000003', '00000004']
+    assert df['NAME'].isna().tolist() == [False, True, False, True, False]
+    df = pd.concat(lib._read_PostgreSQL_copy_chunks(CopyConnection(3), 'select', null_value='(null)'))
+    assert df['NAME'].tolist() == ['v', '(null)', 'v']
+
+
+def _copy_threads():
+    return [t for t in threading.enumerate() if t.name != 'MainThread' and t.is_alive()]
+
+
+# rows of a bit more than 256 KB, which pandas reads at once for first chunk, rest of rows fits in the pipe
+stall_rows = 20000
+
+
+def test_copy_chunks_cancel_copy_when_closed_early():
+    conn = CopyConnection(stall_rows, stall=True)
+    gen = lib._read_PostgreSQL_copy_chunks(conn, 'select', chunksize=10)
+    assert len(next(gen)) == 10
+    conn.written.wait(10)
+    gen.close()
+    assert conn.cancelled
+    assert _copy_threads() == []
+
+
+def test_chunked_read_closes_connection_when_closed_early(pool, monkeypatch):
+    conn = CopyConnection(stall_rows, stall=True)
+    conn.get_backend_pid = lambda: 1
+    monkeypatch.setitem(lib._connection_factories, 'PostgreDB', lambda configfile, encoding=None: conn)
+    monkeypatch.setattr(lib, 'open', lambda *args, **kwargs: io.StringIO(), raising=False)  # pid file
+    with open(lib._get_config_path('pg'), 'w') as f:
+        f.write("[PostgreDB]\nUser=u\nDatabase=d\n")
+    gen = lib.read_PostgreSQL_to_df('pg', 'select', chunksize=10, fetch_method='copy')
+    assert next(gen)['NAME'].tolist()[:2] == ['v', '(null)']
+    conn.written.wait(10)
+    gen.close()
+    assert conn.cancelled and conn.closed
+    assert all(conn not in idle for idle in lib.connection_pool.values())
+    assert _copy_threads() == []
+
+
+def test_fetched_chunks_have_same_dtypes(pool, monkeypatch):
+    conn = FakeConnection(FakeCursor(pd.DataFrame({'ID': [1, 2, 3], 'AMT': [10, 20, None]}, dtype=object)))
+    conn.get_backend_pid = lambda: 1
+    pids = []
+    monkeypatch.setitem(lib._connection_factories, 'PostgreDB', lambda configfile, encoding=None: conn)
+    monkeypatch.setattr(lib, 'open', lambda *args, **kwargs: pids.append(args) or io.StringIO(), raising=False)
+    with open(lib._get_config_path('pg'), 'w') as f:
+        f.write("[PostgreDB]\nUser=u\nDatabase=d\n")
+    gen = lib.read_PostgreSQL_to_df('pg', 'select', chunksize=2)
+    assert len(pids) == 1 and conn.cur.queries == []  # pid is captured at the call, query runs on first chunk
+    chunks = list(gen)
+    assert [c.dtypes.tolist() for c in chunks] == [[object, object]] * 2
+    assert chunks[1]['AMT'].tolist() == ['(null)']
+    assert not conn.closed and conn in lib.connection_pool[lib._get_pool_key('pg', 'PostgreDB')]
+
+
+@pytest.mark.parametrize('db_type, bucket', [('postgres', "(hashtext(CAST(ID AS text)) & 2147483647) % 4"),
+                                             ('oracle', "ORA_HASH(ID, 3)"), ('mssql', "(CHECKSUM(ID) & 2147483647) % 4")])
+def test_partition_sql_filters_on_hash_of_column(db_type, bucket):
+    assert lib.get_partition_sql(db_type, "select * from t", 'ID', 4, 2) == \
+        f"SELECT * FROM (select * from t) q_part WHERE (CASE WHEN ID IS NULL THEN 0 ELSE {bucket} END) = 2"
+    with pytest.raises(Exception, match="not supported"):
+        lib.get_partition_sql('sqlite', "select * from t", 'ID', 4, 2)
+
+
+def test_partitioned_read_verifies_row_count_only_if_count_is_stable(reporting_dict, monkeypatch):
+    counts = []
+    monkeypatch.setattr(lib, '_read_partition', lambda db_type, configfile, sql, *args: pd.DataFrame({'ID': [sql[-1]] * 2}))
+    monkeypatch.setattr(lib, '_read_count', lambda *args: counts.pop(0))
+    counts[:] = [6, 6]
+    assert len(lib._read_partitioned_to_df('postgres', 'pg', "select * from t", ('ID', 3), flag_reduce_df_size=False)) == 6
+    counts[:] = [7, 7]
+    with pytest.raises(Exception, match="COUNT"):
+        lib._read_partitioned_to_df('postgres', 'pg', "select * from t", ('ID', 3), flag_reduce_df_size=False)
+    # rows loaded while reading, count can not be verified
+    counts[:] = [5, 7]
+    assert len(lib._read_partitioned_to_df('postgres', 'pg', "select * from t", ('ID', 3), flag_reduce_df_size=False)) == 6
+    assert reporting_dict['logger_records'][-1]['type'] == 'FAIL'
+
+
+@pytest.mark.parametrize('db_type, reader', [('oracle', 'read_Oracle_to_df'), ('mssql', 'read_MSSQL_DB_to_df')])
+def test_partitioned_read_converts_rows_like_whole_query(reporting_dict, tmp_path, monkeypatch, db_type, reader):
+    import configparser, contextlib, sqlite3
+    db_path = str(tmp_path / "db.sqlite")
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        conn.execute("create table t (ID integer, AMT real, NAME text, QTY integer)")
+        conn.executemany("insert into t values (?, ?, ?, ?)", [(i, i * 1.5 if i % 3 else None, None if i % 4 == 0 else f"n{i}",
+                                                                None if i % 5 == 0 else i) for i in range(20)])
+        conn.commit()
+    @contextlib.contextmanager
+    def connection(*args):
+        with contextlib.closing(sqlite3.connect(db_path)) as conn:
+            yield conn
+    config = configparser.ConfigParser()
+    config.read_dict({'OracleDB': {'User': 'u', 'Database': 'd'}, 'MSSQL_DB': {'User': 'u', 'Database': 'd'}})
+    monkeypatch.setattr(lib, '_read_config', lambda configfile: config)
+    monkeypatch.setattr(lib, '_pooled_connection', connection)
+    monkeypatch.setattr(lib, '_db_connection', connection)
+    monkeypatch.setattr(lib, 'get_partition_sql', lambda db_type, sql, column, n, i: f"select * from ({sql}) where {column} % {n} = {i}")
+
+    df = getattr(lib, reader)('db', "select * from t", flag_reduce_df_size=False)
+    df_part = getattr(lib, reader)('db', "select * from t", flag_reduce_df_size=False, partition_by=('ID', 3))
+    df_part = df_part.sort_values('ID', key=lambda s: s.astype(int)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(df_part, df.reset_index(drop=True))
+    assert (df['NAME'] == '(null)').sum() == 5